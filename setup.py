@@ -6,7 +6,7 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     install_requires=[
-        "matplotlib>=3.5.0",
+        "matplotlib>=3.6.0",
         "numpy>=1.22.0",
         "pandas>=1.4.0",
         "PyQt5>=5.15.0",
@@ -16,4 +16,10 @@ setup(
     description="甘特图生成和管理应用",
     keywords="gantt,项目管理,图表",
     python_requires=">=3.8",
+    entry_points={
+        "console_scripts": [
+            "gantt-render=gantt_app.cli:main",
+            "gantt-serve=gantt_app.server:main",
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+无界面的批量转换命令行入口 (gantt-render)
+
+读取多个CSV/Excel文件，并行输出PNG/SVG/PDF/CSV。
+本模块不导入Qt，使用Agg后端，可在没有显示器的服务器上（例如cron任务）运行。
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from gantt_app.core.chart_improved import GanttChart
+from gantt_app.core.figure_pool import default_pool
+from gantt_app.core.progressive import tight_bbox
+
+
+IMAGE_FORMATS = ('png', 'svg', 'pdf')
+SUPPORTED_FORMATS = IMAGE_FORMATS + ('csv',)
+
+
+def convert_file(filepath: str,
+                 output_dir: str,
+                 formats: List[str],
+                 sheet_name: Any = 0,
+                 figsize: tuple = (12, 8),
+                 title: Optional[str] = None,
+                 stem: Optional[str] = None) -> Dict[str, Any]:
+    """
+    转换单个输入文件
+
+    参数:
+        filepath (str): CSV或Excel文件路径
+        output_dir (str): 输出目录
+        formats (List[str]): 输出格式列表
+        sheet_name: Excel工作表名称或索引
+        figsize (tuple): 图表尺寸
+        title (str): 图表标题，默认使用文件名
+        stem (str): 输出文件名（不含扩展名），默认使用输入文件名，见 output_stems
+
+    返回:
+        Dict[str, Any]: 包含 input、outputs、seconds，失败时还包含 error
+    """
+    started = time.perf_counter()
+    result: Dict[str, Any] = {'input': filepath, 'outputs': []}
+    try:
+        chart = GanttChart()
+        if filepath.lower().endswith('.csv'):
+            chart.load_from_csv(filepath)
+        else:
+            chart.load_from_excel(filepath, sheet_name=sheet_name)
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        chart.set_title(title or name)
+        stem = stem or name
+
+        image_formats = [fmt for fmt in formats if fmt in IMAGE_FORMATS]
+        if image_formats:
+            if not chart.tasks:
+                raise ValueError("没有任务可以渲染")
+            # 所有图片格式复用同一个已绘制的Figure，用完放回池中
+            with default_pool.figure(figsize) as fig:
+                chart.draw(fig)
+                bbox = tight_bbox(fig)
+                for fmt in image_formats:
+                    path = os.path.join(output_dir, f"{stem}.{fmt}")
+                    fig.savefig(path, dpi=300, bbox_inches=bbox)
+                    result['outputs'].append(path)
+
+        if 'csv' in formats:
+            path = os.path.join(output_dir, f"{stem}.csv")
+            if os.path.abspath(path) == os.path.abspath(filepath):
+                raise ValueError(f"CSV输出会覆盖输入文件: {filepath}")
+            chart.export_csv(path)
+            result['outputs'].append(path)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {str(e)}"
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """
+    展开输入中的通配符，保持顺序并去重
+
+    参数:
+        patterns (List[str]): 文件路径或通配模式
+
+    返回:
+        List[str]: 文件路径列表，未匹配到文件的模式原样保留以便报告错误
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(matches or [pattern])
+    return list(dict.fromkeys(paths))
+
+
+def output_stems(paths: List[str]) -> Dict[str, str]:
+    """
+    为每个输入文件确定输出文件名（不含扩展名），所有输出写入同一目录，名称不能重复
+
+    文件名不重复时直接使用文件名；重复的文件（例如 a/plan.csv 与 b/plan.xlsx）改用相对于
+    它们共同目录的路径，以下划线连接（a_plan、b_plan），仍然重复时再加上扩展名。
+
+    参数:
+        paths (List[str]): 输入文件路径（已去重）
+
+    返回:
+        Dict[str, str]: 输入路径到输出文件名的映射
+
+    异常:
+        ValueError: 如果仍然无法得到不重复的名称
+    """
+    groups: Dict[str, List[str]] = {}
+    for path in paths:
+        groups.setdefault(os.path.splitext(os.path.basename(path))[0], []).append(path)
+
+    stems = {}
+    for stem, group in groups.items():
+        if len(group) == 1:
+            stems[group[0]] = stem
+            continue
+        absolute = [os.path.abspath(path) for path in group]
+        root = os.path.commonpath([os.path.dirname(path) for path in absolute])
+        relative = [os.path.relpath(path, root) for path in absolute]
+        names = [os.path.splitext(rel)[0] for rel in relative]
+        if len(set(names)) < len(names):
+            names = [rel.replace('.', '_') for rel in relative]
+        for path, name in zip(group, names):
+            stems[path] = name.replace(os.sep, '_')
+
+    counts = Counter(stems.values())
+    collided = [stem for stem, count in counts.items() if count > 1]
+    if collided:
+        raise ValueError(f"输出文件名重复: {', '.join(sorted(collided))}")
+    return stems
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog='gantt-render',
+        description="批量将CSV/Excel任务文件渲染为甘特图或导出为CSV（无界面）")
+    parser.add_argument('inputs', nargs='+', help="输入文件或通配模式，例如 exports/*.xlsx")
+    parser.add_argument('-o', '--output-dir', default='.', help="输出目录（默认当前目录）")
+    parser.add_argument('-f', '--formats', default='png',
+                        help=f"逗号分隔的输出格式，可选 {','.join(SUPPORTED_FORMATS)}（默认png）")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="并行进程数（默认CPU核数）")
+    parser.add_argument('--sheet', default=0, help="Excel工作表名称或索引（默认第一个）")
+    parser.add_argument('--figsize', type=float, nargs=2, default=(12, 8), metavar=('W', 'H'),
+                        help="图表尺寸，单位英寸（默认 12 8）")
+    parser.add_argument('--title', default=None, help="图表标题（默认使用文件名）")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行主函数
+
+    参数:
+        argv (List[str]): 命令行参数，默认使用sys.argv
+
+    返回:
+        int: 退出码，全部成功为0，有文件失败为1，参数错误为2
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    formats = [fmt.strip().lower() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in SUPPORTED_FORMATS]
+    if unknown or not formats:
+        parser.error(f"不支持的输出格式: {','.join(unknown) or args.formats}")
+    if args.jobs < 1:
+        parser.error("--jobs 必须大于0")
+
+    sheet = int(args.sheet) if str(args.sheet).isdigit() else args.sheet
+    os.makedirs(args.output_dir, exist_ok=True)
+    inputs = expand_inputs(args.inputs)
+    try:
+        stems = output_stems(inputs)
+    except ValueError as e:
+        parser.error(str(e))
+    options = (args.output_dir, formats, sheet, tuple(args.figsize), args.title)
+
+    started = time.perf_counter()
+    if args.jobs == 1 or len(inputs) == 1:
+        results = [convert_file(path, *options, stem=stems[path]) for path in inputs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(inputs))) as pool:
+            futures = [pool.submit(convert_file, path, *options, stem=stems[path]) for path in inputs]
+            results = [future.result() for future in futures]
+
+    failures = 0
+    for result in results:
+        if 'error' in result:
+            failures += 1
+            print(f"失败 {result['input']} ({result['seconds']:.2f}s): {result['error']}", file=sys.stderr)
+        else:
+            print(f"完成 {result['input']} ({result['seconds']:.2f}s) -> {', '.join(result['outputs'])}")
+    print(f"共 {len(results)} 个文件，成功 {len(results) - failures}，失败 {failures}，"
+          f"耗时 {time.perf_counter() - started:.2f}s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
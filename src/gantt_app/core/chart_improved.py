@@ -14,7 +14,21 @@ from matplotlib.patches import Rectangle
 import matplotlib.font_manager as fm
 import platform
 import os
-from typing import List, Optional, Union, Dict, Any
+from typing import List, Optional, Union, Dict, Any, Callable, Tuple
+
+from gantt_app.core.columns import EXPORT_COLUMNS, task_columns
+from gantt_app.core.dependency_graph import DependencyGraph, ValidationReport
+from gantt_app.core.dependency_links import draw_dependency_links
+from gantt_app.core.diff import baseline_spans, draw_baseline_overlay
+from gantt_app.core.index import TaskIndex
+from gantt_app.core.labels import LabelLayer
+from gantt_app.core.progress_history import ProgressHistory, draw_progress_curves
+from gantt_app.core.progressive import tight_bbox
+from gantt_app.core.schema import SchemaProfile, infer_columns, resolve_profile
+from gantt_app.core.swimlanes import SwimlaneLayout, draw_swimlanes
+from gantt_app.core.time_axis import apply_time_axis
+from gantt_app.core.work_calendar import CalendarSet, WorkCalendar, shade_non_working
+from gantt_app.core.export import DEFAULT_CHUNK_SIZE, write_csv_stream
 
 # 配置中文字体
 def configure_chinese_font() -> None:
@@ -48,7 +62,8 @@ class Task:
                 end_date: datetime.datetime, 
                 progress: float = 0, 
                 color: Optional[str] = None,
-                dependencies: Optional[List[str]] = None):
+                dependencies: Optional[List[str]] = None,
+                source: Optional[str] = None):
         """
         初始化任务
         
@@ -61,6 +76,7 @@ class Task:
             progress (float): 完成百分比 (0-100)
             color (str): 任务颜色
             dependencies (List[str]): 依赖的任务ID列表
+            source (str): 任务来源文件路径
         
         异常:
             ValueError: 如果结束日期早于开始日期
@@ -82,6 +98,7 @@ class Task:
         self.color = color or '#4287f5'
         self.subtasks = []
         self.dependencies = dependencies or []
+        self.source = source
     
     def add_subtask(self, task: 'Task') -> None:
         """
@@ -108,6 +125,73 @@ class Task:
         return f"Task({self.description}, {self.start_date.strftime('%Y-%m-%d')}, {self.end_date.strftime('%Y-%m-%d')}, {self.progress}%)"
 
 
+def tasks_from_sheet(df: pd.DataFrame, profile: SchemaProfile, source: str, id_prefix: str = '') -> List[Task]:
+    """
+    把一个Excel工作表的数据转换为任务
+    
+    状态为 Reviewed 的行被跳过；缺少开始日期时使用当前时间，缺少结束日期时为开始后7天；
+    无法转换的行打印提示后跳过。
+    
+    参数:
+        df (pd.DataFrame): 按 profile 读取的工作表数据
+        profile (SchemaProfile): 列映射配置
+        source (str): 来源文件路径
+        id_prefix (str): 为缺少ID的任务生成的ID前缀
+        
+    返回:
+        List[Task]: 任务列表
+    """
+    tasks: List[Task] = []
+    missing = pd.Series([None] * len(df), index=df.index, dtype=object)
+    
+    def column(field):
+        values = profile.column(df, field)
+        return missing if values is None else values
+    
+    starts = profile.dates(df, 'StartDate')
+    ends = profile.dates(df, 'EndDate')
+    rows = zip(column('Status'), column('Description'),
+               column('StartDate'), missing if starts is None else starts,
+               column('EndDate'), missing if ends is None else ends,
+               column('AssignTo'), column('ArtifactID'))
+    
+    for status, description, raw_start, start, raw_end, end, assignTo, artfid in rows:
+        # 跳过审核状态的任务
+        if status == "Reviewed":
+            continue
+        
+        try:
+            if pd.notna(raw_start):
+                if pd.isna(start):
+                    raise ValueError(f"无法解析的开始日期: {raw_start}")
+                start_date = start.to_pydatetime()
+            else:
+                start_date = datetime.datetime.now()
+            
+            if pd.notna(raw_end):
+                if pd.isna(end):
+                    raise ValueError(f"无法解析的结束日期: {raw_end}")
+                end_date = end.to_pydatetime()
+            else:
+                end_date = start_date + datetime.timedelta(days=7)
+            
+            tasks.append(Task(
+                assignTo=str(assignTo) if pd.notna(assignTo) else '未分配',
+                artfid=str(artfid) if pd.notna(artfid) else f"{id_prefix}ID-{len(tasks)+1:04d}",
+                description=str(description) if pd.notna(description) else f"任务 {len(tasks)+1}",
+                start_date=start_date,
+                end_date=end_date,
+                progress=0,
+                source=source
+            ))
+            
+        except Exception as e:
+            print(f"处理任务时出错: {str(e)}")
+            continue
+    
+    return tasks
+
+
 class GanttChart:
     """甘特图类，用于管理任务并生成甘特图"""
     
@@ -115,15 +199,235 @@ class GanttChart:
         """初始化甘特图对象"""
         self.tasks: List[Task] = []
         self.title: str = "项目甘特图"
+        self.index = TaskIndex()
+        # 设置后每次加载或导出时记录一次进度快照
+        self.history: Optional[ProgressHistory] = None
+        self._listeners: List[Callable[[str, List[int]], None]] = []
+        self._dependency_graph: Optional[DependencyGraph] = None
+    
+    def __getstate__(self) -> dict:
+        """pickle时（例如传给子进程）不带订阅者，依赖图在副本中按需重新构建"""
+        state = self.__dict__.copy()
+        state['_listeners'] = []
+        state['_dependency_graph'] = None
+        return state
+    
+    def subscribe(self, listener: Callable[[str, List[int]], None]) -> None:
+        """
+        订阅任务变化通知
+        
+        参数:
+            listener (Callable): 回调函数 listener(事件, 行号列表)。事件为 'added'、'modified'、
+                'removed'（行号为删除前的行号，之后的行号会前移）或 'reset'（行号为空列表）
+        """
+        self._listeners.append(listener)
+    
+    def unsubscribe(self, listener: Callable[[str, List[int]], None]) -> None:
+        """取消订阅"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, event: str, rows: List[int]) -> None:
+        for listener in list(self._listeners):
+            listener(event, rows)
     
     def add_task(self, task: Task) -> None:
         """
         添加任务到甘特图
         
+        重复的ArtifactID会被记录在 index.duplicates 中并打印提示。
+        
         参数:
             task (Task): 要添加的任务对象
         """
+        if not self.index.add(task, len(self.tasks)):
+            print(f"重复的ArtifactID: {task.artfId}")
         self.tasks.append(task)
+        self._notify('added', [len(self.tasks) - 1])
+    
+    def replace_task(self, row: int, task: Task) -> None:
+        """
+        替换指定行的任务
+        
+        参数:
+            row (int): 任务在 tasks 中的行号
+            task (Task): 新的任务对象
+        """
+        self.index.discard(self.tasks[row], row)
+        self.tasks[row] = task
+        if not self.index.add(task, row):
+            print(f"重复的ArtifactID: {task.artfId}")
+        self._notify('modified', [row])
+    
+    def update_task(self, row: int, **values) -> None:
+        """
+        修改指定行任务的字段，同时更新索引并发出 'modified' 通知
+        
+        参数:
+            row (int): 任务行号
+            **values: 字段名 -> 新值，例如 start_date=..., progress=50
+            
+        异常:
+            AttributeError: 如果任务没有该字段
+            ValueError: 如果修改后结束日期早于开始日期，或进度不在0-100之间（任务保持不变）
+        """
+        task = self.tasks[row]
+        for name in values:
+            if not hasattr(task, name):
+                raise AttributeError(f"任务没有字段: {name}")
+        # 与 Task.__init__ 相同的校验，按修改后的值检查
+        start_date = values.get('start_date', task.start_date)
+        end_date = values.get('end_date', task.end_date)
+        progress = values.get('progress', task.progress)
+        if end_date < start_date:
+            raise ValueError("结束日期不能早于开始日期")
+        if progress < 0 or progress > 100:
+            raise ValueError("进度必须在0-100之间")
+        self.index.discard(task, row)
+        for name, value in values.items():
+            setattr(task, name, value)
+        self.index.add(task, row)
+        self._notify('modified', [row])
+    
+    def remove_tasks(self, tasks: List[Task]) -> None:
+        """
+        从甘特图中移除任务，移除后行号会变化，索引随之重建
+        
+        参数:
+            tasks (List[Task]): 要移除的任务对象
+        """
+        removed = {id(task) for task in tasks}
+        rows = [row for row, task in enumerate(self.tasks) if id(task) in removed]
+        self.tasks = [task for task in self.tasks if id(task) not in removed]
+        self.index.rebuild(self.tasks)
+        if rows:
+            self._notify('removed', rows)
+    
+    def remove_rows(self, rows: List[int]) -> None:
+        """
+        按行号删除任务；被删除的行都在末尾时只更新这些行的索引，否则重建索引
+        
+        参数:
+            rows (List[int]): 行号
+        """
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        if rows == list(range(rows[0], len(self.tasks))):
+            for row in reversed(rows):
+                self.index.discard(self.tasks[row], row)
+                self.tasks.pop()
+            self._notify('removed', rows)
+        else:
+            self.remove_tasks([self.tasks[row] for row in rows])
+    
+    def insert_tasks(self, rows: List[int], tasks: List[Task]) -> None:
+        """
+        把任务插入到指定行号（升序，插入后的行号），例如撤销删除时恢复原位置
+        
+        参数:
+            rows (List[int]): 插入后各任务所在的行号
+            tasks (List[Task]): 任务
+        """
+        if rows == list(range(len(self.tasks), len(self.tasks) + len(rows))):
+            for task in tasks:
+                self.index.add(task, len(self.tasks))
+                self.tasks.append(task)
+        else:
+            for row, task in zip(rows, tasks):
+                self.tasks.insert(row, task)
+            self.index.rebuild(self.tasks)
+        if rows:
+            self._notify('added', list(rows))
+    
+    def clear_tasks(self) -> None:
+        """清空所有任务"""
+        self.tasks = []
+        self.index.clear()
+        self._notify('reset', [])
+    
+    def reindex(self) -> None:
+        """
+        重建索引
+        
+        直接修改 tasks 列表或任务的负责人、进度、日期后需要调用。
+        """
+        self.index.rebuild(self.tasks)
+        self._notify('reset', [])
+    
+    def dependency_graph(self) -> DependencyGraph:
+        """
+        任务依赖图，首次调用时构建，之后随任务的增删改增量更新
+        
+        返回:
+            DependencyGraph: 依赖图
+        """
+        if self._dependency_graph is None:
+            self._dependency_graph = DependencyGraph()
+            self._dependency_graph.attach(self)
+        return self._dependency_graph
+    
+    def validate_dependencies(self) -> ValidationReport:
+        """
+        检查不存在的前置任务、自身依赖、循环依赖和重复ID
+        
+        返回:
+            ValidationReport: 检查结果
+        """
+        return self.dependency_graph().validate()
+    
+    def date_range(self) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
+        """
+        全部任务的最早开始与最晚结束时间，由索引增量维护，不扫描任务
+        
+        只反映通过 add_task/update_task 等方法所做的修改；直接修改任务对象后需要调用 reindex。
+        
+        返回:
+            Optional[Tuple[datetime, datetime]]: 没有任务时返回None
+        """
+        return self.index.date_range()
+    
+    def get_task(self, artfid: str) -> Optional[Task]:
+        """
+        按ArtifactID查找任务
+        
+        参数:
+            artfid (str): 任务ID
+            
+        返回:
+            Optional[Task]: 对应的任务，ID重复时返回第一个，不存在时返回None
+        """
+        row = self.index.by_id.get(artfid)
+        return self.tasks[row] if row is not None else None
+    
+    def tasks_for(self, assignee: str) -> List[Task]:
+        """
+        获取某个负责人的全部任务
+        
+        参数:
+            assignee (str): 负责人，多人负责的任务对其中每个人都可见
+            
+        返回:
+            List[Task]: 按甘特图中顺序排列的任务
+        """
+        return [self.tasks[row] for row in sorted(self.index.by_assignee.get(assignee, ()))]
+    
+    def query(self,
+              ids: Optional[List[str]] = None,
+              assignee: Optional[str] = None,
+              progress: Optional[str] = None) -> List[Task]:
+        """
+        组合多个条件查询任务，各条件通过索引求交集
+        
+        参数:
+            ids (List[str]): ArtifactID列表
+            assignee (str): 负责人
+            progress (str): 进度分桶，'not_started'、'in_progress' 或 'done'
+            
+        返回:
+            List[Task]: 满足全部条件的任务
+        """
+        return [self.tasks[row] for row in self.index.query(ids, assignee, progress)]
     
     def set_title(self, title: str) -> None:
         """
@@ -134,13 +438,30 @@ class GanttChart:
         """
         self.title = title
     
-    def render(self, figsize: tuple = (12, 8), save_path: Optional[str] = None) -> Optional[plt.Figure]:
+    def render(self,
+               figsize: tuple = (12, 8),
+               save_path: Optional[str] = None,
+               baseline: Optional['GanttChart'] = None,
+               calendar: Optional[WorkCalendar] = None,
+               history: Optional[ProgressHistory] = None,
+               links: bool = True,
+               group_by: Union[str, Callable, None] = None,
+               collapsed: Union[bool, List[str], None] = None) -> Optional[plt.Figure]:
         """
         渲染甘特图
         
+        Figure由pyplot管理，调用方用完后需要 plt.close(fig)；
+        服务或多线程场景请使用 gantt_app.core.figure_pool.render_image。
+        
         参数:
             figsize (tuple): 图表尺寸
             save_path (str): 保存路径，如果为None则显示图表
+            baseline (GanttChart): 基线快照，如果提供则在任务条下方绘制基线条
+            calendar (WorkCalendar): 工作日历，如果提供则以灰色标出非工作时段
+            history (ProgressHistory): 进度历史，如果提供则在甘特图下方绘制挣值与燃尽曲线
+            links (bool): 是否绘制任务依赖连线
+            group_by (str | Callable): 分组依据（如 'assignee' 或任意列名），如果提供则按泳道绘制
+            collapsed (bool | List[str]): 按泳道绘制时折叠为汇总条的组，True 表示全部折叠
             
         返回:
             Optional[plt.Figure]: 如果渲染成功则返回Figure对象，否则返回None
@@ -149,92 +470,192 @@ class GanttChart:
             print("没有任务可以渲染")
             return None
         
-        fig, ax = plt.subplots(figsize=figsize)
+        fig = plt.figure(figsize=figsize)
+        self.draw(fig, baseline=baseline, calendar=calendar, history=history, links=links,
+                  group_by=group_by, collapsed=collapsed)
+        
+        if save_path:
+            # 紧凑边界由排版结果直接计算，避免 bbox_inches='tight' 额外的一次绘制
+            fig.savefig(save_path, dpi=300, bbox_inches=tight_bbox(fig))
+            print(f"甘特图已保存到 {save_path}")
+        else:
+            fig.tight_layout()
+            plt.show()
+        
+        return fig
+    
+    def draw(self,
+             fig,
+             baseline: Optional['GanttChart'] = None,
+             calendar: Optional[WorkCalendar] = None,
+             history: Optional[ProgressHistory] = None,
+             links: bool = True,
+             group_by: Union[str, Callable, None] = None,
+             collapsed: Union[bool, List[str], None] = None):
+        """
+        在给定的空Figure上绘制甘特图，不使用pyplot的全局状态
+        
+        参数:
+            fig (Figure): 目标Figure
+            baseline (GanttChart): 基线快照
+            calendar (WorkCalendar): 工作日历
+            history (ProgressHistory): 进度历史
+            links (bool): 是否绘制任务依赖连线
+            group_by (str | Callable): 分组依据，见 gantt_app.core.swimlanes.group_keys；
+                同组内时间不重叠的任务共用一行
+            collapsed (bool | List[str]): 折叠为汇总条的组，True 表示全部折叠
+            
+        返回:
+            Axes: 甘特图所在的坐标轴
+            
+        异常:
+            ValueError: 如果没有任务
+        """
+        if not self.tasks:
+            raise ValueError("没有任务可以渲染")
+        
+        if history is not None and len(history):
+            ax, curve_ax = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+        else:
+            ax = fig.subplots()
+            curve_ax = None
         
         # 设置图表样式
-        ax.set_title(self.title)
-        ax.set_xlabel('日期')
+        # 为上方第二层日期表头留出空间
+        ax.set_title(self.title, pad=24)
+        (curve_ax or ax).set_xlabel('日期')
         ax.set_ylabel('任务')
         ax.grid(True, alpha=0.3)
         
-        # 获取日期范围
-        start_dates = [task.start_date for task in self.tasks]
-        end_dates = [task.end_date for task in self.tasks]
-        min_date = min(start_dates)
-        max_date = max(end_dates)
+        # 获取日期范围（扫描任务，直接修改过的任务也能正确显示）
+        columns = task_columns(self.tasks)
+        min_date, max_date = columns['Start'].min(), columns['End'].max()
         
         # 设置x轴
         ax.set_xlim(min_date, max_date)
         
-        # 使用日期格式化
-        date_format = mdates.DateFormatter('%Y-%m-%d')
-        ax.xaxis.set_major_formatter(date_format)
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=5))
-        
-        # 绘制每个任务
-        y_ticks = []
-        y_labels = []
-        for i, task in enumerate(self.tasks):
-            y_pos = len(self.tasks) - i
-            
-            # 转换日期为数值
-            start_num = mdates.date2num(task.start_date)
-            duration_days = task.duration()
-            
-            # 绘制任务条
-            task_bar = Rectangle((task.start_date, y_pos - 0.4),
-                             datetime.timedelta(days=duration_days),
-                             0.8,
-                             edgecolor='black',
-                             facecolor=task.color,
-                             alpha=0.8)
-            ax.add_patch(task_bar)
-            
-            # 绘制进度
-            if task.progress > 0:
-                progress_width = datetime.timedelta(days=duration_days * (task.progress / 100))
-                progress_bar = Rectangle((task.start_date, y_pos - 0.4),
-                                     progress_width,
-                                     0.8,
-                                     facecolor='#50C878',
-                                     alpha=0.6)
-                ax.add_patch(progress_bar)
-            
-            # 添加任务标签
-            y_ticks.append(y_pos)
-            y_labels.append(f"{task.assignTo}-{task.artfId}")
-            
-            # 添加日期标签
-            ax.text(task.start_date, y_pos + 0.2,
-                   task.start_date.strftime('%Y-%m-%d'),
-                   ha='left', va='bottom',
-                   fontsize=8)
-            ax.text(task.end_date, y_pos + 0.2,
-                   task.end_date.strftime('%Y-%m-%d'),
-                   ha='right', va='bottom',
-                   fontsize=8)
+        if group_by is not None:
+            # 泳道：同组内时间不重叠的任务共用一行，折叠的组只画一条汇总条
+            layout = SwimlaneLayout(self.tasks, group_by, collapsed)
+            draw_swimlanes(ax, self.tasks, layout)
+            rows = layout.visible.tolist()
+            y_positions = layout.task_y[layout.visible]
+        else:
+            # 绘制每个任务
+            y_ticks = []
+            y_labels = []
+            for i, task in enumerate(self.tasks):
+                y_pos = len(self.tasks) - i
+                
+                # 转换日期为数值
+                start_num = mdates.date2num(task.start_date)
+                duration_days = task.duration()
+                
+                # 绘制任务条
+                task_bar = Rectangle((task.start_date, y_pos - 0.4),
+                                 datetime.timedelta(days=duration_days),
+                                 0.8,
+                                 edgecolor='black',
+                                 facecolor=task.color,
+                                 alpha=0.8)
+                ax.add_patch(task_bar)
+                
+                # 绘制进度
+                if task.progress > 0:
+                    progress_width = datetime.timedelta(days=duration_days * (task.progress / 100))
+                    progress_bar = Rectangle((task.start_date, y_pos - 0.4),
+                                         progress_width,
+                                         0.8,
+                                         facecolor='#50C878',
+                                         alpha=0.6)
+                    ax.add_patch(progress_bar)
+                
+                # 添加任务标签
+                y_ticks.append(y_pos)
+                y_labels.append(f"{task.assignTo}-{task.artfId}")
             
-            # 添加描述文本
-            ax.text(task.start_date + datetime.timedelta(days=0.5), y_pos,
-                  task.description,
-                  ha='left', va='center',
-                  fontsize=8)
+            # 设置y轴
+            ax.set_yticks(y_ticks)
+            ax.set_yticklabels(y_labels)
+            rows = range(len(self.tasks))
+            y_positions = np.array(y_ticks, dtype=float)
+        tasks = [self.tasks[row] for row in rows]
         
-        # 设置y轴
-        ax.set_yticks(y_ticks)
-        ax.set_yticklabels(y_labels)
+        # 添加日期标签和描述文本，放不下或相互重叠的标签在绘制时被剔除
+        ax.add_artist(self._task_labels(y_positions, tasks))
         
-        # 格式化x轴日期
-        plt.gcf().autofmt_xdate()
+        # 依赖连线合并为一个图元，视图变化时剔除不可见的连线
+        if links:
+            draw_dependency_links(ax, tasks, y_positions)
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"甘特图已保存到 {save_path}")
-        else:
-            plt.tight_layout()
-            plt.show()
+        # 绘制基线条
+        if baseline is not None:
+            starts, ends, found = baseline_spans(baseline, [task.artfId for task in tasks])
+            if found.any():
+                draw_baseline_overlay(ax, starts[found], ends[found], y_positions[found])
+                ax.set_xlim(min(mdates.date2num(min_date), mdates.date2num(starts[found]).min()),
+                            max(mdates.date2num(max_date), mdates.date2num(ends[found]).max()))
         
-        return fig
+        # 标出非工作时段
+        if calendar is not None:
+            x_min, x_max = ax.get_xlim()
+            shade_non_working(ax, calendar, mdates.num2date(x_min).date(),
+                              mdates.num2date(x_max).date() + datetime.timedelta(days=1))
+        
+        # 挣值与燃尽曲线，与甘特图共用x轴，不改变其范围
+        if curve_ax is not None:
+            curve_ax.set_autoscalex_on(False)
+            draw_progress_curves(curve_ax, history.curves())
+        
+        # 按时间跨度和图宽自动选择日期刻度，刻度数量有上限
+        apply_time_axis(ax)
+        
+        return ax
+    
+    def working_durations(self, calendars: Optional[CalendarSet] = None) -> np.ndarray:
+        """
+        批量计算所有任务的工作日时长
+        
+        参数:
+            calendars (CalendarSet): 按负责人分配的工作日历，默认为周一至周五工作
+            
+        返回:
+            np.ndarray: 与 tasks 顺序对应的工作日数
+        """
+        return (calendars or CalendarSet()).working_durations(self.tasks)
+    
+    def _task_labels(self, y_positions: np.ndarray, tasks: Optional[List[Task]] = None) -> LabelLayer:
+        """
+        构建任务的开始日期、结束日期和描述标签
+        
+        参数:
+            y_positions (np.ndarray): 每个任务所在行的纵坐标
+            tasks (List[Task]): 需要标签的任务，默认为全部任务
+            
+        返回:
+            LabelLayer: 标签层
+        """
+        tasks = self.tasks if tasks is None else tasks
+        columns = task_columns(tasks)
+        start = mdates.date2num(columns['Start'])
+        duration = columns['Duration'].astype(float)
+        count = len(tasks)
+        
+        x = np.concatenate([start + 0.5, start, start + duration])
+        y = np.concatenate([y_positions, y_positions + 0.2, y_positions + 0.2])
+        texts = (list(columns['Description'])
+                 + list(pd.DatetimeIndex(columns['Start']).strftime('%Y-%m-%d'))
+                 + list(pd.DatetimeIndex(columns['End']).strftime('%Y-%m-%d')))
+        ha = ['left'] * (2 * count) + ['right'] * count
+        va = ['center'] * count + ['bottom'] * (2 * count)
+        # 描述文本只在任务条内放得下时显示
+        max_width = np.concatenate([duration - 0.5, np.full(2 * count, np.nan)])
+        return LabelLayer(x, y, texts, ha, va, max_width=max_width, fontsize=8)
+    
+    def _record_history(self) -> None:
+        """如果设置了进度历史，则记录当前进度"""
+        if self.history is not None:
+            self.history.record(self.tasks)
     
     def to_dataframe(self) -> pd.DataFrame:
         """
@@ -243,29 +664,27 @@ class GanttChart:
         返回:
             pd.DataFrame: 包含所有任务信息的数据框
         """
-        data = []
-        for task in self.tasks:
-            data.append({
-                'AssignTo': task.assignTo,
-                'ArtifactID': task.artfId,
-                'Description': task.description,
-                'Start': task.start_date,
-                'End': task.end_date,
-                'Duration': task.duration(),
-                'Progress': task.progress,
-                'Dependencies': ','.join(task.dependencies) if task.dependencies else ''
-            })
-        return pd.DataFrame(data)
-    
-    def export_csv(self, filepath: str) -> None:
+        return pd.DataFrame(task_columns(self.tasks), columns=EXPORT_COLUMNS)
+    
+    def export_csv(self,
+                   filepath: str,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   compression: Optional[str] = 'infer',
+                   footer: bool = False) -> None:
         """
         导出为CSV文件
         
+        任务按块流式写出，不会构建完整的DataFrame。
+        
         参数:
             filepath (str): 导出的文件路径
+            chunk_size (int): 每块写出的任务数
+            compression (str): 'gzip'、'zstd'、None，或'infer'按扩展名推断
+            footer (bool): 是否追加行数与校验和尾注
         """
-        df = self.to_dataframe()
-        df.to_csv(filepath, index=False)
+        write_csv_stream(self.tasks, filepath, chunk_size=chunk_size,
+                         compression=compression, footer=footer)
+        self._record_history()
         print(f"数据已导出到 {filepath}")
         
     def export_excel(self, filepath: str) -> None:
@@ -277,14 +696,18 @@ class GanttChart:
         """
         df = self.to_dataframe()
         df.to_excel(filepath, index=False)
+        self._record_history()
         print(f"数据已导出到 {filepath}")
     
-    def load_from_csv(self, filepath: str) -> 'GanttChart':
+    def load_from_csv(self, filepath, profile: Union[SchemaProfile, str, None] = None) -> 'GanttChart':
         """
         从CSV文件加载任务
         
+        只解析列映射配置中用到的列。
+        
         参数:
-            filepath (str): CSV文件路径
+            filepath (str | 文件对象): CSV文件路径，或可重新定位（seek）的文件对象
+            profile (SchemaProfile | str): 列映射配置或其名称，默认按表头确定
             
         返回:
             GanttChart: 返回自身实例以支持链式调用
@@ -293,45 +716,88 @@ class GanttChart:
             FileNotFoundError: 如果文件不存在
             ValueError: 如果文件格式不正确
         """
-        if not os.path.exists(filepath):
+        is_path = isinstance(filepath, (str, os.PathLike))
+        if is_path and not os.path.exists(filepath):
             raise FileNotFoundError(f"文件不存在: {filepath}")
             
         try:
-            df = pd.read_csv(filepath)
-            self.tasks = []
-            
-            for _, row in df.iterrows():
-                start_date = pd.to_datetime(row['Start']).to_pydatetime()
-                end_date = pd.to_datetime(row['End']).to_pydatetime()
-                
-                # 处理依赖关系
-                dependencies = []
-                if 'Dependencies' in row and pd.notna(row['Dependencies']) and row['Dependencies']:
-                    dependencies = row['Dependencies'].split(',')
-                
-                task = Task(
-                    assignTo=row.get('AssignTo', '未分配'),
-                    artfid=row.get('ArtifactID', 'ID-0000'),
-                    description=row.get('Description', '无描述'),
-                    start_date=start_date,
-                    end_date=end_date,
-                    progress=row.get('Progress', 0),
-                    dependencies=dependencies
-                )
-                self.add_task(task)
-            
-            return self
+            header = list(pd.read_csv(filepath, nrows=0).columns)
+            if not is_path:
+                filepath.seek(0)
+            profile = resolve_profile(profile, header)
+            df = pd.read_csv(filepath, **profile.read_options())
+            return self.load_from_dataframe(df, profile, source=filepath if is_path else None)
             
         except Exception as e:
             raise ValueError(f"加载CSV文件时出错: {str(e)}")
     
-    def load_from_excel(self, filepath: str, sheet_name: str = 0) -> 'GanttChart':
+    def load_from_dataframe(self,
+                            df: pd.DataFrame,
+                            profile: Union[SchemaProfile, str, None] = None,
+                            source: Optional[str] = None) -> 'GanttChart':
+        """
+        从数据框加载任务，替换现有任务
+        
+        参数:
+            df (pd.DataFrame): 每行一个任务，依赖为逗号分隔的ID
+            profile (SchemaProfile | str): 列映射配置或其名称，默认按表头确定
+            source (str): 记录在任务上的来源文件
+            
+        返回:
+            GanttChart: 返回自身实例以支持链式调用
+            
+        异常:
+            ValueError: 如果缺少日期列或日期无法解析
+        """
+        profile = resolve_profile(profile, list(df.columns))
+        starts = profile.dates(df, 'StartDate')
+        ends = profile.dates(df, 'EndDate')
+        if starts is None or ends is None:
+            raise ValueError("缺少开始日期或结束日期列")
+        invalid = (starts.isna() | ends.isna()).to_numpy()
+        if invalid.any():
+            raise ValueError(f"第 {int(np.argmax(invalid)) + 2} 行的日期无法解析")
+        
+        count = len(df)
+        assignees = self._text_values(profile.column(df, 'AssignTo'), count, '未分配')
+        artfids = self._text_values(profile.column(df, 'ArtifactID'), count, 'ID-0000')
+        descriptions = self._text_values(profile.column(df, 'Description'), count, '无描述')
+        dependencies = self._text_values(profile.column(df, 'Dependencies'), count, '')
+        progress = profile.column(df, 'Progress')
+        progress = ([0] * count if progress is None
+                    else pd.to_numeric(progress, errors='coerce').fillna(0).tolist())
+        
+        self.clear_tasks()
+        for assignTo, artfid, description, start_date, end_date, done, depends in zip(
+                assignees, artfids, descriptions, starts.dt.to_pydatetime(),
+                ends.dt.to_pydatetime(), progress, dependencies):
+            self.add_task(Task(
+                assignTo=assignTo,
+                artfid=artfid,
+                description=description,
+                start_date=start_date,
+                end_date=end_date,
+                progress=done,
+                dependencies=depends.split(',') if depends else [],
+                source=source
+            ))
+        
+        self._record_history()
+        return self
+    
+    def load_from_excel(self,
+                        filepath: str,
+                        sheet_name: str = 0,
+                        profile: Union[SchemaProfile, str, None] = None) -> 'GanttChart':
         """
         从Excel文件加载任务
         
+        只解析列映射配置中用到的列；状态为 Reviewed 的任务被跳过。
+        
         参数:
             filepath (str): Excel文件路径
             sheet_name (str): 工作表名称或索引
+            profile (SchemaProfile | str): 列映射配置或其名称，默认按表头确定
             
         返回:
             GanttChart: 返回自身实例以支持链式调用
@@ -344,55 +810,72 @@ class GanttChart:
             raise FileNotFoundError(f"文件不存在: {filepath}")
             
         try:
-            df = pd.read_excel(filepath, sheet_name=sheet_name)
-            self.tasks = []
-            
-            # 尝试识别列名
-            column_mapping = self._identify_columns(df)
-            
-            for _, row in df.iterrows():
-                # 跳过审核状态的任务
-                if 'Status' in column_mapping and pd.notna(row[column_mapping['Status']]):
-                    status = row[column_mapping['Status']]
-                    if status == "Reviewed":
-                        continue
-                
-                # 获取必要的字段
-                try:
-                    description = row[column_mapping.get('Description', df.columns[0])]
-                    
-                    if 'StartDate' in column_mapping and pd.notna(row[column_mapping['StartDate']]):
-                        start_date = pd.to_datetime(row[column_mapping['StartDate']]).to_pydatetime()
-                    else:
-                        start_date = datetime.datetime.now()
-                    
-                    if 'EndDate' in column_mapping and pd.notna(row[column_mapping['EndDate']]):
-                        end_date = pd.to_datetime(row[column_mapping['EndDate']]).to_pydatetime()
-                    else:
-                        end_date = start_date + datetime.timedelta(days=7)
-                    
-                    assignTo = row[column_mapping.get('AssignTo', '未分配')] if 'AssignTo' in column_mapping else '未分配'
-                    artfid = row[column_mapping.get('ArtifactID', 'ID-0000')] if 'ArtifactID' in column_mapping else f"ID-{len(self.tasks)+1:04d}"
-                    
-                    task = Task(
-                        assignTo=str(assignTo) if pd.notna(assignTo) else '未分配',
-                        artfid=str(artfid) if pd.notna(artfid) else f"ID-{len(self.tasks)+1:04d}",
-                        description=str(description) if pd.notna(description) else f"任务 {len(self.tasks)+1}",
-                        start_date=start_date,
-                        end_date=end_date,
-                        progress=0
-                    )
-                    self.add_task(task)
-                    
-                except Exception as e:
-                    print(f"处理任务时出错: {str(e)}")
-                    continue
+            with pd.ExcelFile(filepath) as workbook:
+                header = list(workbook.parse(sheet_name, nrows=0).columns)
+                profile = resolve_profile(profile, header)
+                df = workbook.parse(sheet_name, **profile.read_options())
+            self.clear_tasks()
+            for task in tasks_from_sheet(df, profile, filepath):
+                self.add_task(task)
             
+            self._record_history()
             return self
             
         except Exception as e:
             raise ValueError(f"加载Excel文件时出错: {str(e)}")
     
+    @staticmethod
+    def _text_values(values: Optional[pd.Series], count: int, default: str) -> List[str]:
+        """文本列转换为字符串列表，缺失的列或值使用默认值"""
+        if values is None:
+            return [default] * count
+        return [str(value) if pd.notna(value) else default for value in values.tolist()]
+    
+    def load_from_store(self,
+                        store,
+                        start: Optional[datetime.datetime] = None,
+                        end: Optional[datetime.datetime] = None,
+                        assignee: Optional[str] = None,
+                        snapshot: Optional[int] = None) -> 'GanttChart':
+        """
+        从SQLite存储加载任务，只加载日期窗口内或指定负责人的任务
+        
+        参数:
+            store (SQLiteStore): 任务存储
+            start (datetime): 窗口开始，只加载结束不早于该时间的任务
+            end (datetime): 窗口结束，只加载开始不晚于该时间的任务
+            assignee (str): 负责人
+            snapshot (int): 快照ID，如果提供则加载该快照（忽略过滤条件）
+            
+        返回:
+            GanttChart: 返回自身实例以支持链式调用
+        """
+        self.clear_tasks()
+        tasks = (store.iter_snapshot(snapshot) if snapshot is not None
+                 else store.iter_tasks(start, end, assignee))
+        for task in tasks:
+            self.add_task(task)
+        
+        self._record_history()
+        return self
+    
+    def save_to_store(self, store, replace: bool = False) -> int:
+        """
+        保存任务到SQLite存储
+        
+        已存在的ArtifactID会被更新，因此按窗口加载的部分任务可以直接写回。
+        
+        参数:
+            store (SQLiteStore): 任务存储
+            replace (bool): 是否先清空存储中的全部任务
+            
+        返回:
+            int: 写入的任务数
+        """
+        count = store.write_tasks(self.tasks, replace=replace)
+        self._record_history()
+        return count
+    
     def _identify_columns(self, df: pd.DataFrame) -> Dict[str, str]:
         """
         智能识别DataFrame中的列名
@@ -403,37 +886,4 @@ class GanttChart:
         返回:
             Dict[str, str]: 标准列名到实际列名的映射
         """
-        column_mapping = {}
-        
-        for col in df.columns:
-            col_lower = str(col).lower()
-            
-            # 任务名称/描述
-            if any(keyword in col_lower for keyword in ['任务', '标题', 'title', 'task', 'name', 'description']):
-                column_mapping['Description'] = col
-            
-            # 负责人
-            elif any(keyword in col_lower for keyword in ['负责', '分配', 'owner', 'assign', 'person']):
-                column_mapping['AssignTo'] = col
-            
-            # 开始日期
-            elif ('开始' in col_lower or 'start' in col_lower) and not 'actual' in col_lower:
-                column_mapping['StartDate'] = col
-            
-            # 结束日期
-            elif ('结束' in col_lower or 'end' in col_lower or 'due' in col_lower) and not 'actual' in col_lower:
-                column_mapping['EndDate'] = col
-            
-            # 任务ID
-            elif any(keyword in col_lower for keyword in ['id', '工件', 'artifact', 'artfid']):
-                column_mapping['ArtifactID'] = col
-            
-            # 状态
-            elif any(keyword in col_lower for keyword in ['状态', 'status', 'state']):
-                column_mapping['Status'] = col
-            
-            # 进度
-            elif any(keyword in col_lower for keyword in ['进度', 'progress', 'complete']):
-                column_mapping['Progress'] = col
-        
-        return column_mapping
\ No newline at end of file
+        return infer_columns(list(df.columns))
\ No newline at end of file
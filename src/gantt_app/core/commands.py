@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+撤销/重做命令历史
+
+每条命令只保存修改前后的字段值（或被增删的任务本身），而不是整个甘特图的快照；
+连续的同类编辑（例如拖动同一任务）在时间窗口内合并为一条命令，
+历史总内存超过预算时丢弃最早的命令。
+"""
+
+import sys
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+# 一个任务对象的粗略内存开销（字节），不含字段值本身
+_TASK_OVERHEAD = 400
+
+# 允许通过命令修改的任务字段
+EDITABLE_FIELDS = ('assignTo', 'description', 'start_date', 'end_date',
+                   'progress', 'color', 'dependencies')
+
+
+def _value_size(value: Any) -> int:
+    """字段值的粗略内存开销"""
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _task_size(task) -> int:
+    """任务对象的粗略内存开销"""
+    return _TASK_OVERHEAD + sum(_value_size(getattr(task, name, None)) for name in EDITABLE_FIELDS)
+
+
+class Command:
+    """可撤销的命令"""
+
+    # 命令是否改变了任务的行号（增删任务）
+    structural = False
+
+    def __init__(self):
+        self.timestamp = 0.0
+
+    @property
+    def rows(self) -> List[int]:
+        """受影响的行号"""
+        return []
+
+    def size(self) -> int:
+        """命令占用的粗略内存（字节）"""
+        return 0
+
+    def redo(self, chart) -> None:
+        """执行（或重做）命令"""
+        raise NotImplementedError
+
+    def undo(self, chart) -> None:
+        """撤销命令"""
+        raise NotImplementedError
+
+    def merge(self, other: 'Command') -> bool:
+        """
+        尝试把紧随其后的命令合并进来
+
+        返回:
+            bool: 如果已合并则返回True
+        """
+        return False
+
+
+class EditTask(Command):
+    """修改一个任务的若干字段，只保存旧值和新值"""
+
+    def __init__(self, row: int, changes: Dict[str, Tuple[Any, Any]], merge_key: Optional[str] = None):
+        """
+        初始化编辑命令
+
+        参数:
+            row (int): 任务行号
+            changes (Dict[str, Tuple[Any, Any]]): 字段名 -> (旧值, 新值)
+            merge_key (str): 合并键，相同合并键、相同行的连续编辑会被合并
+        """
+        super().__init__()
+        self.row = row
+        self.changes = changes
+        self.merge_key = merge_key
+
+    @property
+    def rows(self) -> List[int]:
+        return [self.row]
+
+    def size(self) -> int:
+        return 100 + sum(_value_size(old) + _value_size(new) for old, new in self.changes.values())
+
+    def _apply(self, chart, which: int) -> None:
+        chart.update_task(self.row, **{name: values[which] for name, values in self.changes.items()})
+
+    def redo(self, chart) -> None:
+        self._apply(chart, 1)
+
+    def undo(self, chart) -> None:
+        self._apply(chart, 0)
+
+    def merge(self, other: Command) -> bool:
+        if (not isinstance(other, EditTask) or self.merge_key is None
+                or other.merge_key != self.merge_key or other.row != self.row):
+            return False
+        for name, (old, new) in other.changes.items():
+            first = self.changes.get(name, (old, new))[0]
+            self.changes[name] = (first, new)
+        return True
+
+
+class AddTasks(Command):
+    """在末尾添加任务"""
+
+    structural = True
+
+    def __init__(self, tasks: Sequence):
+        """
+        初始化添加命令
+
+        参数:
+            tasks (Sequence[Task]): 要添加的任务
+        """
+        super().__init__()
+        self.tasks = list(tasks)
+        self.first_row = -1
+
+    @property
+    def rows(self) -> List[int]:
+        return list(range(self.first_row, self.first_row + len(self.tasks)))
+
+    def size(self) -> int:
+        return sum(_task_size(task) for task in self.tasks)
+
+    def redo(self, chart) -> None:
+        self.first_row = len(chart.tasks)
+        for task in self.tasks:
+            chart.add_task(task)
+
+    def undo(self, chart) -> None:
+        chart.remove_rows(self.rows)
+
+
+class RemoveTasks(Command):
+    """删除指定行的任务，保存被删除的任务对象以便恢复到原位置"""
+
+    structural = True
+
+    def __init__(self, rows: Sequence[int]):
+        """
+        初始化删除命令
+
+        参数:
+            rows (Sequence[int]): 要删除的行号
+        """
+        super().__init__()
+        self.removed_rows = sorted(set(rows))
+        self.tasks: List = []
+
+    @property
+    def rows(self) -> List[int]:
+        return list(self.removed_rows)
+
+    def size(self) -> int:
+        return sum(_task_size(task) for task in self.tasks)
+
+    def redo(self, chart) -> None:
+        self.tasks = [chart.tasks[row] for row in self.removed_rows]
+        chart.remove_rows(self.removed_rows)
+
+    def undo(self, chart) -> None:
+        chart.insert_tasks(self.removed_rows, self.tasks)
+
+
+class CommandHistory:
+    """带内存预算的撤销/重做历史"""
+
+    def __init__(self,
+                 chart,
+                 memory_budget: int = 16 * 1024 * 1024,
+                 coalesce_window: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        初始化命令历史
+
+        参数:
+            chart (GanttChart): 被编辑的甘特图
+            memory_budget (int): 撤销与重做栈合计的内存上限（字节）
+            coalesce_window (float): 合并连续编辑的时间窗口（秒）
+            clock (Callable): 时钟函数，返回秒
+        """
+        self.chart = chart
+        self.memory_budget = memory_budget
+        self.coalesce_window = coalesce_window
+        self.clock = clock
+        self._undo: Deque[Command] = deque()
+        self._redo: List[Command] = []
+        self._memory = 0
+
+    @property
+    def memory_usage(self) -> int:
+        """当前历史占用的粗略内存（字节）"""
+        return self._memory
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def __len__(self) -> int:
+        """可撤销的命令数量"""
+        return len(self._undo)
+
+    def clear(self) -> None:
+        """清空历史，例如打开新项目后"""
+        self._undo.clear()
+        self._redo.clear()
+        self._memory = 0
+
+    def execute(self, command: Command) -> Command:
+        """
+        执行命令并记入历史，可合并时并入上一条命令
+
+        参数:
+            command (Command): 命令
+
+        返回:
+            Command: 记入历史的命令（合并时为上一条命令）
+        """
+        command.redo(self.chart)
+        for dropped in self._redo:
+            self._memory -= dropped.size()
+        self._redo.clear()
+
+        now = self.clock()
+        last = self._undo[-1] if self._undo else None
+        if last is not None and now - last.timestamp <= self.coalesce_window:
+            before = last.size()
+            if last.merge(command):
+                last.timestamp = now
+                self._memory += last.size() - before
+                return last
+
+        command.timestamp = now
+        self._undo.append(command)
+        self._memory += command.size()
+        # 超出预算时丢弃最早的命令，至少保留刚执行的一条
+        while self._memory > self.memory_budget and len(self._undo) > 1:
+            self._memory -= self._undo.popleft().size()
+        return command
+
+    def edit_task(self, row: int, merge_key: Optional[str] = None, **values) -> Optional[Command]:
+        """
+        修改任务字段
+
+        参数:
+            row (int): 任务行号
+            merge_key (str): 合并键，例如 'drag'
+            **values: 字段名 -> 新值
+
+        返回:
+            Optional[Command]: 记入历史的命令，没有实际修改时返回None
+
+        异常:
+            ValueError: 如果字段不可编辑
+        """
+        unknown = [name for name in values if name not in EDITABLE_FIELDS]
+        if unknown:
+            raise ValueError(f"不可编辑的字段: {', '.join(unknown)}")
+        task = self.chart.tasks[row]
+        changes = {name: (getattr(task, name), value) for name, value in values.items()
+                   if getattr(task, name) != value}
+        if not changes:
+            return None
+        return self.execute(EditTask(row, changes, merge_key))
+
+    def add_tasks(self, tasks: Sequence) -> Command:
+        """在末尾添加任务"""
+        return self.execute(AddTasks(tasks))
+
+    def remove_rows(self, rows: Sequence[int]) -> Command:
+        """删除指定行的任务"""
+        return self.execute(RemoveTasks(rows))
+
+    def undo(self) -> Optional[Command]:
+        """
+        撤销最近一条命令
+
+        返回:
+            Optional[Command]: 被撤销的命令，没有可撤销的命令时返回None
+        """
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        command.undo(self.chart)
+        self._redo.append(command)
+        return command
+
+    def redo(self) -> Optional[Command]:
+        """
+        重做最近撤销的命令
+
+        返回:
+            Optional[Command]: 被重做的命令，没有可重做的命令时返回None
+        """
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        command.redo(self.chart)
+        # 重做后的命令不再与后续编辑合并
+        command.timestamp = float('-inf')
+        self._undo.append(command)
+        return command
@@ -0,0 +1,456 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+增量维护的任务依赖图
+
+以ArtifactID为节点，依赖关系 前置任务 -> 后续任务 为边。图中始终保存一个拓扑序；
+插入边时用 Pearce-Kelly 算法只在两端点拓扑序之间的区域搜索和调整顺序，
+不对整张图做深度优先搜索。会形成循环的边不加入图中，而是记录下来，
+删除边后重新尝试加入。一次性加载时先用 Kahn 算法排序，只有循环之间的节点才逐条插入。
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class ValidationReport:
+    """依赖关系检查结果"""
+
+    def __init__(self,
+                 dangling: List[Tuple[str, str]],
+                 self_references: List[str],
+                 cycles: List[List[str]],
+                 duplicates: List[str]):
+        """
+        初始化检查结果
+
+        参数:
+            dangling (List[Tuple[str, str]]): (任务ID, 不存在的前置任务ID)
+            self_references (List[str]): 依赖自身的任务ID
+            cycles (List[List[str]]): 循环依赖，每个循环以首尾相同的ID序列表示，例如 [A, B, A]
+            duplicates (List[str]): 重复的任务ID
+        """
+        self.dangling = dangling
+        self.self_references = self_references
+        self.cycles = cycles
+        self.duplicates = duplicates
+
+    @property
+    def ok(self) -> bool:
+        """依赖关系是否没有任何问题"""
+        return not (self.dangling or self.self_references or self.cycles or self.duplicates)
+
+    def __str__(self) -> str:
+        if self.ok:
+            return "依赖关系检查通过"
+        lines = []
+        for artfid, missing in self.dangling:
+            lines.append(f"{artfid} 依赖不存在的任务 {missing}")
+        for artfid in self.self_references:
+            lines.append(f"{artfid} 依赖自身")
+        for cycle in self.cycles:
+            lines.append(f"循环依赖: {' -> '.join(cycle)}")
+        for artfid in self.duplicates:
+            lines.append(f"重复的ArtifactID: {artfid}")
+        return '\n'.join(lines)
+
+
+def _task_dependencies(task) -> Tuple[str, ...]:
+    """任务的前置任务ID，去掉首尾空白并忽略空字符串"""
+    return tuple(filter(None, map(str.strip, map(str, task.dependencies or ()))))
+
+
+class DependencyGraph:
+    """增量维护拓扑序的依赖图，与甘特图的任务行一一对应"""
+
+    def __init__(self, tasks: Iterable = ()):
+        """
+        由任务一次性构建依赖图
+
+        参数:
+            tasks (Iterable[Task]): 任务，顺序与甘特图的行一致
+        """
+        self._chart = None
+        self.rebuild(tasks)
+
+    def __len__(self) -> int:
+        """依赖图中（不含形成循环而未加入的）边的数量"""
+        return self._edges
+
+    def _node(self, artfid: str) -> int:
+        """ID对应的节点，不存在时新建并排在拓扑序末尾"""
+        node = self._ids.get(artfid)
+        if node is None:
+            node = self._ids[artfid] = len(self._names)
+            self._names.append(artfid)
+            self._count.append(0)
+            self._succ.append([])
+            self._pred.append([])
+            self._ord.append(self._next_ord)
+            self._next_ord += 1
+        return node
+
+    def rebuild(self, tasks: Iterable) -> None:
+        """
+        丢弃现有内容，由任务重新构建
+
+        参数:
+            tasks (Iterable[Task]): 任务，顺序与甘特图的行一致
+        """
+        self._rows: List[Tuple[str, Tuple[str, ...]]] = [(task.artfId, _task_dependencies(task)) for task in tasks]
+        # 先按行的顺序为任务编号，循环之间的节点按该顺序排列
+        ids: Dict[str, int] = {}
+        for artfid, _ in self._rows:
+            ids.setdefault(artfid, len(ids))
+        self._count: List[int] = [0] * len(ids)
+        self._self: Dict[int, int] = {}
+        preds: List[int] = []
+        succs: List[int] = []
+        for artfid, dependencies in self._rows:
+            succ = ids[artfid]
+            self._count[succ] += 1
+            for dep in dependencies:
+                pred = ids.get(dep)
+                if pred is None:
+                    pred = ids[dep] = len(ids)
+                if pred == succ:
+                    self._self[succ] = self._self.get(succ, 0) + 1
+                else:
+                    preds.append(pred)
+                    succs.append(succ)
+
+        count = len(ids)
+        self._ids = ids
+        self._names: List[str] = list(ids)
+        self._count.extend([0] * (count - len(self._count)))
+        self._succ: List[List[int]] = [[] for _ in range(count)]
+        self._pred: List[List[int]] = [[] for _ in range(count)]
+        self._ord: List[int] = list(range(count))
+        self._next_ord = count
+        self._rejected: List[Tuple[int, int]] = []
+        self._bulk_insert(preds, succs)
+
+    def _bulk_insert(self, preds: List[int], succs: List[int]) -> None:
+        """
+        一次加入全部边
+
+        先用 Kahn 算法从入度为0的节点正向剥离、从出度为0的节点反向剥离，
+        剥离出的节点直接得到拓扑序；剩下的只有位于循环之间的节点，保持原有顺序，
+        其间与该顺序相反的边再逐条插入，因此形成循环时被拒绝的是指向前方的那条边。
+        """
+        count = len(self._names)
+        out, into = self._succ, self._pred
+        for pred, succ in zip(preds, succs):
+            out[pred].append(succ)
+            into[succ].append(pred)
+        indegree = [len(edges) for edges in into]
+        outdegree = [len(edges) for edges in out]
+
+        head = self._peel(out, indegree, [node for node in range(count) if not indegree[node]])
+        placed = bytearray(count)
+        for node in head:
+            placed[node] = 1
+        tail = self._peel(into, outdegree, [node for node in range(count)
+                                            if not outdegree[node] and not placed[node]])
+        for node in tail:
+            placed[node] = 1
+        core = [node for node in range(count) if not placed[node]]
+        ordered = self._ord
+        for position, node in enumerate(head + core + tail[::-1]):
+            ordered[node] = position
+        self._edges = len(preds)
+
+        backward = []
+        for node in core:
+            for pred in into[node]:
+                if ordered[pred] > ordered[node]:
+                    backward.append((pred, node))
+        for pred, succ in backward:
+            out[pred].remove(succ)
+            into[succ].remove(pred)
+        self._edges -= len(backward)
+        for pred, succ in backward:
+            self._insert_edge(pred, succ)
+
+    @staticmethod
+    def _peel(edges: List[List[int]], degree: List[int], frontier: List[int]) -> List[int]:
+        """Kahn 算法：依次取出度数为0的节点，返回取出的顺序"""
+        order = []
+        while frontier:
+            node = frontier.pop()
+            order.append(node)
+            for other in edges[node]:
+                degree[other] -= 1
+                if degree[other] == 0:
+                    frontier.append(other)
+        return order
+
+    def _search(self, start: int, target: int, upper: int) -> Tuple[List[int], Optional[List[int]]]:
+        """
+        从 start 沿后继边广度优先搜索拓扑序小于 upper 的节点
+
+        返回:
+            Tuple[List[int], Optional[List[int]]]: 访问到的节点，以及到达 target 时 start 到 target 的最短路径
+        """
+        ordered = self._ord
+        parent = {start: start}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for succ in self._succ[node]:
+                if succ == target:
+                    path = [target, node]
+                    while node != start:
+                        node = parent[node]
+                        path.append(node)
+                    return list(parent), path[::-1]
+                if succ not in parent and ordered[succ] < upper:
+                    parent[succ] = node
+                    queue.append(succ)
+        return list(parent), None
+
+    def _backward(self, start: int, lower: int) -> List[int]:
+        """从 start 沿前驱边搜索拓扑序大于 lower 的节点"""
+        ordered = self._ord
+        visited = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for pred in self._pred[node]:
+                if pred not in visited and ordered[pred] > lower:
+                    visited.add(pred)
+                    stack.append(pred)
+        return list(visited)
+
+    def _insert_edge(self, pred: int, succ: int) -> bool:
+        """
+        插入边 pred -> succ 并保持拓扑序（Pearce-Kelly）
+
+        返回:
+            bool: 是否已加入；形成循环时记录为被拒绝的边并返回False
+        """
+        ordered = self._ord
+        lower, upper = ordered[succ], ordered[pred]
+        if lower > upper:
+            self._succ[pred].append(succ)
+            self._pred[succ].append(pred)
+            self._edges += 1
+            return True
+        forward, cycle = self._search(succ, pred, upper)
+        if cycle is not None:
+            self._rejected.append((pred, succ))
+            return False
+        backward = self._backward(pred, lower)
+        # 受影响的节点重新分配原有的这些序号：前驱一侧整体排在后继一侧之前
+        backward.sort(key=ordered.__getitem__)
+        forward.sort(key=ordered.__getitem__)
+        nodes = backward + forward
+        positions = sorted(ordered[node] for node in nodes)
+        for node, position in zip(nodes, positions):
+            ordered[node] = position
+        self._succ[pred].append(succ)
+        self._pred[succ].append(pred)
+        self._edges += 1
+        return True
+
+    def _remove_edge(self, pred: int, succ: int) -> None:
+        """删除一条边；删除图中的边后重新尝试加入被拒绝的边"""
+        if pred == succ:
+            remaining = self._self.get(succ, 0) - 1
+            if remaining > 0:
+                self._self[succ] = remaining
+            else:
+                self._self.pop(succ, None)
+            return
+        try:
+            self._rejected.remove((pred, succ))
+            return
+        except ValueError:
+            pass
+        self._succ[pred].remove(succ)
+        self._pred[succ].remove(pred)
+        self._edges -= 1
+        # 只有删除的边可能位于其循环路径 succ -> ... -> pred 上的被拒绝边才需要重试
+        ordered = self._ord
+        retry = [edge for edge in self._rejected
+                 if ordered[edge[1]] <= ordered[pred] and ordered[succ] <= ordered[edge[0]]]
+        if retry:
+            self._rejected = [edge for edge in self._rejected if edge not in retry]
+            for edge in retry:
+                self._insert_edge(*edge)
+
+    def _add_row(self, entry: Tuple[str, Tuple[str, ...]]) -> None:
+        succ = self._node(entry[0])
+        self._count[succ] += 1
+        for dep in entry[1]:
+            pred = self._node(dep)
+            if pred == succ:
+                self._self[succ] = self._self.get(succ, 0) + 1
+            else:
+                self._insert_edge(pred, succ)
+
+    def _remove_row(self, entry: Tuple[str, Tuple[str, ...]]) -> None:
+        succ = self._ids[entry[0]]
+        self._count[succ] -= 1
+        for dep in entry[1]:
+            self._remove_edge(self._ids[dep], succ)
+
+    def insert(self, row: int, task) -> None:
+        """
+        在指定行插入任务
+
+        参数:
+            row (int): 插入后任务所在的行号
+            task (Task): 任务
+        """
+        entry = (task.artfId, _task_dependencies(task))
+        self._rows.insert(row, entry)
+        self._add_row(entry)
+
+    def append(self, task) -> None:
+        """在末尾添加任务"""
+        self.insert(len(self._rows), task)
+
+    def remove(self, row: int) -> None:
+        """
+        删除指定行的任务
+
+        参数:
+            row (int): 行号
+        """
+        self._remove_row(self._rows.pop(row))
+
+    def refresh(self, row: int, task) -> None:
+        """
+        任务的ID或依赖被修改后，只更新发生变化的边
+
+        参数:
+            row (int): 行号
+            task (Task): 修改后的任务
+        """
+        old = self._rows[row]
+        new = (task.artfId, _task_dependencies(task))
+        if new == old:
+            return
+        self._rows[row] = new
+        if new[0] != old[0]:
+            self._remove_row(old)
+            self._add_row(new)
+            return
+        # 先删除去掉的边再加入新增的边，新增的边不会因为即将删除的边被判为循环
+        succ = self._ids[new[0]]
+        removed = list(old[1])
+        added = []
+        for dep in new[1]:
+            if dep in removed:
+                removed.remove(dep)
+            else:
+                added.append(dep)
+        for dep in removed:
+            self._remove_edge(self._ids[dep], succ)
+        for dep in added:
+            pred = self._node(dep)
+            if pred == succ:
+                self._self[succ] = self._self.get(succ, 0) + 1
+            else:
+                self._insert_edge(pred, succ)
+
+    def attach(self, chart) -> None:
+        """
+        与甘特图同步：由其任务重新构建，并订阅任务变化通知
+
+        参数:
+            chart (GanttChart): 甘特图
+        """
+        self.detach()
+        self._chart = chart
+        self.rebuild(chart.tasks)
+        chart.subscribe(self._on_chart_changed)
+
+    def detach(self) -> None:
+        """取消与甘特图的同步"""
+        if self._chart is not None:
+            self._chart.unsubscribe(self._on_chart_changed)
+            self._chart = None
+
+    def _on_chart_changed(self, event: str, rows: List[int]) -> None:
+        tasks = self._chart.tasks
+        if event == 'added':
+            for row in rows:
+                self.insert(row, tasks[row])
+        elif event == 'modified':
+            for row in rows:
+                self.refresh(row, tasks[row])
+        elif event == 'removed':
+            for row in sorted(rows, reverse=True):
+                self.remove(row)
+        else:
+            self.rebuild(tasks)
+
+    def find_cycle(self, pred: str, succ: str) -> Optional[List[str]]:
+        """
+        检查加入依赖 pred -> succ（succ 依赖 pred）是否会形成循环，不修改依赖图
+
+        参数:
+            pred (str): 前置任务ID
+            succ (str): 后续任务ID
+
+        返回:
+            Optional[List[str]]: 会形成的循环（首尾相同的ID序列），不会形成循环时返回None
+        """
+        if pred == succ:
+            return [pred, pred]
+        source, target = self._ids.get(succ), self._ids.get(pred)
+        if source is None or target is None or self._ord[source] > self._ord[target]:
+            return None
+        _, path = self._search(source, target, self._ord[target])
+        if path is None:
+            return None
+        return [pred] + [self._names[node] for node in path]
+
+    def order(self) -> List[str]:
+        """
+        按拓扑序排列的任务ID，前置任务总在后续任务之前（不考虑形成循环而未加入的边）
+
+        返回:
+            List[str]: 任务ID
+        """
+        nodes = sorted((node for node, count in enumerate(self._count) if count), key=self._ord.__getitem__)
+        return [self._names[node] for node in nodes]
+
+    def validate(self) -> ValidationReport:
+        """
+        检查不存在的前置任务、自身依赖、循环依赖和重复ID
+
+        返回:
+            ValidationReport: 检查结果
+        """
+        names = self._names
+        dangling = []
+        for node, count in enumerate(self._count):
+            if not count and self._succ[node]:
+                missing = names[node]
+                dangling.extend((names[succ], missing) for succ in dict.fromkeys(self._succ[node]))
+        dangling.sort()
+        self_references = sorted(names[node] for node in self._self)
+        cycles = []
+        for pred, succ in dict.fromkeys(self._rejected):
+            cycle = self.find_cycle(names[pred], names[succ])
+            if cycle is not None:
+                cycles.append(cycle)
+        duplicates = sorted(names[node] for node, count in enumerate(self._count) if count > 1)
+        return ValidationReport(dangling, self_references, cycles, duplicates)
+
+
+def validate_dependencies(tasks: Sequence) -> ValidationReport:
+    """
+    一次性检查任务的依赖关系
+
+    参数:
+        tasks (Sequence[Task]): 任务
+
+    返回:
+        ValidationReport: 检查结果
+    """
+    return DependencyGraph(tasks).validate()
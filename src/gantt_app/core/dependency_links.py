@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+任务依赖连线
+
+对全部依赖边批量计算"完成-开始"连线的折线顶点，合并为一个LineCollection绘制。
+连线采用正交走线：水平段走在两行任务条之间的空隙（行高为1、任务条高0.8），
+只有竖直段会穿过其他行。视图范围变化时只保留与视图相交的连线；
+缩小视图时可见连线很多，在屏幕上重合的连线只绘制一次。
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from gantt_app.core.columns import task_columns
+
+
+# 每条连线的顶点数：6个折线顶点 + 箭头两翼（P5 -> 翼1 -> P5 -> 翼2）
+VERTICES_PER_LINK = 9
+
+# 可见连线超过该数量时，合并在屏幕上（半像素精度）重合的连线
+DEDUPE_THRESHOLD = 2000
+
+# 连线顶点的像素坐标哈希权重
+_HASH_WEIGHTS = np.random.default_rng(0).integers(1, 2 ** 62, VERTICES_PER_LINK * 2) | 1
+
+
+def dependency_edges(tasks: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    解析任务的依赖关系
+
+    依赖中的ID按首次出现的任务匹配，找不到的ID被忽略。
+
+    参数:
+        tasks (Sequence[Task]): 任务序列
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: 前置任务行号与后续任务行号
+    """
+    rows: Dict[str, int] = {}
+    for row, task in enumerate(tasks):
+        rows.setdefault(task.artfId, row)
+    sources: List[int] = []
+    targets: List[int] = []
+    for row, task in enumerate(tasks):
+        for artfid in task.dependencies or ():
+            source = rows.get(artfid.strip())
+            if source is not None and source != row:
+                sources.append(source)
+                targets.append(row)
+    return np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64)
+
+
+def route_links(finish: np.ndarray,
+                finish_y: np.ndarray,
+                start: np.ndarray,
+                start_y: np.ndarray,
+                gap: float = 0.5,
+                head_length: float = 0.3,
+                head_height: float = 0.12) -> np.ndarray:
+    """
+    批量计算"完成-开始"连线的正交折线
+
+    从前置任务结束处向右 gap 天，竖直走到后续任务所在行靠近前置任务一侧的行间空隙，
+    沿空隙水平走到后续任务开始前 gap 天，再进入后续任务所在行，最后水平指向其开始处。
+    同一行且后续任务在右侧时为一条直线。
+
+    参数:
+        finish (np.ndarray): 前置任务结束的x坐标（日期数值）
+        finish_y (np.ndarray): 前置任务行的纵坐标
+        start (np.ndarray): 后续任务开始的x坐标
+        start_y (np.ndarray): 后续任务行的纵坐标
+        gap (float): 拐弯处与任务条端点的水平距离（天）
+        head_length (float): 箭头长度（天）
+        head_height (float): 箭头半宽（行）
+
+    返回:
+        np.ndarray: 形状为 (边数, VERTICES_PER_LINK, 2) 的顶点
+    """
+    count = len(finish)
+    # 行间空隙在后续任务所在行靠近前置任务的一侧，同一行时取上方
+    side = np.sign(finish_y - start_y)
+    side[side == 0] = 1
+    gutter = start_y + 0.5 * side
+    turn_out = finish + gap
+    turn_in = start - gap
+    straight = (finish_y == start_y) & (turn_in >= turn_out)
+    gutter = np.where(straight, start_y, gutter)
+
+    verts = np.empty((count, VERTICES_PER_LINK, 2))
+    xs = (finish, turn_out, turn_out, turn_in, turn_in, start,
+          start - head_length, start, start - head_length)
+    ys = (finish_y, finish_y, gutter, gutter, start_y, start_y,
+          start_y + head_height, start_y, start_y - head_height)
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        verts[:, i, 0] = x
+        verts[:, i, 1] = y
+    return verts
+
+
+class DependencyLinks:
+    """坐标轴上的依赖连线，随视图范围剔除不可见的连线"""
+
+    def __init__(self,
+                 ax,
+                 tasks: Sequence,
+                 y_positions: Optional[np.ndarray] = None,
+                 gap: float = 0.5,
+                 color: str = '#555555',
+                 linewidth: float = 0.8,
+                 alpha: float = 0.8):
+        """
+        计算连线并添加到坐标轴
+
+        参数:
+            ax: matplotlib坐标轴
+            tasks (Sequence[Task]): 任务序列
+            y_positions (np.ndarray): 每个任务所在行的纵坐标，默认第一行在最上方（n, n-1, ..., 1）
+            gap (float): 拐弯处与任务条端点的水平距离（天）
+            color (str): 连线颜色
+            linewidth (float): 线宽
+            alpha (float): 透明度
+        """
+        self.ax = ax
+        self.gap = gap
+        self.collection = LineCollection([], colors=color, linewidths=linewidth, alpha=alpha, zorder=2.5)
+        ax.add_collection(self.collection, autolim=False)
+        self.sources = self.targets = np.empty(0, dtype=np.int64)
+        self.verts = np.empty((0, VERTICES_PER_LINK, 2))
+        self._lower = self._upper = np.empty((0, 2))
+        self.visible = np.empty(0, dtype=bool)
+        self.set_tasks(tasks, y_positions)
+        self._callbacks = [ax.callbacks.connect('xlim_changed', self._on_view_changed),
+                           ax.callbacks.connect('ylim_changed', self._on_view_changed)]
+
+    def __len__(self) -> int:
+        """连线数量"""
+        return len(self.sources)
+
+    def set_tasks(self, tasks: Sequence, y_positions: Optional[np.ndarray] = None) -> None:
+        """
+        任务或依赖变化后重新计算全部连线
+
+        参数:
+            tasks (Sequence[Task]): 任务序列
+            y_positions (np.ndarray): 每个任务所在行的纵坐标
+        """
+        self.sources, self.targets = dependency_edges(tasks)
+        if len(self.sources):
+            columns = task_columns(tasks)
+            start = mdates.date2num(columns['Start'])
+            finish = start + columns['Duration'].astype(float)
+            y = (np.asarray(y_positions, dtype=float) if y_positions is not None
+                 else len(tasks) - np.arange(len(tasks), dtype=float))
+            self.verts = route_links(finish[self.sources], y[self.sources],
+                                     start[self.targets], y[self.targets], gap=self.gap)
+        else:
+            self.verts = np.empty((0, VERTICES_PER_LINK, 2))
+        # 每条连线的外接矩形，用于视图剔除
+        self._lower = self.verts.min(axis=1)
+        self._upper = self.verts.max(axis=1)
+        self.visible = np.zeros(len(self.verts), dtype=bool)
+        self.cull(force=True)
+
+    def cull(self, force: bool = False) -> int:
+        """
+        只保留与当前视图相交的连线
+
+        可见连线较多时按半像素精度合并屏幕上重合的连线。
+
+        参数:
+            force (bool): 可见集合不变时也重新设置线段
+
+        返回:
+            int: 可见的连线数量
+        """
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        visible = ((self._lower[:, 0] <= x1) & (self._upper[:, 0] >= x0)
+                   & (self._lower[:, 1] <= y1) & (self._upper[:, 1] >= y0))
+        count = int(visible.sum())
+        # 合并重合连线的结果取决于像素位置，视图每次变化都要重新计算
+        dedupe = count > DEDUPE_THRESHOLD
+        if force or dedupe or not np.array_equal(visible, self.visible):
+            self.visible = visible
+            verts = self.verts[visible]
+            if dedupe:
+                verts = verts[self._distinct_on_screen(verts)]
+            self.collection.set_segments(verts)
+        return count
+
+    def _distinct_on_screen(self, verts: np.ndarray) -> np.ndarray:
+        """在屏幕上（半像素精度）互不重合的连线下标"""
+        pixels = self.ax.transData.transform(verts.reshape(-1, 2))
+        keys = np.round(pixels * 2).astype(np.int64).reshape(len(verts), -1) @ _HASH_WEIGHTS
+        _, first = np.unique(keys, return_index=True)
+        return np.sort(first)
+
+    def _on_view_changed(self, _ax) -> None:
+        self.cull()
+
+    def remove(self) -> None:
+        """从坐标轴移除连线"""
+        for cid in self._callbacks:
+            self.ax.callbacks.disconnect(cid)
+        self.collection.remove()
+
+
+def draw_dependency_links(ax, tasks: Sequence, y_positions: Optional[np.ndarray] = None,
+                          **kwargs) -> Optional[DependencyLinks]:
+    """
+    绘制任务依赖连线
+
+    参数:
+        ax: matplotlib坐标轴
+        tasks (Sequence[Task]): 任务序列
+        y_positions (np.ndarray): 每个任务所在行的纵坐标
+        **kwargs: 传给 DependencyLinks 的样式参数
+
+    返回:
+        Optional[DependencyLinks]: 连线对象，没有依赖关系时返回None
+    """
+    if not any(task.dependencies for task in tasks):
+        return None
+    return DependencyLinks(ax, tasks, y_positions, **kwargs)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+甘特图快照对比
+
+以 ArtifactID 对齐基线与当前两个快照，分类新增、删除、变更的任务，
+并计算开始/结束日期与进度的偏差。
+"""
+
+from typing import Dict, Optional, Tuple
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.collections import PolyCollection
+
+from gantt_app.core.columns import task_columns
+
+
+# 对比时参与比较的字段
+COMPARED_FIELDS = ['AssignTo', 'Description', 'Start', 'End', 'Progress']
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+
+def snapshot_frame(chart) -> pd.DataFrame:
+    """
+    将甘特图转换为以 ArtifactID 为键的快照表
+
+    重复的ID只保留最后一个，并打印提示。
+
+    参数:
+        chart (GanttChart): 甘特图对象
+
+    返回:
+        pd.DataFrame: 包含 ArtifactID 与对比字段的数据框
+    """
+    columns = task_columns(chart.tasks)
+    frame = pd.DataFrame({name: columns[name] for name in ['ArtifactID'] + COMPARED_FIELDS})
+
+    duplicated = frame['ArtifactID'].duplicated(keep='last')
+    if duplicated.any():
+        print(f"快照中存在 {int(duplicated.sum())} 个重复的ArtifactID，只保留最后一个")
+        frame = frame[~duplicated]
+    return frame
+
+
+class ChartDiff:
+    """两个甘特图快照之间的差异"""
+
+    def __init__(self, table: pd.DataFrame):
+        """
+        初始化差异结果
+
+        参数:
+            table (pd.DataFrame): 偏差表，每个ArtifactID一行
+        """
+        self.table = table
+
+    @property
+    def added(self) -> pd.DataFrame:
+        """新增的任务"""
+        return self.table[self.table['Change'] == ADDED]
+
+    @property
+    def removed(self) -> pd.DataFrame:
+        """删除的任务"""
+        return self.table[self.table['Change'] == REMOVED]
+
+    @property
+    def changed(self) -> pd.DataFrame:
+        """发生变更的任务"""
+        return self.table[self.table['Change'] == CHANGED]
+
+    def summary(self) -> Dict[str, int]:
+        """
+        统计各类变化的数量
+
+        返回:
+            Dict[str, int]: 变化类型到任务数的映射
+        """
+        counts = self.table['Change'].value_counts()
+        return {kind: int(counts.get(kind, 0)) for kind in (ADDED, REMOVED, CHANGED, UNCHANGED)}
+
+    def export_csv(self, filepath: str) -> None:
+        """
+        导出偏差表为CSV文件
+
+        参数:
+            filepath (str): 导出的文件路径
+        """
+        self.table.to_csv(filepath, index=False)
+        print(f"偏差表已导出到 {filepath}")
+
+    def export_excel(self, filepath: str) -> None:
+        """
+        导出偏差表为Excel文件
+
+        参数:
+            filepath (str): 导出的文件路径
+        """
+        self.table.to_excel(filepath, index=False)
+        print(f"偏差表已导出到 {filepath}")
+
+
+def diff_charts(baseline, current) -> ChartDiff:
+    """
+    对比基线与当前甘特图
+
+    参数:
+        baseline (GanttChart): 基线快照
+        current (GanttChart): 当前快照
+
+    返回:
+        ChartDiff: 差异结果，偏差以天为单位（当前减基线）
+    """
+    merged = pd.merge(snapshot_frame(baseline), snapshot_frame(current),
+                      on='ArtifactID', how='outer', suffixes=('_base', '_cur'),
+                      indicator=True, sort=False)
+
+    both = (merged['_merge'] == 'both').to_numpy()
+    differs = np.zeros(len(merged), dtype=bool)
+    for field in COMPARED_FIELDS:
+        base, cur = merged[f'{field}_base'], merged[f'{field}_cur']
+        differs |= (base != cur).to_numpy() & both
+
+    change = np.where(merged['_merge'] == 'left_only', REMOVED,
+                      np.where(merged['_merge'] == 'right_only', ADDED,
+                               np.where(differs, CHANGED, UNCHANGED)))
+
+    one_day = np.timedelta64(1, 'D')
+    table = pd.DataFrame({
+        'ArtifactID': merged['ArtifactID'],
+        'Change': change,
+        'AssignTo': merged['AssignTo_cur'].fillna(merged['AssignTo_base']),
+        'Description': merged['Description_cur'].fillna(merged['Description_base']),
+        'BaselineStart': merged['Start_base'],
+        'BaselineEnd': merged['End_base'],
+        'CurrentStart': merged['Start_cur'],
+        'CurrentEnd': merged['End_cur'],
+        'StartVariance': (merged['Start_cur'] - merged['Start_base']) / one_day,
+        'EndVariance': (merged['End_cur'] - merged['End_base']) / one_day,
+        'ProgressVariance': merged['Progress_cur'] - merged['Progress_base'],
+    })
+    return ChartDiff(table)
+
+
+def baseline_spans(baseline, artifact_ids) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    按给定的ID顺序查找基线开始与结束日期
+
+    参数:
+        baseline (GanttChart): 基线快照
+        artifact_ids (Sequence[str]): 当前任务的ID序列
+
+    返回:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: 开始日期、结束日期，以及表示是否在基线中存在的布尔掩码
+    """
+    frame = snapshot_frame(baseline)
+    positions = pd.Index(frame['ArtifactID']).get_indexer(pd.Index(artifact_ids))
+    found = positions >= 0
+    if not found.any():
+        empty = np.full(len(positions), np.datetime64('NaT'), dtype='datetime64[us]')
+        return empty, empty, found
+
+    positions = np.where(found, positions, 0)
+    starts = frame['Start'].to_numpy()[positions]
+    ends = frame['End'].to_numpy()[positions]
+    return starts, ends, found
+
+
+def draw_baseline_overlay(ax,
+                          starts: np.ndarray,
+                          ends: np.ndarray,
+                          y_positions: np.ndarray,
+                          color: str = '#7f7f7f',
+                          height: float = 0.15) -> Optional[PolyCollection]:
+    """
+    在任务条下方绘制细的基线条
+
+    所有基线条合并为一个PolyCollection。
+
+    参数:
+        ax: matplotlib坐标轴
+        starts (np.ndarray): 基线开始日期
+        ends (np.ndarray): 基线结束日期
+        y_positions (np.ndarray): 对应任务行的纵坐标
+        color (str): 基线条颜色
+        height (float): 基线条高度（行高为1）
+
+    返回:
+        Optional[PolyCollection]: 添加到坐标轴的集合，如果没有基线条则返回None
+    """
+    if len(starts) == 0:
+        return None
+
+    x0 = mdates.date2num(starts)
+    x1 = mdates.date2num(ends)
+    # 基线条紧贴任务条(高0.8)的下沿
+    y0 = np.asarray(y_positions, dtype=float) - 0.4 - height
+    y1 = y0 + height
+
+    verts = np.stack([np.column_stack([x0, y0]), np.column_stack([x0, y1]),
+                      np.column_stack([x1, y1]), np.column_stack([x1, y0])], axis=1)
+    collection = PolyCollection(verts, facecolors=color, edgecolors='none',
+                                alpha=0.9, zorder=0.9)
+    ax.add_collection(collection)
+    return collection
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+流式CSV导出
+
+按固定大小的块遍历任务，逐块格式化并写入文件，避免一次性构建完整的DataFrame。
+支持gzip/zstd压缩，以及可选的行数与校验和尾注。
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import os
+from typing import Any, BinaryIO, Dict, Optional, Sequence
+
+import pandas as pd
+
+from gantt_app.core.columns import EXPORT_COLUMNS, task_columns
+
+
+DEFAULT_CHUNK_SIZE = 10000
+# 与 DataFrame.to_csv 相同：整列时间都为零点时只写日期，否则写到秒
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _column_format(values) -> str:
+    """整列日期都没有时间部分时只写日期"""
+    if any(value.hour or value.minute or value.second or value.microsecond for value in values):
+        return DATETIME_FORMAT
+    return DATE_FORMAT
+
+
+def _resolve_compression(filepath, compression: Optional[str]) -> Optional[str]:
+    """根据参数或文件扩展名确定压缩方式"""
+    if compression == 'infer':
+        filepath = os.fspath(filepath)
+        if filepath.endswith('.gz'):
+            return 'gzip'
+        if filepath.endswith('.zst'):
+            return 'zstd'
+        return None
+    if compression not in (None, 'gzip', 'zstd'):
+        raise ValueError(f"不支持的压缩方式: {compression}")
+    return compression
+
+
+def _open_binary(filepath: str, compression: Optional[str], mode: str) -> BinaryIO:
+    """以二进制方式打开（可能压缩的）文件"""
+    if compression == 'gzip':
+        return gzip.open(filepath, mode)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd压缩需要安装 zstandard 包: pip install zstandard")
+        raw = open(filepath, mode)
+        if mode == 'wb':
+            return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return open(filepath, mode)
+
+
+def _format_chunk(tasks: Sequence, start_format: str, end_format: str) -> str:
+    """将一块任务格式化为CSV文本（不含表头）"""
+    columns = task_columns(tasks)
+    # 日期列整体格式化，而不是逐个调用strftime
+    columns['Start'] = pd.DatetimeIndex(columns['Start']).strftime(start_format)
+    columns['End'] = pd.DatetimeIndex(columns['End']).strftime(end_format)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerows(zip(*(columns[name] for name in EXPORT_COLUMNS)))
+    return buffer.getvalue()
+
+
+def write_csv_stream(tasks: Sequence,
+                     filepath,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     compression: Optional[str] = 'infer',
+                     footer: bool = False,
+                     date_format: Optional[str] = None) -> Dict[str, Any]:
+    """
+    分块流式写出任务CSV
+
+    参数:
+        tasks (Sequence[Task]): 任务序列
+        filepath (str | os.PathLike): 导出的文件路径
+        chunk_size (int): 每块的任务数
+        compression (str): 'gzip'、'zstd'、None，或'infer'按扩展名(.gz/.zst)推断
+        footer (bool): 是否在文件末尾追加行数与SHA-256校验和尾注
+        date_format (str): 日期格式，默认与 DataFrame.to_csv 一致：
+            整列都是零点时写 '%Y-%m-%d'，否则写 '%Y-%m-%d %H:%M:%S'
+
+    返回:
+        Dict[str, Any]: 包含 rows（数据行数）和 sha256（表头与数据部分的校验和）
+
+    异常:
+        ValueError: 如果chunk_size不是正数或压缩方式不受支持
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size必须为正数")
+    compression = _resolve_compression(filepath, compression)
+    # 分块写出前先按全部任务确定格式，各块的格式保持一致
+    start_format = date_format or _column_format(task.start_date for task in tasks)
+    end_format = date_format or _column_format(task.end_date for task in tasks)
+
+    digest = hashlib.sha256()
+    with _open_binary(filepath, compression, 'wb') as stream:
+        data = (','.join(EXPORT_COLUMNS) + '\n').encode('utf-8')
+        digest.update(data)
+        stream.write(data)
+
+        for offset in range(0, len(tasks), chunk_size):
+            data = _format_chunk(tasks[offset:offset + chunk_size], start_format, end_format).encode('utf-8')
+            digest.update(data)
+            stream.write(data)
+
+        checksum = digest.hexdigest()
+        if footer:
+            # 尾注以'#'开头，读取时可用 verify_csv_stream 校验后再解析
+            stream.write(f"#rows={len(tasks)}\n#sha256={checksum}\n".encode('utf-8'))
+
+    return {'rows': len(tasks), 'sha256': checksum}
+
+
+def verify_csv_stream(filepath, compression: Optional[str] = 'infer') -> bool:
+    """
+    校验带尾注的CSV文件
+
+    参数:
+        filepath (str | os.PathLike): CSV文件路径
+        compression (str): 压缩方式，含义同 write_csv_stream
+
+    返回:
+        bool: 行数与校验和均一致时返回True
+
+    异常:
+        ValueError: 如果文件不包含尾注
+    """
+    compression = _resolve_compression(filepath, compression)
+    with _open_binary(filepath, compression, 'rb') as stream:
+        content = stream.read()
+
+    lines = content.splitlines(keepends=True)
+    if len(lines) < 3 or not lines[-1].startswith(b'#sha256=') or not lines[-2].startswith(b'#rows='):
+        raise ValueError(f"文件不包含校验尾注: {filepath}")
+
+    expected_rows = int(lines[-2][len(b'#rows='):])
+    expected_sha = lines[-1][len(b'#sha256='):].strip().decode('ascii')
+    body = b''.join(lines[:-2])
+
+    rows = len(pd.read_csv(io.BytesIO(body)))
+    return rows == expected_rows and hashlib.sha256(body).hexdigest() == expected_sha
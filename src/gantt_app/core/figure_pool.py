@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+不依赖pyplot的图片渲染
+
+pyplot 维护进程级的“当前Figure”，未关闭的Figure会一直被引用，多个线程同时绘制时还会互相覆盖。
+这里直接使用 Figure + FigureCanvasAgg：每次渲染从池中独占一个Figure，用完清空后放回，
+渲染出错的Figure直接丢弃。不同线程使用不同的Figure，互不影响。
+"""
+
+import io
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple, Union
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+DEFAULT_FIGSIZE = (12, 8)
+
+
+class FigurePool:
+    """可复用的Figure池，线程安全"""
+
+    def __init__(self, max_idle: int = 4):
+        """
+        初始化Figure池
+
+        参数:
+            max_idle (int): 最多保留的空闲Figure数量，多出的直接释放
+        """
+        self.max_idle = max_idle
+        self._idle: List[Figure] = []
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def __len__(self) -> int:
+        """空闲Figure数量"""
+        return len(self._idle)
+
+    def acquire(self, figsize: Tuple[float, float] = DEFAULT_FIGSIZE, dpi: float = 100) -> Figure:
+        """
+        取出一个空白Figure，池为空时新建
+
+        参数:
+            figsize (Tuple[float, float]): 尺寸（英寸）
+            dpi (float): 分辨率
+
+        返回:
+            Figure: 绑定了Agg画布的Figure，只由调用方使用
+        """
+        with self._lock:
+            fig = self._idle.pop() if self._idle else None
+            if fig is None:
+                self.created += 1
+        if fig is None:
+            fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(fig)
+        else:
+            fig.set_size_inches(figsize, forward=False)
+            fig.set_dpi(dpi)
+        return fig
+
+    def release(self, fig: Figure) -> None:
+        """
+        清空Figure并放回池中
+
+        参数:
+            fig (Figure): 由 acquire 取出的Figure
+        """
+        fig.clear()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(fig)
+
+    def clear(self) -> None:
+        """释放全部空闲Figure"""
+        with self._lock:
+            self._idle.clear()
+
+    @contextmanager
+    def figure(self, figsize: Tuple[float, float] = DEFAULT_FIGSIZE, dpi: float = 100) -> Iterator[Figure]:
+        """
+        在 with 块内独占一个Figure；正常结束时放回池中，出错时丢弃
+
+        参数:
+            figsize (Tuple[float, float]): 尺寸（英寸）
+            dpi (float): 分辨率
+        """
+        fig = self.acquire(figsize, dpi)
+        try:
+            yield fig
+        except BaseException:
+            fig.clear()
+            raise
+        self.release(fig)
+
+
+# 模块级默认池，供服务和命令行共用
+default_pool = FigurePool()
+
+
+def render_image(chart,
+                 target: Union[str, io.IOBase, None] = None,
+                 format: Optional[str] = None,
+                 figsize: Tuple[float, float] = DEFAULT_FIGSIZE,
+                 dpi: float = 300,
+                 bbox_inches: Optional[str] = 'tight',
+                 pool: Optional[FigurePool] = None,
+                 **options) -> Optional[bytes]:
+    """
+    渲染甘特图图片，不使用pyplot，可在多个线程中同时调用
+
+    参数:
+        chart (GanttChart): 甘特图
+        target (str | 文件对象): 保存路径或可写的二进制文件对象，为None时返回图片字节
+        format (str): 图片格式，默认由路径扩展名决定，返回字节时默认png
+        figsize (Tuple[float, float]): 尺寸（英寸）
+        dpi (float): 分辨率
+        bbox_inches (str): 传给 savefig 的 bbox_inches
+        pool (FigurePool): Figure池，默认使用 default_pool
+        **options: 传给 GanttChart.draw 的参数（baseline、calendar、history、links）
+
+    返回:
+        Optional[bytes]: target 为None时返回图片内容
+
+    异常:
+        ValueError: 如果没有任务
+    """
+    pool = default_pool if pool is None else pool
+    buffer = io.BytesIO() if target is None else None
+    if buffer is not None and format is None:
+        format = 'png'
+    with pool.figure(figsize) as fig:
+        chart.draw(fig, **options)
+        fig.savefig(buffer if buffer is not None else target, format=format, dpi=dpi, bbox_inches=bbox_inches)
+    return buffer.getvalue() if buffer is not None else None
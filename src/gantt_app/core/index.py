@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+甘特图任务的二级索引
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+NOT_STARTED = 'not_started'
+IN_PROGRESS = 'in_progress'
+DONE = 'done'
+
+
+def progress_state(progress: float) -> str:
+    """
+    将完成百分比归入进度分桶
+
+    参数:
+        progress (float): 完成百分比 (0-100)
+
+    返回:
+        str: 'not_started'、'in_progress' 或 'done'
+    """
+    if progress <= 0:
+        return NOT_STARTED
+    if progress >= 100:
+        return DONE
+    return IN_PROGRESS
+
+
+def split_assignees(assign_to) -> List[str]:
+    """
+    拆分负责人字段，例如 "Bingfan Xu,Kun Xiao" 会被拆成两个人
+
+    参数:
+        assign_to: 负责人字段
+
+    返回:
+        List[str]: 负责人列表
+    """
+    names = [name.strip() for name in str(assign_to).split(',')]
+    return [name for name in names if name] or [str(assign_to)]
+
+
+class _Descending:
+    """在最小堆中按降序排列的包装"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+
+class RunningExtreme:
+    """
+    支持删除的运行最小值（或最大值）
+
+    计数字典记录每个值出现的次数，堆中的值在计数归零后延迟删除，
+    添加、删除均摊 O(log n)，查询通常 O(1)。
+    """
+
+    def __init__(self, maximum: bool = False):
+        """
+        参数:
+            maximum (bool): 是否维护最大值，默认维护最小值
+        """
+        self.maximum = maximum
+        self._counts: Dict[Any, int] = {}
+        self._heap: list = []
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._heap.clear()
+
+    def add(self, value) -> None:
+        count = self._counts.get(value, 0)
+        self._counts[value] = count + 1
+        if not count:
+            heapq.heappush(self._heap, _Descending(value) if self.maximum else value)
+            if len(self._heap) > 2 * len(self._counts) + 16:
+                # 已删除的值过多时重建堆
+                self._heap = [_Descending(v) if self.maximum else v for v in self._counts]
+                heapq.heapify(self._heap)
+
+    def discard(self, value) -> None:
+        count = self._counts.get(value)
+        if count is None:
+            return
+        if count > 1:
+            self._counts[value] = count - 1
+        else:
+            del self._counts[value]
+
+    def value(self):
+        """当前的最小值（或最大值），为空时返回None"""
+        heap = self._heap
+        while heap:
+            top = heap[0].value if self.maximum else heap[0]
+            if top in self._counts:
+                return top
+            heapq.heappop(heap)
+        return None
+
+
+class TaskIndex:
+    """维护 ArtifactID、负责人和进度分桶到任务行号的索引"""
+
+    def __init__(self):
+        """初始化空索引"""
+        self.by_id: Dict[str, int] = {}
+        self.by_assignee: Dict[str, Set[int]] = {}
+        self.by_progress: Dict[str, Set[int]] = {}
+        # 重复ID的其余行号，首次出现的行号保存在 by_id 中
+        self.duplicates: Dict[str, List[int]] = {}
+        # 全部任务的最早开始与最晚结束时间；每行加入时的日期另存一份，
+        # 删除时按存下的值减计数，任务对象被直接修改过也不会留下旧值
+        self.first_start = RunningExtreme()
+        self.last_end = RunningExtreme(maximum=True)
+        self.dates: Dict[int, Tuple[Any, Any]] = {}
+
+    def clear(self) -> None:
+        """清空索引"""
+        self.by_id.clear()
+        self.by_assignee.clear()
+        self.by_progress.clear()
+        self.duplicates.clear()
+        self.first_start.clear()
+        self.last_end.clear()
+        self.dates.clear()
+
+    def date_range(self) -> Optional[Tuple[Any, Any]]:
+        """
+        全部任务的最早开始与最晚结束时间
+
+        返回:
+            Optional[Tuple[datetime, datetime]]: 没有任务时返回None
+        """
+        first = self.first_start.value()
+        if first is None:
+            return None
+        return first, self.last_end.value()
+
+    def add(self, task, row: int) -> bool:
+        """
+        将任务加入索引
+
+        参数:
+            task (Task): 任务对象
+            row (int): 任务在 GanttChart.tasks 中的行号
+
+        返回:
+            bool: 如果ID已经存在（重复）则返回False
+        """
+        for name in split_assignees(task.assignTo):
+            self.by_assignee.setdefault(name, set()).add(row)
+        self.by_progress.setdefault(progress_state(task.progress), set()).add(row)
+        self.first_start.add(task.start_date)
+        self.last_end.add(task.end_date)
+        self.dates[row] = (task.start_date, task.end_date)
+
+        if task.artfId in self.by_id:
+            self.duplicates.setdefault(task.artfId, []).append(row)
+            return False
+        self.by_id[task.artfId] = row
+        return True
+
+    def discard(self, task, row: int) -> None:
+        """
+        从索引中移除某一行的任务
+
+        参数:
+            task (Task): 该行原来的任务对象
+            row (int): 行号
+        """
+        for name in split_assignees(task.assignTo):
+            rows = self.by_assignee.get(name)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self.by_assignee[name]
+        rows = self.by_progress.get(progress_state(task.progress))
+        if rows is not None:
+            rows.discard(row)
+        dates = self.dates.pop(row, None)
+        if dates is not None:
+            self.first_start.discard(dates[0])
+            self.last_end.discard(dates[1])
+
+        extra = self.duplicates.get(task.artfId)
+        if self.by_id.get(task.artfId) == row:
+            if extra:
+                self.by_id[task.artfId] = extra.pop(0)
+            else:
+                del self.by_id[task.artfId]
+        elif extra and row in extra:
+            extra.remove(row)
+        if extra is not None and not extra:
+            del self.duplicates[task.artfId]
+
+    def rebuild(self, tasks: Iterable) -> None:
+        """
+        根据任务列表重建全部索引
+
+        参数:
+            tasks (Iterable[Task]): 任务序列
+        """
+        self.clear()
+        for row, task in enumerate(tasks):
+            self.add(task, row)
+
+    def query(self,
+              ids: Optional[Iterable[str]] = None,
+              assignee: Optional[str] = None,
+              progress: Optional[str] = None) -> List[int]:
+        """
+        按索引求交集查询行号
+
+        参数:
+            ids (Iterable[str]): ArtifactID集合
+            assignee (str): 负责人
+            progress (str): 进度分桶，见 progress_state
+
+        返回:
+            List[int]: 满足所有条件的行号，按行号升序排列；没有任何条件时返回空列表
+        """
+        candidates = []
+        if ids is not None:
+            candidates.append({self.by_id[i] for i in ids if i in self.by_id})
+        if assignee is not None:
+            candidates.append(self.by_assignee.get(assignee, set()))
+        if progress is not None:
+            candidates.append(self.by_progress.get(progress, set()))
+        if not candidates:
+            return []
+
+        # 从最小的集合开始求交集
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for rows in candidates[1:]:
+            result &= rows
+            if not result:
+                break
+        return sorted(result)
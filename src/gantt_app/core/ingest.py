@@ -0,0 +1,416 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多数据源并行导入
+
+并发读取多个CSV/Excel导出文件，按 ArtifactID 去重合并为一个甘特图，
+并记录每个任务来自哪些文件。多工作表的Excel文件中各工作表在工作线程或进程中分别解析并转换为任务。
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from gantt_app.core.chart_improved import GanttChart, Task, tasks_from_sheet
+from gantt_app.core.schema import SchemaProfile, default_registry, resolve_profile
+
+
+LATEST = 'latest'
+PRIORITY = 'priority'
+
+
+class Source:
+    """一个待导入的数据源"""
+
+    def __init__(self, path: str, priority: int = 0, sheet_name: Any = 0):
+        """
+        初始化数据源
+
+        参数:
+            path (str): CSV或Excel文件路径
+            priority (int): 优先级，按优先级合并时数值大的获胜
+            sheet_name: Excel工作表名称或索引
+        """
+        self.path = path
+        self.priority = priority
+        self.sheet_name = sheet_name
+
+    def __repr__(self) -> str:
+        return f"Source({self.path}, priority={self.priority})"
+
+
+def load_source(path: str, sheet_name: Any = 0) -> List[Task]:
+    """
+    读取单个数据源的任务，在工作线程或进程中执行
+
+    参数:
+        path (str): 文件路径
+        sheet_name: Excel工作表名称或索引
+
+    返回:
+        List[Task]: 任务列表，source 属性为文件路径
+    """
+    chart = GanttChart()
+    if path.lower().endswith('.csv'):
+        chart.load_from_csv(path)
+    else:
+        chart.load_from_excel(path, sheet_name=sheet_name)
+    return chart.tasks
+
+
+class IngestResult:
+    """导入结果"""
+
+    def __init__(self, chart: GanttChart):
+        self.chart = chart
+        # ArtifactID -> 包含该任务的全部来源，按读取顺序排列
+        self.provenance: Dict[str, List[str]] = {}
+        # ArtifactID -> 被淘汰的来源
+        self.conflicts: Dict[str, List[str]] = {}
+        # 文件路径 -> 错误信息
+        self.errors: Dict[str, str] = {}
+
+    def sources_of(self, artfid: str) -> List[str]:
+        """
+        查询任务的来源
+
+        参数:
+            artfid (str): 任务ID
+
+        返回:
+            List[str]: 包含该任务的文件路径
+        """
+        return self.provenance.get(artfid, [])
+
+
+class IngestPipeline:
+    """并发读取多个数据源并合并"""
+
+    def __init__(self,
+                 sources: Sequence[Union[str, Source]],
+                 policy: Union[str, Callable[[Task, Source, Task, Source], bool]] = LATEST,
+                 max_workers: Optional[int] = None,
+                 use_processes: bool = False):
+        """
+        初始化导入流程
+
+        参数:
+            sources (Sequence[Union[str, Source]]): 文件路径或数据源
+            policy: 冲突处理策略。'latest' 保留修改时间最新的文件中的任务；
+                    'priority' 保留优先级最高的数据源中的任务；
+                    也可以传入函数 f(当前任务, 当前来源, 新任务, 新来源)，返回True表示用新任务替换
+            max_workers (int): 并发数
+            use_processes (bool): 使用进程池而不是线程池，适合大量Excel文件的解析
+        """
+        self.sources = [source if isinstance(source, Source) else Source(source) for source in sources]
+        if not callable(policy) and policy not in (LATEST, PRIORITY):
+            raise ValueError(f"不支持的冲突处理策略: {policy}")
+        self.policy = policy
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+
+    def _executor(self) -> Executor:
+        workers = self.max_workers or min(32, len(self.sources) or 1)
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def _mtimes(self) -> Dict[str, float]:
+        mtimes = {}
+        for source in self.sources:
+            try:
+                mtimes[source.path] = os.path.getmtime(source.path)
+            except OSError:
+                mtimes[source.path] = float('-inf')
+        return mtimes
+
+    def _should_replace(self, current: Task, current_source: Source,
+                        candidate: Task, candidate_source: Source,
+                        mtimes: Dict[str, float]) -> bool:
+        """判断新读到的任务是否替换已合并的任务，条件相同时保留先出现的"""
+        if callable(self.policy):
+            return self.policy(current, current_source, candidate, candidate_source)
+        if self.policy == PRIORITY:
+            return candidate_source.priority > current_source.priority
+        return mtimes[candidate_source.path] > mtimes[current_source.path]
+
+    def _merge(self, loaded: List[Any]) -> IngestResult:
+        """按数据源顺序合并已读取的任务"""
+        result = IngestResult(GanttChart())
+        chart = result.chart
+        mtimes = self._mtimes()
+        winners: Dict[str, Source] = {}
+
+        for source, tasks in zip(self.sources, loaded):
+            if isinstance(tasks, BaseException):
+                result.errors[source.path] = f"{type(tasks).__name__}: {str(tasks)}"
+                print(f"读取数据源失败: {source.path}: {str(tasks)}")
+                continue
+
+            for task in tasks:
+                task.source = source.path
+                seen = result.provenance.setdefault(task.artfId, [])
+                if source.path not in seen:
+                    seen.append(source.path)
+
+                row = chart.index.by_id.get(task.artfId)
+                if row is None:
+                    chart.add_task(task)
+                    winners[task.artfId] = source
+                    continue
+
+                current_source = winners[task.artfId]
+                if self._should_replace(chart.tasks[row], current_source, task, source, mtimes):
+                    result.conflicts.setdefault(task.artfId, []).append(current_source.path)
+                    chart.replace_task(row, task)
+                    winners[task.artfId] = source
+                else:
+                    result.conflicts.setdefault(task.artfId, []).append(source.path)
+        return result
+
+    def run(self) -> IngestResult:
+        """
+        并发读取全部数据源并合并
+
+        返回:
+            IngestResult: 合并后的甘特图、来源记录、冲突与错误
+        """
+        with self._executor() as executor:
+            futures = [executor.submit(load_source, source.path, source.sheet_name)
+                       for source in self.sources]
+            loaded = []
+            for future in futures:
+                try:
+                    loaded.append(future.result())
+                except Exception as e:
+                    loaded.append(e)
+        return self._merge(loaded)
+
+    async def run_async(self) -> IngestResult:
+        """
+        在asyncio事件循环中运行，读取工作交给执行器，不阻塞事件循环
+
+        返回:
+            IngestResult: 合并结果
+        """
+        loop = asyncio.get_running_loop()
+        with self._executor() as executor:
+            loaded = await asyncio.gather(
+                *(loop.run_in_executor(executor, load_source, source.path, source.sheet_name)
+                  for source in self.sources),
+                return_exceptions=True)
+        return self._merge(list(loaded))
+
+
+class WorkbookResult(IngestResult):
+    """多工作表导入结果，provenance 与 errors 以工作表名称为来源"""
+
+    def __init__(self, chart: GanttChart, path: str):
+        super().__init__(chart)
+        self.path = path
+        # 工作表名称 -> 该工作表的任务在甘特图中的行号
+        self.sheets: Dict[str, List[int]] = {}
+        # 没有表头（空白）而被跳过的工作表
+        self.empty: List[str] = []
+
+    def sheet_of(self, row: int) -> Optional[str]:
+        """
+        查询任务所在的工作表
+
+        参数:
+            row (int): 任务行号
+
+        返回:
+            Optional[str]: 工作表名称，行号无效时返回None
+        """
+        for sheet, rows in self.sheets.items():
+            if rows and rows[0] <= row <= rows[-1]:
+                return sheet
+        return None
+
+
+def _parse_sheet(workbook: pd.ExcelFile, name: str,
+                 profile: Union[SchemaProfile, str, None]) -> Tuple[pd.DataFrame, Optional[SchemaProfile]]:
+    """先只读表头确定配置，再读取配置用到的列；空白工作表返回空数据和None"""
+    header = list(workbook.parse(name, nrows=0).columns)
+    if not header:
+        return pd.DataFrame(), None
+    sheet_profile = resolve_profile(profile, header)
+    return workbook.parse(name, **sheet_profile.read_options()), sheet_profile
+
+
+def _sheet_name(names: List[str], sheet: Union[str, int]) -> str:
+    """把工作表索引转换为名称，并检查工作表存在"""
+    if isinstance(sheet, int):
+        return names[sheet]
+    if sheet not in names:
+        raise ValueError(f"工作表不存在: {sheet}")
+    return sheet
+
+
+def read_sheets(path: str,
+                sheets: Optional[Sequence[Union[str, int]]] = None,
+                profile: Union[SchemaProfile, str, None] = None
+                ) -> Tuple[Dict[str, Tuple[pd.DataFrame, Optional[SchemaProfile]]], Dict[str, str]]:
+    """
+    在当前线程中打开一次工作簿，依次读取全部或指定工作表中配置用到的列
+
+    参数:
+        path (str): Excel文件路径
+        sheets (Sequence): 工作表名称或索引，默认全部
+        profile (SchemaProfile | str): 列映射配置，默认按各工作表的表头确定
+
+    返回:
+        Tuple[Dict, Dict[str, str]]: 工作表名称 -> (数据, 配置)，空白工作表的配置为None；
+            以及工作表名称 -> 错误信息
+
+    异常:
+        FileNotFoundError: 如果文件不存在
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"文件不存在: {path}")
+    frames: Dict[str, Tuple[pd.DataFrame, Optional[SchemaProfile]]] = {}
+    errors: Dict[str, str] = {}
+    with pd.ExcelFile(path) as workbook:
+        names = workbook.sheet_names
+        for sheet in (names if sheets is None else sheets):
+            name = str(sheet)
+            try:
+                name = _sheet_name(names, sheet)
+                frames[name] = _parse_sheet(workbook, name, profile)
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {str(e)}"
+    return frames, errors
+
+
+def _convert_sheet(df: pd.DataFrame, profile: SchemaProfile, path: str, sheet: str) -> List[Task]:
+    """在工作线程或进程中把一个工作表转换为任务，缺少ID的任务以工作表名称为前缀生成ID"""
+    return tasks_from_sheet(df, profile, path, id_prefix=f"{sheet}-")
+
+
+def _load_sheet(path: str, sheet: str, profile: Optional[SchemaProfile]) -> Optional[List[Task]]:
+    """在工作线程或进程中打开工作簿，解析并转换一个工作表；空白工作表返回None"""
+    with pd.ExcelFile(path) as workbook:
+        df, sheet_profile = _parse_sheet(workbook, sheet, profile)
+    if sheet_profile is None:
+        return None
+    return _convert_sheet(df, sheet_profile, path, sheet)
+
+
+def _merge_sheets(result: WorkbookResult, converted: Dict[str, Any]) -> WorkbookResult:
+    """按工作表顺序把转换结果（任务、None表示空白或异常）合并到结果中"""
+    chart = result.chart
+    for sheet, tasks in converted.items():
+        if isinstance(tasks, BaseException):
+            result.errors[sheet] = f"{type(tasks).__name__}: {str(tasks)}"
+            print(f"读取工作表失败: {sheet}: {str(tasks)}")
+            continue
+        if tasks is None:
+            result.empty.append(sheet)
+            continue
+        first = len(chart.tasks)
+        for task in tasks:
+            task.source = result.path
+            chart.add_task(task)
+            seen = result.provenance.setdefault(task.artfId, [])
+            if sheet not in seen:
+                seen.append(sheet)
+        result.sheets[sheet] = list(range(first, len(chart.tasks)))
+    return result
+
+
+def _run_sheets(jobs: Dict[str, tuple], func: Callable, max_workers: Optional[int],
+                use_processes: bool) -> Dict[str, Any]:
+    """在线程池或进程池中对每个工作表运行 func(*参数)，异常作为结果返回"""
+    workers = max_workers or min(32, len(jobs))
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        futures = {sheet: executor.submit(func, *args) for sheet, args in jobs.items()}
+        converted: Dict[str, Any] = {}
+        for sheet, future in futures.items():
+            try:
+                converted[sheet] = future.result()
+            except Exception as e:
+                converted[sheet] = e
+    return converted
+
+
+def combine_sheets(path: str,
+                   frames: Dict[str, Tuple[pd.DataFrame, Optional[SchemaProfile]]],
+                   errors: Optional[Dict[str, str]] = None,
+                   max_workers: Optional[int] = None,
+                   use_processes: bool = False) -> WorkbookResult:
+    """
+    并行转换已读取的各工作表，按工作表顺序合并为一个甘特图
+
+    同一ID出现在多个工作表中时全部保留（记录在 chart.index.duplicates 中），
+    provenance 列出包含该ID的工作表。
+
+    参数:
+        path (str): 工作簿路径，作为任务的 source
+        frames (Dict): 工作表名称 -> (数据, 配置)，通常来自 read_sheets；配置为None的空白工作表记入 empty
+        errors (Dict[str, str]): 读取阶段已失败的工作表
+        max_workers (int): 并发数
+        use_processes (bool): 使用进程池而不是线程池
+
+    返回:
+        WorkbookResult: 合并结果，转换失败的工作表记录在 errors 中
+    """
+    result = WorkbookResult(GanttChart(), path)
+    result.errors.update(errors or {})
+    jobs = {sheet: (df, profile, path, sheet) for sheet, (df, profile) in frames.items() if profile is not None}
+    converted = _run_sheets(jobs, _convert_sheet, max_workers, use_processes) if jobs else {}
+    # 保持工作表顺序，空白工作表按None合并
+    return _merge_sheets(result, {sheet: converted.get(sheet) for sheet in frames})
+
+
+def load_workbook(path: str,
+                  sheets: Optional[Sequence[Union[str, int]]] = None,
+                  profile: Union[SchemaProfile, str, None] = None,
+                  max_workers: Optional[int] = None,
+                  use_processes: bool = False) -> WorkbookResult:
+    """
+    从一个工作簿加载全部或指定工作表，合并为一个甘特图
+
+    每个工作表的解析与转换都在工作线程或进程中完成，各自打开工作簿并只解析自己的工作表。
+    Excel解析主要是Python代码，受GIL限制，线程只能重叠文件读取；
+    多个大工作表需要 use_processes=True 才能真正并行。
+
+    参数:
+        path (str): Excel文件路径
+        sheets (Sequence): 工作表名称或索引，默认全部
+        profile (SchemaProfile | str): 列映射配置，默认按各工作表的表头确定
+        max_workers (int): 并发数
+        use_processes (bool): 使用进程池而不是线程池，适合很大的工作表
+
+    返回:
+        WorkbookResult: 合并结果；单个工作表失败时记录在 errors 中，空白工作表记录在 empty 中，
+            其余工作表照常导入
+
+    异常:
+        FileNotFoundError: 如果文件不存在
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"文件不存在: {path}")
+    if isinstance(profile, str):
+        # 子进程中只有默认登记表，按名称查找的配置在这里解析
+        profile = default_registry.get(profile)
+    with pd.ExcelFile(path) as workbook:
+        names = workbook.sheet_names
+
+    result = WorkbookResult(GanttChart(), path)
+    jobs: Dict[str, tuple] = {}
+    for sheet in (names if sheets is None else sheets):
+        try:
+            name = _sheet_name(names, sheet)
+        except Exception as e:
+            result.errors[str(sheet)] = f"{type(e).__name__}: {str(e)}"
+            continue
+        jobs[name] = (path, name, profile)
+    if not jobs:
+        return result
+    return _merge_sheets(result, _run_sheets(jobs, _load_sheet, max_workers, use_processes))
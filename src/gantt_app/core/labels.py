@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+标签布局
+
+通过按字符缓存的文字度量估算标签尺寸，在绘制时一次扫描剔除相互重叠或放不下的标签，
+并把保留下来的标签合并为一个PathCollection绘制，而不是每个标签一个Text对象。
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.collections import PathCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath, text_to_path
+from matplotlib.transforms import Affine2D, IdentityTransform
+
+
+# 每个度量表最多缓存的字形路径数量；标签文字随图表变化，长期运行的进程中不能无限增长
+PATH_CACHE_SIZE = 4096
+
+
+class TextMetrics:
+    """按字符缓存文字宽度，并缓存最近使用的字符串的字形路径"""
+
+    def __init__(self, fontsize: float = 8, prop: Optional[FontProperties] = None):
+        """
+        初始化文字度量表
+
+        参数:
+            fontsize (float): 字号（磅）
+            prop (FontProperties): 字体属性，默认使用rcParams中配置的字体（含中文回退字体）
+        """
+        self.prop = (prop or FontProperties()).copy()
+        self.prop.set_size(fontsize)
+        self.fontsize = fontsize
+        self._char_widths: Dict[str, float] = {}
+        self._paths: 'OrderedDict[str, Path]' = OrderedDict()
+        # 用包含中文与下伸字母的样本确定行高
+        _, height, descent = self._measure('国Hg')
+        self.ascent = height - descent
+        self.descent = descent
+
+    def _measure(self, text: str):
+        return text_to_path.get_text_width_height_descent(text, self.prop, ismath=False)
+
+    def char_width(self, char: str) -> float:
+        """单个字符的宽度（磅），首次使用时测量"""
+        width = self._char_widths.get(char)
+        if width is None:
+            width = self._measure(char)[0]
+            self._char_widths[char] = width
+        return width
+
+    def width(self, text: str) -> float:
+        """
+        字符串宽度（磅），按字符宽度求和，忽略字距调整
+
+        参数:
+            text (str): 文本
+
+        返回:
+            float: 宽度
+        """
+        return sum(self.char_width(char) for char in text)
+
+    def widths(self, texts: Sequence[str]) -> np.ndarray:
+        """批量计算字符串宽度（磅）"""
+        return np.fromiter((self.width(text) for text in texts), dtype=float, count=len(texts))
+
+    @property
+    def height(self) -> float:
+        """行高（磅）"""
+        return self.ascent + self.descent
+
+    def path(self, text: str) -> Path:
+        """字符串的字形路径，单位为磅，原点在基线左端"""
+        path = self._paths.get(text)
+        if path is not None:
+            self._paths.move_to_end(text)
+            return path
+        path = TextPath((0, 0), text, prop=self.prop)
+        self._paths[text] = path
+        if len(self._paths) > PATH_CACHE_SIZE:
+            self._paths.popitem(last=False)
+        return path
+
+
+_METRICS_CACHE: Dict[tuple, TextMetrics] = {}
+
+
+def get_metrics(fontsize: float = 8) -> TextMetrics:
+    """
+    获取共享的文字度量表，同一字号和字体只测量一次
+
+    参数:
+        fontsize (float): 字号（磅）
+
+    返回:
+        TextMetrics: 文字度量表
+    """
+    key = (fontsize, hash(FontProperties()))
+    metrics = _METRICS_CACHE.get(key)
+    if metrics is None:
+        metrics = TextMetrics(fontsize)
+        _METRICS_CACHE[key] = metrics
+    return metrics
+
+
+def resolve_collisions(left: np.ndarray, bottom: np.ndarray,
+                       right: np.ndarray, top: np.ndarray,
+                       band: float, padding: float = 2.0) -> np.ndarray:
+    """
+    一次扫描选出互不重叠的标签框
+
+    按左边界排序后依次处理；纵向按band高度分带，每个带只记录已接受标签的最右边界，
+    标签与其覆盖的所有带都不冲突时才被接受。
+
+    参数:
+        left, bottom, right, top (np.ndarray): 标签框（显示坐标，像素）
+        band (float): 分带高度，通常取行高
+        padding (float): 标签之间的最小水平间距
+
+    返回:
+        np.ndarray: 被接受的标签的布尔掩码
+    """
+    accepted = np.zeros(len(left), dtype=bool)
+    if len(left) == 0:
+        return accepted
+
+    first_band = np.floor(bottom / band).astype(np.int64)
+    last_band = np.floor(np.nextafter(top, -np.inf) / band).astype(np.int64)
+    occupied: Dict[int, float] = {}
+    for i in np.argsort(left, kind='stable').tolist():
+        bands = range(first_band[i], last_band[i] + 1)
+        x = left[i]
+        if all(occupied.get(b, -np.inf) + padding <= x for b in bands):
+            accepted[i] = True
+            for b in bands:
+                occupied[b] = right[i]
+    return accepted
+
+
+class LabelLayer(Artist):
+    """在绘制时完成布局的标签层，所有标签作为一个集合绘制"""
+
+    def __init__(self,
+                 x: np.ndarray,
+                 y: np.ndarray,
+                 texts: Sequence[str],
+                 ha: Sequence[str],
+                 va: Sequence[str],
+                 max_width: Optional[np.ndarray] = None,
+                 fontsize: float = 8,
+                 color: str = 'black'):
+        """
+        初始化标签层
+
+        参数:
+            x (np.ndarray): 锚点x坐标（数据坐标）
+            y (np.ndarray): 锚点y坐标（数据坐标）
+            texts (Sequence[str]): 标签文本
+            ha (Sequence[str]): 水平对齐，'left'、'right' 或 'center'
+            va (Sequence[str]): 垂直对齐，'bottom' 或 'center'
+            max_width (np.ndarray): 每个标签允许的最大宽度（数据坐标x方向），NaN表示不限制
+            fontsize (float): 字号（磅）
+            color (str): 文字颜色
+        """
+        super().__init__()
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.texts = [str(text) for text in texts]
+        self.ha = np.asarray(ha)
+        self.va = np.asarray(va)
+        self.max_width = (np.full(len(self.texts), np.nan) if max_width is None
+                          else np.asarray(max_width, dtype=float))
+        self.color = color
+        self.metrics = get_metrics(fontsize)
+        # 文字宽度只与字号有关，构造时一次算好（单位：磅）
+        self.widths = self.metrics.widths(self.texts)
+        self.visible_count = 0
+        self.set_zorder(3)
+
+    def set_label(self, i: int, x: float, y: float, text: str, max_width: float = np.nan) -> None:
+        """
+        就地修改一个标签，下次绘制时生效
+
+        参数:
+            i (int): 标签下标
+            x (float): 锚点x坐标（数据坐标）
+            y (float): 锚点y坐标（数据坐标）
+            text (str): 标签文本
+            max_width (float): 允许的最大宽度（数据坐标x方向），NaN表示不限制
+        """
+        self.x[i] = x
+        self.y[i] = y
+        self.texts[i] = str(text)
+        self.widths[i] = self.metrics.width(self.texts[i])
+        self.max_width[i] = max_width
+        self.stale = True
+
+    def layout(self, renderer) -> np.ndarray:
+        """
+        计算当前视图下应显示的标签
+
+        参数:
+            renderer: matplotlib渲染器
+
+        返回:
+            np.ndarray: 被接受标签的下标
+        """
+        ax = self.axes
+        if len(self.texts) == 0:
+            return np.array([], dtype=np.int64)
+
+        scale = renderer.points_to_pixels(1.0)
+        anchor = ax.transData.transform(np.column_stack([self.x, self.y]))
+        width = self.widths * scale
+        height = self.metrics.height * scale
+
+        left = anchor[:, 0] - np.where(self.ha == 'right', width, np.where(self.ha == 'center', width / 2, 0))
+        bottom = anchor[:, 1] - np.where(self.va == 'center', height / 2, 0)
+        right = left + width
+        top = bottom + height
+
+        # 先剔除可见区域外以及超出允许宽度的标签
+        box = ax.bbox
+        keep = (left >= box.x0) & (right <= box.x1) & (bottom >= box.y0) & (top <= box.y1)
+        limited = ~np.isnan(self.max_width)
+        if limited.any():
+            zero = ax.transData.transform([[0.0, 0.0]])[0, 0]
+            limit_px = ax.transData.transform(
+                np.column_stack([np.nan_to_num(self.max_width), np.zeros(len(self.x))]))[:, 0] - zero
+            keep &= ~limited | (width <= limit_px)
+
+        candidates = np.flatnonzero(keep)
+        accepted = resolve_collisions(left[candidates], bottom[candidates],
+                                      right[candidates], top[candidates], band=max(height, 1.0))
+        self._boxes = (left, bottom, scale)
+        return candidates[accepted]
+
+    def draw(self, renderer) -> None:
+        if not self.get_visible():
+            return
+        indices = self.layout(renderer)
+        self.visible_count = len(indices)
+        if not len(indices):
+            return
+
+        left, bottom, scale = self._boxes
+        paths = [self.metrics.path(self.texts[i]) for i in indices]
+        # 字形路径的原点在基线，把框的左下角移到基线位置
+        offsets = np.column_stack([left[indices], bottom[indices] + self.metrics.descent * scale])
+        collection = PathCollection(paths, offsets=offsets, offset_transform=IdentityTransform(),
+                                    facecolors=self.color, edgecolors='none')
+        collection.set_transform(Affine2D().scale(scale))
+        collection.set_figure(self.figure)
+        collection.set_clip_box(self.axes.bbox)
+        collection.draw(renderer)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+保留模式的甘特图渲染
+
+订阅 GanttChart 的变化通知，保留全部任务的几何数组与 任务 -> 图元 的映射。
+修改任务时只就地更新对应的多边形和标签；任务条集合只包含当前纵向可见范围内的行，
+绘制开销与可见行数成正比，与任务总数无关。
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+import matplotlib.dates as mdates
+import matplotlib.ticker as mticker
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba, to_rgba_array
+from matplotlib.figure import Figure
+
+from gantt_app.core.columns import task_columns
+from gantt_app.core.time_axis import apply_time_axis
+
+
+PROGRESS_COLOR = '#50C878'
+
+# 任务数不超过该值时每行都显示纵轴标签
+ALL_TICKS_LIMIT = 100
+
+
+def _rect_verts(x0: np.ndarray, x1: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """批量生成高0.8的矩形顶点，形状为 (行数, 4, 2)"""
+    y0, y1 = y - 0.4, y + 0.4
+    return np.stack([np.column_stack([x0, y0]), np.column_stack([x0, y1]),
+                     np.column_stack([x1, y1]), np.column_stack([x1, y0])], axis=1)
+
+
+class RetainedGanttRenderer:
+    """增量更新的甘特图渲染器"""
+
+    def __init__(self, chart, ax=None, figsize: tuple = (12, 8)):
+        """
+        初始化渲染器并订阅甘特图的变化
+
+        参数:
+            chart (GanttChart): 甘特图对象
+            ax: matplotlib坐标轴，默认新建一个使用Agg画布的Figure
+            figsize (tuple): 新建Figure时的尺寸
+        """
+        if ax is None:
+            figure = Figure(figsize=figsize)
+            FigureCanvasAgg(figure)
+            ax = figure.add_subplot()
+        self.chart = chart
+        self.ax = ax
+        self.figure = ax.figure
+
+        ax.set_title(chart.title, pad=24)
+        ax.set_xlabel('日期')
+        ax.set_ylabel('任务')
+        ax.grid(True, alpha=0.3)
+        self.bars = PolyCollection([], edgecolors='black', alpha=0.8, zorder=2)
+        self.progress = PolyCollection([], facecolors=PROGRESS_COLOR, edgecolors='none',
+                                       alpha=0.6, zorder=2.1)
+        ax.add_collection(self.bars)
+        ax.add_collection(self.progress)
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(self._tick_label))
+        self.labels = None
+        self.time_axis = None
+
+        # 全部任务的几何数据，集合中只放入可见范围 [_lo, _hi) 的行
+        self._bar_verts = np.empty((0, 4, 2))
+        self._progress_verts = np.empty((0, 4, 2))
+        self._colors = np.empty((0, 4))
+        self._lo = self._hi = 0
+        self._rows: Dict[int, int] = {}
+        self._pending: Set[int] = set()
+        self._structural = True
+        # update 期间可见范围内的几何或颜色是否有变化
+        self._dirty = self._recolor = False
+        self._date_range: Optional[Tuple] = None
+        self.updated_rows = 0
+
+        chart.subscribe(self._on_change)
+        self.update()
+        ax.callbacks.connect('ylim_changed', lambda _ax: self._apply_view())
+
+    def close(self) -> None:
+        """取消订阅"""
+        self.chart.unsubscribe(self._on_change)
+
+    def _on_change(self, event: str, rows: List[int]) -> None:
+        """变化通知只做记录，几何在 update 时统一更新"""
+        if event == 'modified':
+            self._pending.update(rows)
+        else:
+            self._structural = True
+
+    # 映射
+
+    def row_of(self, task) -> Optional[int]:
+        """任务所在的行号"""
+        return self._rows.get(id(task))
+
+    def artists_for(self, task) -> Optional[Tuple[int, int]]:
+        """
+        任务对应的图元
+
+        返回:
+            Optional[Tuple[int, int]]: 任务在 bars/progress 集合中的下标，以及在标签层中描述标签的下标；
+                                       任务不在可见范围内或不存在时返回None
+        """
+        row = self.row_of(task)
+        if row is None or not self._lo <= row < self._hi:
+            return None
+        return row - self._lo, row
+
+    # 几何
+
+    def _y(self, rows: np.ndarray) -> np.ndarray:
+        """行号转换为纵坐标，第一行在最上方"""
+        return len(self.chart.tasks) - np.asarray(rows, dtype=float)
+
+    def _row_geometry(self, row: int) -> Tuple[np.ndarray, np.ndarray, float, float, float]:
+        task = self.chart.tasks[row]
+        start = mdates.date2num(task.start_date)
+        duration = float(task.duration())
+        y = self._y([row])
+        bar = _rect_verts(np.array([start]), np.array([start + duration]), y)[0]
+        done = _rect_verts(np.array([start]), np.array([start + duration * max(task.progress, 0) / 100]), y)[0]
+        return bar, done, start, duration, float(y[0])
+
+    def _rebuild(self) -> None:
+        """任务增删后重建全部几何数组与标签"""
+        tasks = self.chart.tasks
+        count = len(tasks)
+        self._rows = {id(task): row for row, task in enumerate(tasks)}
+        if count:
+            columns = task_columns(tasks)
+            start = mdates.date2num(columns['Start'])
+            duration = columns['Duration'].astype(float)
+            progress = np.clip(columns['Progress'].astype(float), 0, None)
+            y = self._y(np.arange(count))
+            self._bar_verts = _rect_verts(start, start + duration, y)
+            self._progress_verts = _rect_verts(start, start + duration * progress / 100, y)
+            self._colors = to_rgba_array([task.color for task in tasks])
+        else:
+            self._bar_verts = self._progress_verts = np.empty((0, 4, 2))
+            self._colors = np.empty((0, 4))
+
+        if self.labels is not None:
+            self.labels.remove()
+        self.labels = self.chart._task_labels(self._y(np.arange(count))) if count else None
+        if self.labels is not None:
+            self.ax.add_artist(self.labels)
+
+        if count <= ALL_TICKS_LIMIT:
+            self.ax.yaxis.set_major_locator(mticker.FixedLocator(np.arange(1, count + 1)))
+        else:
+            self.ax.yaxis.set_major_locator(mticker.MaxNLocator(nbins='auto', integer=True))
+        self.ax.set_ylim(0.5, count + 0.5)
+        self._lo = self._hi = 0
+        self._apply_view(force=True)
+
+    def _apply_view(self, force: bool = False) -> None:
+        """按纵轴可见范围选取放入集合的行"""
+        count = len(self._bar_verts)
+        y_min, y_max = sorted(self.ax.get_ylim())
+        lo = int(np.clip(np.floor(count - y_max), 0, count))
+        hi = int(np.clip(np.ceil(count - y_min) + 1, 0, count))
+        if not force and (lo, hi) == (self._lo, self._hi):
+            return
+        self._lo, self._hi = lo, hi
+        self.bars.set_verts(self._bar_verts[lo:hi])
+        self.bars.set_facecolor(self._colors[lo:hi])
+        self.progress.set_verts(self._progress_verts[lo:hi])
+
+    def _update_row(self, row: int) -> None:
+        """更新一行的几何数组、颜色与标签，可见的行在 update 中统一写入集合"""
+        bar, done, start, duration, y = self._row_geometry(row)
+        self._bar_verts[row] = bar
+        self._progress_verts[row] = done
+        task = self.chart.tasks[row]
+        color = to_rgba(task.color)
+        color_changed = tuple(self._colors[row]) != color
+        self._colors[row] = color
+
+        if self._lo <= row < self._hi:
+            self._dirty = True
+            if color_changed:
+                self._recolor = True
+
+        if self.labels is not None:
+            count = len(self.chart.tasks)
+            self.labels.set_label(row, start + 0.5, y, task.description, duration - 0.5)
+            self.labels.set_label(count + row, start, y + 0.2, pd.Timestamp(task.start_date).strftime('%Y-%m-%d'))
+            self.labels.set_label(2 * count + row, start + duration, y + 0.2,
+                                  pd.Timestamp(task.end_date).strftime('%Y-%m-%d'))
+
+    def _tick_label(self, y: float, pos=None) -> str:
+        row = len(self.chart.tasks) - int(round(y))
+        if not 0 <= row < len(self.chart.tasks):
+            return ''
+        task = self.chart.tasks[row]
+        return f"{task.assignTo}-{task.artfId}"
+
+    # 更新
+
+    def update(self) -> int:
+        """
+        把累积的变化应用到图元
+
+        返回:
+            int: 更新的行数（重建时为全部行数）
+        """
+        if self._structural:
+            self._structural = False
+            self._pending.clear()
+            self._rebuild()
+            updated = len(self.chart.tasks)
+        else:
+            rows = [row for row in self._pending if row < len(self.chart.tasks)]
+            self._pending.clear()
+            self._dirty = self._recolor = False
+            for row in rows:
+                self._update_row(row)
+            # 可见范围内有行变化时，用几何数组的可见切片重新设置集合，开销与可见行数成正比
+            if self._dirty:
+                self.bars.set_verts(self._bar_verts[self._lo:self._hi])
+                self.progress.set_verts(self._progress_verts[self._lo:self._hi])
+            if self._recolor:
+                self.bars.set_facecolor(self._colors[self._lo:self._hi])
+            updated = len(rows)
+
+        # 日期范围由甘特图索引增量维护，只在变化时调整x轴
+        date_range = self.chart.date_range()
+        if date_range is not None and date_range != self._date_range:
+            self._date_range = date_range
+            self.ax.set_xlim(*date_range)
+            if self.time_axis is None:
+                self.time_axis = apply_time_axis(self.ax)
+        self.updated_rows = updated
+        return updated
+
+    def draw(self) -> None:
+        """应用变化并重绘画布"""
+        self.update()
+        self.figure.canvas.draw()
+
+    def draw_idle(self) -> None:
+        """应用变化并请求在空闲时重绘（交互式画布）"""
+        self.update()
+        self.figure.canvas.draw_idle()
+
+    def save(self, filepath: str, dpi: int = 100) -> None:
+        """
+        应用变化并保存图片
+
+        参数:
+            filepath (str): 保存路径
+            dpi (int): 分辨率
+        """
+        self.update()
+        self.figure.savefig(filepath, dpi=dpi)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多项目组合
+
+多个甘特图共享一个字符串池：负责人、颜色、来源等字符串以及相同的日期对象在所有项目间只保留一份，
+并编码为整数列。跨项目查询（某人的全部任务、整个组合的资源负荷）直接在共享的列式数据上完成，
+不复制任务；分析任务可以按项目分片交给多个进程。
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gantt_app.core.columns import datetime_column
+from gantt_app.core.index import split_assignees
+
+
+_DAY = np.timedelta64(1, 'D')
+
+
+class StringPool:
+    """字符串池：相等的值只保留一个实例，字符串另外分配整数编码"""
+
+    def __init__(self):
+        """初始化空的字符串池"""
+        self._codes: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self._values: Dict[Hashable, Hashable] = {}
+
+    def __len__(self) -> int:
+        """已编码的字符串数量"""
+        return len(self._strings)
+
+    def code(self, value: str) -> int:
+        """
+        字符串的整数编码，首次出现时分配
+
+        参数:
+            value (str): 字符串
+
+        返回:
+            int: 编码
+        """
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._codes[value] = code
+            self._strings.append(value)
+        return code
+
+    def find(self, value: str) -> Optional[int]:
+        """查找字符串编码，不存在时返回None"""
+        return self._codes.get(value)
+
+    def string(self, code: int) -> str:
+        """编码对应的字符串"""
+        return self._strings[code]
+
+    def intern(self, value: Hashable) -> Hashable:
+        """
+        返回与 value 相等的共享实例，用于字符串和日期等不可变值
+
+        参数:
+            value (Hashable): 值
+
+        返回:
+            Hashable: 池中的实例
+        """
+        if isinstance(value, str):
+            return self._strings[self.code(value)]
+        return self._values.setdefault(value, value)
+
+
+class _ProjectColumns:
+    """单个项目的列式数据，编码使用组合共享的字符串池"""
+
+    def __init__(self, chart, pool: StringPool):
+        tasks = chart.tasks
+        self.start = datetime_column([task.start_date for task in tasks]).astype('datetime64[s]')
+        self.end = datetime_column([task.end_date for task in tasks]).astype('datetime64[s]')
+        self.progress = np.fromiter((task.progress for task in tasks), dtype=np.float32, count=len(tasks))
+        rows, people = [], []
+        for row, task in enumerate(tasks):
+            for name in split_assignees(task.assignTo):
+                rows.append(row)
+                people.append(pool.code(name))
+        # 一个任务可以有多个负责人，按 (任务, 负责人) 展开
+        self.assignment_row = np.array(rows, dtype=np.int32)
+        self.assignment_person = np.array(people, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+
+def _load_grid(start: np.ndarray, end: np.ndarray, people: np.ndarray,
+               first_day: np.datetime64, days: int, person_count: int) -> np.ndarray:
+    """
+    统计每人每天进行中的任务数
+
+    任务在 [开始日, max(结束日, 开始日+1)) 内计为进行中，与 Task.duration 的规则一致。
+
+    返回:
+        np.ndarray: 天数 × 人数 的矩阵
+    """
+    s = ((start.astype('datetime64[D]') - first_day) // _DAY).astype(np.int64)
+    e = ((end.astype('datetime64[D]') - first_day) // _DAY).astype(np.int64)
+    e = np.maximum(e, s + 1)
+    s, e = np.clip(s, 0, days), np.clip(e, 0, days)
+    keep = e > s
+    change = np.zeros((days + 1) * person_count, dtype=np.int64)
+    np.add.at(change, s[keep] * person_count + people[keep], 1)
+    np.add.at(change, e[keep] * person_count + people[keep], -1)
+    return np.cumsum(change.reshape(days + 1, person_count), axis=0)[:days]
+
+
+def _shard_load(shard: List[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                first_day: np.datetime64, days: int, person_count: int) -> np.ndarray:
+    """在子进程中计算一个分片（若干项目）的资源负荷"""
+    total = np.zeros((days, person_count), dtype=np.int64)
+    for start, end, people in shard:
+        total += _load_grid(start, end, people, first_day, days, person_count)
+    return total
+
+
+class Portfolio:
+    """多个项目甘特图的集合"""
+
+    def __init__(self, pool: Optional[StringPool] = None):
+        """
+        初始化项目组合
+
+        参数:
+            pool (StringPool): 共享的字符串池，默认新建
+        """
+        self.pool = pool or StringPool()
+        self.projects: Dict[str, Any] = {}
+        self._columns: Dict[str, _ProjectColumns] = {}
+        # 项目名称 -> 订阅该甘特图变化通知的回调
+        self._listeners: Dict[str, Callable[[str, List[int]], None]] = {}
+
+    def __len__(self) -> int:
+        """项目数量"""
+        return len(self.projects)
+
+    def add_project(self, name: str, chart) -> None:
+        """
+        加入一个项目，任务的字符串与日期字段替换为字符串池中的共享实例
+
+        订阅甘特图的变化通知，任务增删改后自动丢弃该项目的列式数据缓存。
+
+        参数:
+            name (str): 项目名称
+            chart (GanttChart): 甘特图
+
+        异常:
+            ValueError: 如果项目名称已存在
+        """
+        if name in self.projects:
+            raise ValueError(f"项目已存在: {name}")
+        intern = self.pool.intern
+        for task in chart.tasks:
+            task.assignTo = intern(task.assignTo)
+            task.color = intern(task.color)
+            task.start_date = intern(task.start_date)
+            task.end_date = intern(task.end_date)
+            if task.source is not None:
+                task.source = intern(task.source)
+        self.projects[name] = chart
+        listener = self._listeners[name] = lambda event, rows: self._columns.pop(name, None)
+        chart.subscribe(listener)
+
+    def remove_project(self, name: str) -> None:
+        """移除项目并取消订阅其变化通知"""
+        chart = self.projects.pop(name)
+        chart.unsubscribe(self._listeners.pop(name))
+        self._columns.pop(name, None)
+
+    def refresh(self, name: Optional[str] = None) -> None:
+        """
+        丢弃列式数据缓存
+
+        通过甘特图方法所做的修改会自动使缓存失效，只有直接修改 chart.tasks 或任务对象后需要调用。
+
+        参数:
+            name (str): 项目名称，默认全部项目
+        """
+        if name is None:
+            self._columns.clear()
+        else:
+            self._columns.pop(name, None)
+
+    def columns(self, name: str) -> _ProjectColumns:
+        """项目的列式数据，按需构建并缓存"""
+        columns = self._columns.get(name)
+        if columns is None:
+            columns = _ProjectColumns(self.projects[name], self.pool)
+            self._columns[name] = columns
+        return columns
+
+    # 跨项目查询
+
+    def tasks_for(self, person: str) -> List[Tuple[str, Any]]:
+        """
+        某人在全部项目中的任务
+
+        参数:
+            person (str): 负责人
+
+        返回:
+            List[Tuple[str, Task]]: (项目名称, 任务) 列表，任务为项目中的原对象
+        """
+        # 先构建缓存，新加入的负责人在构建时才进入字符串池
+        blocks = [(name, chart, self.columns(name)) for name, chart in self.projects.items()]
+        code = self.pool.find(person)
+        if code is None:
+            return []
+        result = []
+        for name, chart, columns in blocks:
+            rows = np.unique(columns.assignment_row[columns.assignment_person == code])
+            result.extend((name, chart.tasks[row]) for row in rows.tolist())
+        return result
+
+    def people(self) -> List[str]:
+        """全部项目中出现过的负责人"""
+        codes = set()
+        for name in self.projects:
+            codes.update(np.unique(self.columns(name).assignment_person).tolist())
+        return sorted(self.pool.string(code) for code in codes)
+
+    def date_range(self) -> Optional[Tuple[np.datetime64, np.datetime64]]:
+        """全部项目的最早开始与最晚结束时间，没有任务时返回None"""
+        blocks = [self.columns(name) for name in self.projects]
+        blocks = [block for block in blocks if len(block)]
+        if not blocks:
+            return None
+        return min(block.start.min() for block in blocks), max(block.end.max() for block in blocks)
+
+    def resource_load(self,
+                      start: Optional[Any] = None,
+                      end: Optional[Any] = None,
+                      people: Optional[List[str]] = None,
+                      workers: int = 1) -> pd.DataFrame:
+        """
+        整个组合的资源负荷：每人每天进行中的任务数
+
+        参数:
+            start: 统计开始日期，默认最早的任务开始日期
+            end: 统计结束日期（不含），默认最晚的任务结束日期
+            people (List[str]): 只统计这些人，默认全部
+            workers (int): 进程数，大于1时按项目分片并行计算
+
+        返回:
+            pd.DataFrame: 以日期为索引、负责人为列的任务数
+        """
+        span = self.date_range()
+        if span is None:
+            return pd.DataFrame()
+        first_day = np.datetime64(start if start is not None else span[0], 'D')
+        if end is not None:
+            last_day = np.datetime64(end, 'D')
+        else:
+            # 最晚结束时间向上取整到天
+            last_day = np.datetime64(span[1], 'D')
+            if last_day < span[1]:
+                last_day += np.timedelta64(1, 'D')
+        days = max(int((last_day - first_day) // _DAY), 0)
+        person_count = len(self.pool)
+
+        blocks = []
+        for name in self.projects:
+            columns = self.columns(name)
+            rows = columns.assignment_row
+            blocks.append((columns.start[rows], columns.end[rows], columns.assignment_person))
+
+        if workers > 1 and len(blocks) > 1:
+            shards = self._shards(workers, [len(block[0]) for block in blocks])
+            with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+                futures = [pool.submit(_shard_load, [blocks[i] for i in shard],
+                                       first_day, days, person_count) for shard in shards]
+                grid = sum(future.result() for future in futures)
+        else:
+            grid = _shard_load(blocks, first_day, days, person_count)
+
+        names = people if people is not None else self.people()
+        codes = [self.pool.find(name) for name in names]
+        data = {name: (grid[:, code] if code is not None else np.zeros(days, dtype=np.int64))
+                for name, code in zip(names, codes)}
+        index = pd.date_range(pd.Timestamp(first_day), periods=days, freq='D')
+        return pd.DataFrame(data, index=index)
+
+    @staticmethod
+    def _shards(workers: int, sizes: List[int]) -> List[List[int]]:
+        """按任务数把项目均衡分配到若干分片（先分配大项目）"""
+        shards: List[List[int]] = [[] for _ in range(min(workers, len(sizes)))]
+        loads = [0] * len(shards)
+        for i in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+            target = loads.index(min(loads))
+            shards[target].append(i)
+            loads[target] += sizes[i]
+        return [sorted(shard) for shard in shards if shard]
+
+    def map_projects(self, func: Callable[[Any], Any], workers: int = 1) -> Dict[str, Any]:
+        """
+        对每个项目运行分析函数
+
+        参数:
+            func (Callable): 接收 GanttChart 的函数，多进程时必须是可被pickle的模块级函数
+            workers (int): 进程数，大于1时每个项目在子进程中计算
+
+        返回:
+            Dict[str, Any]: 项目名称 -> 函数结果
+        """
+        names = list(self.projects)
+        if workers > 1 and len(names) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(names))) as pool:
+                results = list(pool.map(func, [self.projects[name] for name in names]))
+        else:
+            results = [func(self.projects[name]) for name in names]
+        return dict(zip(names, results))
+
+    def summary(self) -> pd.DataFrame:
+        """
+        各项目概况
+
+        返回:
+            pd.DataFrame: 以项目名称为索引，包含 Tasks、Start、End、Progress（平均进度）列
+        """
+        rows = []
+        for name in self.projects:
+            columns = self.columns(name)
+            empty = not len(columns)
+            rows.append({
+                'Project': name,
+                'Tasks': len(columns),
+                'Start': None if empty else columns.start.min(),
+                'End': None if empty else columns.end.max(),
+                'Progress': float('nan') if empty else float(columns.progress.mean()),
+            })
+        return pd.DataFrame(rows, columns=['Project', 'Tasks', 'Start', 'End', 'Progress']).set_index('Project')
@@ -0,0 +1,399 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进度历史与挣值分析
+
+每次记录快照时只保存发生变化的任务及其进度增量（增量编码），
+在此基础上向量化计算计划值(PV)、挣值(EV)、实际成本(AC)、SPI/CPI
+以及按负责人或整个项目汇总的燃尽/燃起曲线。
+"""
+
+import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+
+from gantt_app.core.columns import datetime_column, durations
+
+
+PROJECT = 'project'
+ASSIGNEE = 'assignee'
+
+_DAY = np.timedelta64(1, 'D')
+_EPOCH = np.datetime64('1970-01-01T00:00:00', 's')
+
+
+def _to_days(values) -> np.ndarray:
+    """日期转换为自1970-01-01起的天数（浮点）"""
+    return (np.asarray(values, dtype='datetime64[s]') - _EPOCH) / _DAY
+
+
+class EarnedValueCurves:
+    """按快照日期与分组排列的挣值曲线，数组形状均为 (快照数, 分组数)"""
+
+    def __init__(self, dates: np.ndarray, groups: List[str],
+                 pv: np.ndarray, ev: np.ndarray, ac: np.ndarray, scope: np.ndarray):
+        """
+        初始化挣值曲线
+
+        参数:
+            dates (np.ndarray): 快照日期
+            groups (List[str]): 分组名称
+            pv (np.ndarray): 计划值
+            ev (np.ndarray): 挣值
+            ac (np.ndarray): 实际成本
+            scope (np.ndarray): 截至各快照已知任务的总预算
+        """
+        self.dates = dates
+        self.groups = groups
+        self.pv = pv
+        self.ev = ev
+        self.ac = ac
+        self.scope = scope
+
+    @staticmethod
+    def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        out = np.full(numerator.shape, np.nan)
+        np.divide(numerator, denominator, out=out, where=denominator > 0)
+        return out
+
+    @property
+    def spi(self) -> np.ndarray:
+        """进度绩效指数 EV/PV，PV为0时为NaN"""
+        return self._ratio(self.ev, self.pv)
+
+    @property
+    def cpi(self) -> np.ndarray:
+        """成本绩效指数 EV/AC，没有记录实际成本时为NaN"""
+        return self._ratio(self.ev, self.ac)
+
+    @property
+    def remaining(self) -> np.ndarray:
+        """燃尽曲线：剩余工作量"""
+        return self.scope - self.ev
+
+    def group(self, name: str) -> Dict[str, np.ndarray]:
+        """
+        取出单个分组的曲线
+
+        参数:
+            name (str): 分组名称
+
+        返回:
+            Dict[str, np.ndarray]: pv、ev、ac、scope、remaining、spi、cpi
+        """
+        col = self.groups.index(name)
+        return {'pv': self.pv[:, col], 'ev': self.ev[:, col], 'ac': self.ac[:, col],
+                'scope': self.scope[:, col], 'remaining': self.remaining[:, col],
+                'spi': self.spi[:, col], 'cpi': self.cpi[:, col]}
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        转换为长表，每个快照日期与分组一行
+
+        返回:
+            pd.DataFrame: 包含 Date、Group、PV、EV、AC、Scope、Remaining、SPI、CPI 列
+        """
+        rows, cols = self.pv.shape
+        return pd.DataFrame({
+            'Date': np.repeat(self.dates, cols),
+            'Group': np.tile(np.asarray(self.groups, dtype=object), rows),
+            'PV': self.pv.ravel(), 'EV': self.ev.ravel(), 'AC': self.ac.ravel(),
+            'Scope': self.scope.ravel(), 'Remaining': self.remaining.ravel(),
+            'SPI': self.spi.ravel(), 'CPI': self.cpi.ravel(),
+        })
+
+
+class ProgressHistory:
+    """增量编码的任务进度时间序列"""
+
+    def __init__(self):
+        """初始化空的进度历史"""
+        self._ids: Dict[str, int] = {}
+        self._assignees: Dict[str, int] = {}
+        # 每个任务的最新计划：开始/结束（天）、预算、负责人编码、首次出现的快照
+        self._start = np.empty(0)
+        self._end = np.empty(0)
+        self._budget = np.empty(0)
+        self._assignee = np.empty(0, dtype=np.int32)
+        self._first_seen = np.empty(0, dtype=np.int32)
+        # 最新状态，用于计算下一次快照的增量
+        self._progress = np.empty(0)
+        self._cost = np.empty(0)
+        # 每个快照的日期与增量（任务下标、进度增量、成本增量）
+        self._dates: List[float] = []
+        self._chunks: List[tuple] = []
+        self._merged: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        """快照数量"""
+        return len(self._dates)
+
+    @property
+    def task_count(self) -> int:
+        """出现过的任务数量"""
+        return len(self._ids)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """快照日期"""
+        return _EPOCH + np.round(np.asarray(self._dates) * 86400).astype('timedelta64[s]')
+
+    def _grow(self, count: int) -> None:
+        for name, fill in (('_start', 0.0), ('_end', 0.0), ('_budget', 0.0), ('_assignee', 0),
+                           ('_first_seen', len(self._dates)), ('_progress', 0.0), ('_cost', 0.0)):
+            old = getattr(self, name)
+            setattr(self, name, np.concatenate([old, np.full(count, fill, dtype=old.dtype)]))
+
+    def record(self,
+               tasks: Iterable,
+               date: Optional[Union[datetime.date, datetime.datetime]] = None,
+               actual_costs: Optional[Mapping[str, float]] = None,
+               budgets: Optional[Mapping[str, float]] = None) -> int:
+        """
+        记录一次进度快照，只保存与上次相比发生变化的任务
+
+        参数:
+            tasks (Iterable[Task]): 任务集合，通常为 chart.tasks
+            date: 快照日期，默认当前时间；不能早于上一次快照
+            actual_costs (Mapping[str, float]): ArtifactID -> 截至该日期的累计实际成本
+            budgets (Mapping[str, float]): ArtifactID -> 预算，默认使用计划工期（天）
+
+        返回:
+            int: 本次保存的增量条数
+
+        异常:
+            ValueError: 如果快照日期早于上一次快照
+        """
+        day = float(_to_days(date if date is not None else datetime.datetime.now()))
+        if self._dates and day < self._dates[-1]:
+            raise ValueError("快照日期不能早于上一次快照")
+
+        tasks = list(tasks)
+        rows = np.empty(len(tasks), dtype=np.int64)
+        new_ids = 0
+        for i, task in enumerate(tasks):
+            row = self._ids.get(task.artfId)
+            if row is None:
+                row = len(self._ids)
+                self._ids[task.artfId] = row
+                new_ids += 1
+            rows[i] = row
+        if new_ids:
+            self._grow(new_ids)
+
+        assignees = self._assignees
+        self._assignee[rows] = [assignees.setdefault(task.assignTo, len(assignees)) for task in tasks]
+        start = datetime_column([task.start_date for task in tasks])
+        end = datetime_column([task.end_date for task in tasks])
+        self._start[rows] = _to_days(start)
+        self._end[rows] = _to_days(end)
+        budget = durations(start, end).astype(float)
+        if budgets:
+            budget = np.array([budgets.get(task.artfId, planned) for task, planned in zip(tasks, budget)],
+                              dtype=float)
+        self._budget[rows] = budget
+
+        progress = np.fromiter((task.progress for task in tasks), dtype=float, count=len(tasks))
+        progress_delta = progress - self._progress[rows]
+        cost_delta = np.zeros(len(tasks))
+        if actual_costs:
+            cost = np.array([actual_costs.get(task.artfId, np.nan) for task in tasks], dtype=float)
+            known = ~np.isnan(cost)
+            cost_delta[known] = cost[known] - self._cost[rows[known]]
+
+        changed = (progress_delta != 0) | (cost_delta != 0)
+        rows, progress_delta, cost_delta = rows[changed], progress_delta[changed], cost_delta[changed]
+        self._progress[rows] += progress_delta
+        self._cost[rows] += cost_delta
+
+        self._dates.append(day)
+        self._chunks.append((rows.astype(np.int32), progress_delta, cost_delta))
+        self._merged = None
+        return len(rows)
+
+    def _deltas(self) -> tuple:
+        """拼接全部增量：(快照下标, 任务下标, 进度增量, 成本增量)"""
+        if self._merged is None:
+            sizes = [len(chunk[0]) for chunk in self._chunks]
+            snapshot = np.repeat(np.arange(len(sizes), dtype=np.int64), sizes)
+            if self._chunks:
+                rows, progress, cost = (np.concatenate(part) for part in zip(*self._chunks))
+            else:
+                rows, progress, cost = np.empty(0, dtype=np.int32), np.empty(0), np.empty(0)
+            self._merged = (snapshot, rows, progress, cost)
+        return self._merged
+
+    def task_series(self, artfid: str) -> pd.Series:
+        """
+        单个任务的进度变化序列
+
+        参数:
+            artfid (str): 任务ID
+
+        返回:
+            pd.Series: 以快照日期为索引的进度，只包含发生变化的快照
+        """
+        row = self._ids.get(artfid)
+        if row is None:
+            return pd.Series(dtype=float)
+        snapshot, rows, progress, _ = self._deltas()
+        mask = rows == row
+        return pd.Series(np.cumsum(progress[mask], dtype=float), index=self.dates[snapshot[mask]])
+
+    def _groups(self, by: Union[str, Mapping[str, str]]) -> tuple:
+        """返回 (每个任务的分组编码, 分组名称)"""
+        if by == PROJECT:
+            return np.zeros(len(self._ids), dtype=np.int64), [PROJECT]
+        if by == ASSIGNEE:
+            return self._assignee.astype(np.int64), list(self._assignees)
+        if isinstance(by, Mapping):
+            labels = [by.get(artfid, '') for artfid in self._ids]
+            codes, names = pd.factorize(pd.Series(labels, dtype=object))
+            return codes.astype(np.int64), [str(name) for name in names]
+        raise ValueError(f"不支持的分组方式: {by}")
+
+    def _planned_value(self, codes: np.ndarray, group_count: int, days: np.ndarray) -> np.ndarray:
+        """
+        计划值：每个任务的预算在计划工期内线性累积
+
+        PV(d) = Σ_{s<d} r·(d - s) - Σ_{e<d} r·(d - e)，r 为每天的预算。
+        按 (分组, 日期) 排序后用前缀和与二分查找一次算出所有分组、所有日期。
+        """
+        length = np.maximum(self._end - self._start, 1.0)
+        end = self._start + length
+        rate = self._budget / length
+        pv = np.zeros((len(days), group_count))
+        if not len(rate):
+            return pv
+        # 分组编码放大后与天数相加得到可排序的复合键
+        span = max(end.max(), days.max()) - min(self._start.min(), days.min()) + 2.0
+        base = min(self._start.min(), days.min()) - 1.0
+        group_offset = np.arange(group_count) * span
+        query = (days[:, None] - base) + group_offset[None, :]
+        for edge, sign in ((self._start, 1.0), (end, -1.0)):
+            keys = codes * span + (edge - base)
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+            rate_sum = np.concatenate([[0.0], np.cumsum(rate[order])])
+            rate_edge_sum = np.concatenate([[0.0], np.cumsum(rate[order] * edge[order])])
+            first = np.searchsorted(keys, group_offset)
+            last = np.searchsorted(keys, query)
+            r = rate_sum[last] - rate_sum[first][None, :]
+            rs = rate_edge_sum[last] - rate_edge_sum[first][None, :]
+            pv += sign * (days[:, None] * r - rs)
+        return pv
+
+    def curves(self,
+               by: Union[str, Mapping[str, str]] = PROJECT,
+               start: Optional[datetime.date] = None,
+               end: Optional[datetime.date] = None) -> EarnedValueCurves:
+        """
+        计算挣值与燃尽/燃起曲线
+
+        参数:
+            by: 'project' 汇总整个项目，'assignee' 按负责人，或 ArtifactID -> 分组名 的映射
+            start (datetime.date): 只返回该日期及之后的快照
+            end (datetime.date): 只返回该日期及之前的快照
+
+        返回:
+            EarnedValueCurves: 各快照日期、各分组的 PV、EV、AC 与总预算
+        """
+        codes, groups = self._groups(by)
+        group_count = len(groups)
+        snapshot_count = len(self._dates)
+        snapshot, rows, progress, cost = self._deltas()
+        size = snapshot_count * group_count
+
+        # 增量按 (快照, 分组) 累加后沿快照方向求前缀和
+        keys = snapshot * group_count + codes[rows]
+        ev = np.bincount(keys, weights=self._budget[rows] * progress / 100.0, minlength=size)
+        ac = np.bincount(keys, weights=cost, minlength=size)
+        scope = np.bincount(self._first_seen.astype(np.int64) * group_count + codes,
+                            weights=self._budget, minlength=size)
+        ev, ac, scope = (np.cumsum(values.reshape(snapshot_count, group_count), axis=0)
+                         for values in (ev, ac, scope))
+
+        days = np.asarray(self._dates, dtype=float)
+        selected = np.ones(snapshot_count, dtype=bool)
+        if start is not None:
+            selected &= days >= _to_days(start)
+        if end is not None:
+            selected &= days <= _to_days(end)
+        days = days[selected]
+        pv = self._planned_value(codes, group_count, days)
+        return EarnedValueCurves(self.dates[selected], groups, pv,
+                                 ev[selected], ac[selected], scope[selected])
+
+    def save(self, filepath: str) -> None:
+        """
+        保存为压缩的npz文件
+
+        参数:
+            filepath (str): 文件路径
+        """
+        snapshot, rows, progress, cost = self._deltas()
+        np.savez_compressed(
+            filepath,
+            ids=np.array(list(self._ids), dtype=str),
+            assignees=np.array(list(self._assignees), dtype=str),
+            start=self._start, end=self._end, budget=self._budget,
+            assignee=self._assignee, first_seen=self._first_seen,
+            dates=np.asarray(self._dates, dtype=float),
+            snapshot=snapshot, rows=rows, progress=progress, cost=cost)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'ProgressHistory':
+        """
+        从npz文件加载进度历史
+
+        参数:
+            filepath (str): 文件路径
+
+        返回:
+            ProgressHistory: 进度历史
+        """
+        history = cls()
+        with np.load(filepath) as data:
+            history._ids = {artfid: i for i, artfid in enumerate(data['ids'].tolist())}
+            history._assignees = {name: i for i, name in enumerate(data['assignees'].tolist())}
+            history._start, history._end, history._budget = data['start'], data['end'], data['budget']
+            history._assignee, history._first_seen = data['assignee'], data['first_seen']
+            history._dates = data['dates'].tolist()
+            snapshot, rows, progress, cost = data['snapshot'], data['rows'], data['progress'], data['cost']
+
+        bounds = np.searchsorted(snapshot, np.arange(len(history._dates) + 1))
+        history._chunks = [(rows[a:b], progress[a:b], cost[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+        count = len(history._ids)
+        history._progress = np.bincount(rows, weights=progress, minlength=count)
+        history._cost = np.bincount(rows, weights=cost, minlength=count)
+        return history
+
+
+def draw_progress_curves(ax, curves: EarnedValueCurves, group: Optional[str] = None) -> None:
+    """
+    在坐标轴上绘制计划值、挣值、实际成本与燃尽曲线
+
+    参数:
+        ax: matplotlib坐标轴，x轴为日期
+        curves (EarnedValueCurves): 挣值曲线
+        group (str): 要绘制的分组，默认汇总全部分组
+    """
+    if group is None:
+        values = {name: getattr(curves, name).sum(axis=1) for name in ('pv', 'ev', 'ac', 'scope')}
+        values['remaining'] = values['scope'] - values['ev']
+    else:
+        values = curves.group(group)
+
+    x = mdates.date2num(curves.dates)
+    ax.plot(x, values['pv'], color='#4682B4', linestyle='--', label='计划值 PV')
+    ax.plot(x, values['ev'], color='#50C878', label='挣值 EV')
+    if values['ac'].any():
+        ax.plot(x, values['ac'], color='#DC143C', label='实际成本 AC')
+    ax.plot(x, values['remaining'], color='#7f7f7f', drawstyle='steps-post', label='剩余工作')
+    ax.set_ylabel('工作量')
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc='upper left', fontsize=8)
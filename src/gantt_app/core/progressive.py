@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+渐进式导出：先快速返回低分辨率预览，再在后台输出全分辨率图片
+
+甘特图只绘制（构建图元）一次。预览在低dpi下完成一次排版与绘制，紧凑边界直接由这次排版得到的
+文本范围计算（以英寸表示，与dpi无关），全分辨率输出复用同一个Figure和同一个边界，
+不再需要 bbox_inches='tight' 额外的一次完整绘制。
+"""
+
+import io
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from matplotlib.image import imsave
+from matplotlib.transforms import Bbox
+
+from gantt_app.core.figure_pool import DEFAULT_FIGSIZE, FigurePool, default_pool
+
+
+DEFAULT_PREVIEW_DPI = 40
+DEFAULT_PAD_INCHES = 0.1
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _default_executor() -> ThreadPoolExecutor:
+    """后台导出共用的线程池，首次使用时创建"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='gantt-export')
+        return _executor
+
+
+def tight_bbox(fig, pad_inches: float = DEFAULT_PAD_INCHES) -> Bbox:
+    """
+    由已排版的文本与坐标轴范围计算紧凑边界
+
+    只做文本排版，不做光栅化；在 fig.canvas.draw() 之后调用时文本范围直接取自排版缓存。
+    结果以英寸表示，可用于任意dpi的输出。
+
+    参数:
+        fig (Figure): 已绘制的Figure
+        pad_inches (float): 四周留白（英寸）
+
+    返回:
+        Bbox: 以英寸为单位的边界，可直接传给 savefig(bbox_inches=...)
+    """
+    renderer = fig.canvas.get_renderer()
+    extent = fig.get_tightbbox(renderer)
+    return Bbox(extent.get_points()).padded(pad_inches)
+
+
+def crop_to_bbox(rgba: np.ndarray, bbox: Bbox, dpi: float) -> np.ndarray:
+    """
+    从整张Figure的像素中裁剪出边界范围
+
+    参数:
+        rgba (np.ndarray): 画布像素，形状为 (高, 宽, 4)，第一行为图片顶部
+        bbox (Bbox): 以英寸为单位的边界
+        dpi (float): 像素对应的分辨率
+
+    返回:
+        np.ndarray: 裁剪后的像素
+    """
+    height, width = rgba.shape[:2]
+    x0, y0, x1, y1 = (np.asarray(bbox.extents) * dpi).tolist()
+    left, right = max(int(np.floor(x0)), 0), min(int(np.ceil(x1)), width)
+    top, bottom = max(int(np.floor(height - y1)), 0), min(int(np.ceil(height - y0)), height)
+    return rgba[top:bottom, left:right]
+
+
+class ProgressiveExport:
+    """一次渐进式导出：预览已就绪，全分辨率图片在后台生成"""
+
+    def __init__(self, preview: bytes, bbox: Bbox, future: Future):
+        """
+        参数:
+            preview (bytes): 低分辨率PNG预览
+            bbox (Bbox): 以英寸为单位的紧凑边界
+            future (Future): 全分辨率输出的任务，结果为保存路径或文件对象
+        """
+        self.preview = preview
+        self.bbox = bbox
+        self.future = future
+
+    def done(self) -> bool:
+        """全分辨率图片是否已生成"""
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None):
+        """
+        等待全分辨率图片生成
+
+        参数:
+            timeout (float): 最长等待秒数
+
+        返回:
+            保存路径或文件对象
+
+        异常:
+            后台保存时抛出的异常
+        """
+        return self.future.result(timeout)
+
+
+def export_progressive(chart,
+                       target: Union[str, io.IOBase],
+                       format: Optional[str] = None,
+                       dpi: float = 300,
+                       preview_dpi: float = DEFAULT_PREVIEW_DPI,
+                       figsize: Tuple[float, float] = DEFAULT_FIGSIZE,
+                       pad_inches: float = DEFAULT_PAD_INCHES,
+                       pool: Optional[FigurePool] = None,
+                       executor: Optional[Executor] = None,
+                       **options) -> ProgressiveExport:
+    """
+    绘制甘特图，立即返回低分辨率预览，全分辨率图片交给后台线程保存
+
+    参数:
+        chart (GanttChart): 甘特图
+        target (str | 文件对象): 全分辨率图片的保存路径或可写的二进制文件对象
+        format (str): 图片格式，默认由路径扩展名决定
+        dpi (float): 全分辨率输出的dpi
+        preview_dpi (float): 预览的dpi
+        figsize (Tuple[float, float]): 尺寸（英寸）
+        pad_inches (float): 紧凑边界的留白（英寸）
+        pool (FigurePool): Figure池，默认使用 default_pool
+        executor (Executor): 执行全分辨率保存的线程池，默认使用模块共用的线程池
+        **options: 传给 GanttChart.draw 的参数（baseline、calendar、history、links）
+
+    返回:
+        ProgressiveExport: 预览与后台任务
+
+    异常:
+        ValueError: 如果没有任务
+    """
+    pool = default_pool if pool is None else pool
+    executor = _default_executor() if executor is None else executor
+
+    fig = pool.acquire(figsize, dpi=preview_dpi)
+    try:
+        chart.draw(fig, **options)
+        # 低dpi下的这次绘制同时完成排版，边界由其文本范围得到
+        fig.canvas.draw()
+        bbox = tight_bbox(fig, pad_inches)
+        buffer = io.BytesIO()
+        imsave(buffer, crop_to_bbox(np.asarray(fig.canvas.buffer_rgba()), bbox, preview_dpi), format='png')
+    except BaseException:
+        fig.clear()
+        raise
+
+    def finish():
+        try:
+            fig.savefig(target, format=format, dpi=dpi, bbox_inches=bbox)
+        except BaseException:
+            fig.clear()
+            raise
+        pool.release(fig)
+        return target
+
+    return ProgressiveExport(buffer.getvalue(), bbox, executor.submit(finish))
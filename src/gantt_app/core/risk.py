@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+蒙特卡洛进度风险模拟
+
+按PERT或三角分布对任务工期抽样，沿 dependencies（完成-开始关系）传播。
+所有样本作为 样本数 × 任务数 的矩阵按拓扑层一次计算，
+输出各里程碑完成日期的 P50/P80/P95 以及关键路径关键度。
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gantt_app.core.columns import datetime_column, durations
+
+
+PERT = 'pert'
+TRIANGULAR = 'triangular'
+
+DEFAULT_PERCENTILES = (50, 80, 95)
+
+_DAY = np.timedelta64(1, 'D')
+
+
+class _Level:
+    """一个拓扑层：本层任务，以及指向本层任务的依赖边（分别按后继、前驱排序）"""
+
+    def __init__(self, tasks: np.ndarray, preds: np.ndarray, succs: np.ndarray):
+        self.tasks = tasks
+        order = np.argsort(succs, kind='stable')
+        self.fwd_preds = preds[order]
+        self.fwd_succs, self.fwd_segments = np.unique(succs[order], return_index=True)
+        order = np.argsort(preds, kind='stable')
+        self.bwd_preds, self.bwd_segments = np.unique(preds[order], return_index=True)
+        self.bwd_pred_edges = preds[order]
+        self.bwd_succ_edges = succs[order]
+
+
+class SimulationResult:
+    """模拟结果"""
+
+    def __init__(self,
+                 origin: np.datetime64,
+                 milestones: List[str],
+                 planned_finish: np.ndarray,
+                 finish: np.ndarray,
+                 criticality: pd.Series):
+        """
+        初始化模拟结果
+
+        参数:
+            origin (np.datetime64): 时间原点，完成时间以相对原点的天数保存
+            milestones (List[str]): 里程碑ID，最后一个为整个项目
+            planned_finish (np.ndarray): 各里程碑的计划完成时间（天）
+            finish (np.ndarray): 样本数 × 里程碑数 的模拟完成时间（天）
+            criticality (pd.Series): 每个任务位于关键路径上的样本比例
+        """
+        self.origin = origin
+        self.milestones = milestones
+        self.planned_finish = planned_finish
+        self.finish = finish
+        self.criticality = criticality
+
+    @property
+    def samples(self) -> int:
+        """样本数"""
+        return len(self.finish)
+
+    def _to_dates(self, days: np.ndarray) -> np.ndarray:
+        return self.origin + np.round(np.asarray(days) * 86400).astype('timedelta64[s]')
+
+    def percentiles(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> pd.DataFrame:
+        """
+        各里程碑完成日期的分位数
+
+        参数:
+            percentiles (Sequence[float]): 分位数，默认 P50/P80/P95
+
+        返回:
+            pd.DataFrame: 以里程碑ID为索引，包含 Planned、P50 等日期列及按期完成概率 OnTime
+        """
+        values = np.percentile(self.finish, percentiles, axis=0)
+        frame = pd.DataFrame({'Planned': self._to_dates(self.planned_finish)},
+                             index=pd.Index(self.milestones, name='ArtifactID'))
+        for q, row in zip(percentiles, values):
+            frame[f'P{q:g}'] = self._to_dates(row)
+        frame['OnTime'] = (self.finish <= self.planned_finish[None, :] + 1e-9).mean(axis=0)
+        return frame
+
+    def critical_tasks(self, threshold: float = 0.5) -> List[str]:
+        """
+        关键度不低于阈值的任务
+
+        参数:
+            threshold (float): 关键度阈值
+
+        返回:
+            List[str]: 按关键度从高到低排列的任务ID
+        """
+        selected = self.criticality[self.criticality >= threshold]
+        return selected.sort_values(ascending=False, kind='stable').index.tolist()
+
+
+def _simulate_batch(model: 'ScheduleSimulator', samples: int, seed) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    模拟一批样本，可在子进程中执行
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: 里程碑完成时间（样本数 × 里程碑数）、每个任务处于关键路径的次数
+    """
+    rng = np.random.default_rng(seed)
+    milestone_finish = []
+    critical_counts = np.zeros(len(model.ids), dtype=np.int64)
+    for size in [model.batch_size] * (samples // model.batch_size) + [samples % model.batch_size]:
+        if size:
+            finish, critical = model._propagate(model._sample(rng, size))
+            milestone_finish.append(finish)
+            critical_counts += critical
+    return np.concatenate(milestone_finish), critical_counts
+
+
+class ScheduleSimulator:
+    """基于依赖图的蒙特卡洛进度模拟器"""
+
+    def __init__(self,
+                 tasks: Sequence,
+                 estimates: Optional[Mapping[str, Tuple[float, float, float]]] = None,
+                 distribution: str = PERT,
+                 optimistic: float = 0.8,
+                 pessimistic: float = 1.5,
+                 batch_size: int = 1000):
+        """
+        初始化模拟器并编译依赖图
+
+        参数:
+            tasks (Sequence[Task]): 任务序列，dependencies 为前置任务ID
+            estimates (Mapping): ArtifactID -> (乐观, 最可能, 悲观) 工期（天）
+            distribution (str): 'pert' 或 'triangular'
+            optimistic (float): 没有估计值时，乐观工期 = 计划工期 × optimistic
+            pessimistic (float): 没有估计值时，悲观工期 = 计划工期 × pessimistic
+            batch_size (int): 每次矩阵计算的样本数，用于限制内存
+
+        异常:
+            ValueError: 如果分布不受支持或依赖关系存在循环
+        """
+        if distribution not in (PERT, TRIANGULAR):
+            raise ValueError(f"不支持的工期分布: {distribution}")
+        self.distribution = distribution
+        self.batch_size = max(1, batch_size)
+        self.ids = [task.artfId for task in tasks]
+        index = {artfid: i for i, artfid in enumerate(self.ids)}
+
+        start = datetime_column([task.start_date for task in tasks])
+        end = datetime_column([task.end_date for task in tasks])
+        self.origin = start.min().astype('datetime64[s]') if len(start) else np.datetime64('now', 's')
+        # 计划开始时间作为“不早于”约束
+        self.planned_start = (start - self.origin) / _DAY
+        self.planned_end = (end - self.origin) / _DAY
+
+        likely = durations(start, end).astype(float)
+        low, mode, high = likely * optimistic, likely, likely * pessimistic
+        if estimates:
+            for artfid, (o, m, p) in estimates.items():
+                i = index.get(artfid)
+                if i is not None:
+                    low[i], mode[i], high[i] = o, m, p
+        self.low, self.mode, self.high = low, mode, high
+
+        preds, succs = [], []
+        missing = set()
+        for j, task in enumerate(tasks):
+            for dep in task.dependencies:
+                i = index.get(dep.strip())
+                if i is None:
+                    missing.add(dep.strip())
+                elif i != j:
+                    preds.append(i)
+                    succs.append(j)
+        if missing:
+            print(f"忽略不存在的前置任务: {', '.join(sorted(missing))}")
+        self.preds = np.array(preds, dtype=np.int64)
+        self.succs = np.array(succs, dtype=np.int64)
+        self.levels = self._build_levels()
+        self._milestone_rows = np.empty(0, dtype=np.int64)
+
+    def _build_levels(self) -> List[_Level]:
+        """按拓扑层分组任务（Kahn算法），同层任务互不依赖"""
+        count = len(self.ids)
+        indegree = np.bincount(self.succs, minlength=count)
+        order = np.argsort(self.preds, kind='stable')
+        out_edges = self.succs[order]
+        out_start = np.searchsorted(self.preds[order], np.arange(count + 1))
+
+        level = np.zeros(count, dtype=np.int64)
+        frontier = np.flatnonzero(indegree == 0)
+        visited = 0
+        while len(frontier):
+            visited += len(frontier)
+            nxt = []
+            for i in frontier.tolist():
+                for j in out_edges[out_start[i]:out_start[i + 1]].tolist():
+                    level[j] = max(level[j], level[i] + 1)
+                    indegree[j] -= 1
+                    if indegree[j] == 0:
+                        nxt.append(j)
+            frontier = np.array(nxt, dtype=np.int64)
+        if visited < count:
+            cycle = [self.ids[i] for i in np.flatnonzero(indegree > 0)]
+            raise ValueError(f"依赖关系存在循环: {', '.join(cycle)}")
+
+        levels = []
+        edge_level = level[self.succs]
+        for value in range(int(level.max()) + 1 if count else 0):
+            edges = edge_level == value
+            levels.append(_Level(np.flatnonzero(level == value), self.preds[edges], self.succs[edges]))
+        return levels
+
+    def _sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """抽样工期，返回 样本数 × 任务数 矩阵"""
+        low, mode, high = self.low, self.mode, self.high
+        spread = high - low
+        fixed = spread <= 0
+        width = np.where(fixed, 1.0, spread)
+        if self.distribution == PERT:
+            alpha = 1 + 4 * (mode - low) / width
+            beta = 1 + 4 * (high - mode) / width
+            values = low + rng.beta(alpha, beta, size=(size, len(low))) * spread
+        else:
+            values = rng.triangular(np.where(fixed, low - 1, low), np.clip(mode, low, high),
+                                    np.where(fixed, low + 1, high), size=(size, len(low)))
+        values[:, fixed] = mode[fixed]
+        return values
+
+    def _propagate(self, duration: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        按拓扑层正向传播完成时间，再反向标记关键路径
+
+        内部按 任务数 × 样本数 存放，取整行（一个任务的全部样本）是连续内存。
+
+        返回:
+            Tuple[np.ndarray, np.ndarray]: 里程碑完成时间，以及每个任务处于关键路径的次数
+        """
+        size = len(duration)
+        duration = np.ascontiguousarray(duration.T)
+        start = np.empty_like(duration)
+        finish = np.empty_like(duration)
+        for level in self.levels:
+            start[level.tasks] = self.planned_start[level.tasks, None]
+            if len(level.fwd_preds):
+                driving = np.maximum.reduceat(finish[level.fwd_preds], level.fwd_segments, axis=0)
+                start[level.fwd_succs] = np.maximum(start[level.fwd_succs], driving)
+            finish[level.tasks] = start[level.tasks] + duration[level.tasks]
+
+        project = finish.max(axis=0) if len(finish) else np.zeros(size)
+        critical = finish >= project[None, :]
+        for level in reversed(self.levels):
+            if len(level.bwd_pred_edges):
+                # 前驱的完成时间决定了后继的开始时间时，关键路径沿该边延伸
+                drives = (critical[level.bwd_succ_edges]
+                          & (finish[level.bwd_pred_edges] >= start[level.bwd_succ_edges]))
+                critical[level.bwd_preds] |= np.logical_or.reduceat(drives, level.bwd_segments, axis=0)
+
+        milestones = finish[self._milestone_rows].T
+        return np.column_stack([milestones, project]), critical.sum(axis=1)
+
+    def run(self,
+            samples: int = 10000,
+            milestones: Optional[Sequence[str]] = None,
+            seed: Optional[int] = None,
+            workers: int = 1) -> SimulationResult:
+        """
+        运行模拟
+
+        参数:
+            samples (int): 样本数
+            milestones (Sequence[str]): 里程碑任务ID，默认为没有后继的任务；结果中总会追加整个项目 'project'
+            seed (int): 随机种子，相同种子与进程数得到相同结果
+            workers (int): 进程数，大于1时按样本拆分到进程池
+
+        返回:
+            SimulationResult: 模拟结果
+        """
+        if milestones is None:
+            rows = np.setdiff1d(np.arange(len(self.ids)), self.preds)
+        else:
+            index = {artfid: i for i, artfid in enumerate(self.ids)}
+            unknown = [m for m in milestones if m not in index]
+            if unknown:
+                raise ValueError(f"里程碑不存在: {', '.join(unknown)}")
+            rows = np.array([index[m] for m in milestones], dtype=np.int64)
+        self._milestone_rows = rows
+
+        workers = max(1, min(workers, samples))
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        counts = [samples // workers + (1 if k < samples % workers else 0) for k in range(workers)]
+        if workers == 1:
+            parts = [_simulate_batch(self, counts[0], seeds[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_simulate_batch, [self] * workers, counts, seeds))
+
+        finish = np.concatenate([part[0] for part in parts])
+        critical = sum(part[1] for part in parts)
+        planned_end = self.planned_end
+        planned = np.append(planned_end[rows], planned_end.max() if len(planned_end) else 0.0)
+        return SimulationResult(self.origin,
+                                [self.ids[i] for i in rows] + ['project'],
+                                planned, finish,
+                                pd.Series(critical / max(samples, 1), index=self.ids, name='Criticality'))
+
+
+def simulate_schedule(chart,
+                      samples: int = 10000,
+                      milestones: Optional[Sequence[str]] = None,
+                      seed: Optional[int] = None,
+                      workers: int = 1,
+                      **options) -> SimulationResult:
+    """
+    对甘特图运行蒙特卡洛进度模拟
+
+    参数:
+        chart (GanttChart): 甘特图对象
+        samples (int): 样本数
+        milestones (Sequence[str]): 里程碑任务ID
+        seed (int): 随机种子
+        workers (int): 进程数
+        **options: 传给 ScheduleSimulator 的其他参数
+
+    返回:
+        SimulationResult: 模拟结果
+    """
+    return ScheduleSimulator(chart.tasks, **options).run(samples, milestones, seed, workers)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+表格列映射配置
+
+SchemaProfile 显式地给出 任务字段 -> 表头列名 的映射，以及日期格式和列类型，
+并据此生成 pandas 的 usecols/dtype 参数，不需要的列不会被解析。
+SchemaRegistry 以表头行的哈希为键缓存解析结果：已知的导出格式直接命中已登记的配置，
+未知表头只推断一次列映射。
+"""
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+
+# 任务字段
+FIELDS = ('Description', 'AssignTo', 'StartDate', 'EndDate', 'ArtifactID',
+          'Status', 'Progress', 'Dependencies')
+
+DATE_FIELDS = ('StartDate', 'EndDate')
+
+# 文本字段按字符串读取，避免 "0012" 之类的ID被解析为数字
+TEXT_FIELDS = ('Description', 'AssignTo', 'ArtifactID', 'Status', 'Dependencies')
+
+# 列名推断规则，按顺序匹配，靠前的规则优先：
+# (字段, 英文单词, 中文关键词, 排除的英文单词, 排除的中文关键词)
+# 英文按整词匹配（驼峰与分隔符处拆分），因此 "Pending" 不会匹配 end，"Valid" 不会匹配 id
+_RULES = (
+    ('ArtifactID', {'id', 'artifact', 'artfid'}, ('工件', '编号'), set(), ()),
+    ('Status', {'status', 'state'}, ('状态',), set(), ()),
+    ('Progress', {'progress', 'complete', 'percent'}, ('进度',), set(), ()),
+    ('StartDate', {'start', 'begin'}, ('开始',), {'actual'}, ('实际',)),
+    ('EndDate', {'end', 'due', 'finish'}, ('结束', '截止'), {'actual'}, ('实际',)),
+    ('Dependencies', {'dependencies', 'depends', 'predecessors'}, ('依赖', '前置'), set(), ()),
+    ('AssignTo', {'owner', 'assign', 'assignee', 'assigned', 'person'}, ('负责', '分配'), set(), ()),
+    ('Description', {'task', 'title', 'name', 'description'}, ('任务', '标题', '描述'), set(), ()),
+)
+
+
+def _words(header: Any) -> set:
+    """把列名拆分为小写英文单词，例如 'ArtifactID' -> {'artifact', 'id'}"""
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', str(header))
+    return set(re.findall(r'[a-z]+', text.lower()))
+
+
+def infer_columns(header: Sequence) -> Dict[str, Any]:
+    """
+    根据列名推断列映射
+
+    每一列最多对应一个字段；同一字段有多列匹配时取第一列。
+
+    参数:
+        header (Sequence): 表头列名
+
+    返回:
+        Dict[str, Any]: 字段 -> 列名
+    """
+    columns: Dict[str, Any] = {}
+    for col in header:
+        words = _words(col)
+        text = str(col)
+        for field, keywords, cjk, exclude, exclude_cjk in _RULES:
+            if words & exclude or any(keyword in text for keyword in exclude_cjk):
+                continue
+            if words & keywords or any(keyword in text for keyword in cjk):
+                columns.setdefault(field, col)
+                break
+    return columns
+
+
+def header_signature(header: Iterable) -> str:
+    """
+    表头行的哈希
+
+    参数:
+        header (Iterable): 表头列名
+
+    返回:
+        str: 十六进制哈希
+    """
+    return hashlib.sha1('\x1f'.join(str(col) for col in header).encode('utf-8')).hexdigest()
+
+
+class SchemaProfile:
+    """一种表格布局：字段到列名的映射、日期格式与列类型"""
+
+    def __init__(self,
+                 name: str,
+                 columns: Dict[str, Any],
+                 date_formats: Optional[Dict[str, str]] = None,
+                 dtypes: Optional[Dict[str, Any]] = None):
+        """
+        初始化配置
+
+        参数:
+            name (str): 配置名称
+            columns (Dict[str, Any]): 字段 -> 列名，字段见 FIELDS
+            date_formats (Dict[str, str]): 日期字段 -> 格式，例如 '%Y/%m/%d'，默认自动识别
+            dtypes (Dict[str, Any]): 字段 -> pandas列类型，文本字段默认为 str
+
+        异常:
+            ValueError: 如果包含未知字段
+        """
+        unknown = [field for field in columns if field not in FIELDS]
+        if unknown:
+            raise ValueError(f"未知的字段: {', '.join(unknown)}")
+        self.name = name
+        self.columns = dict(columns)
+        self.date_formats = dict(date_formats or {})
+        self.dtypes = dict(dtypes or {})
+
+    def __repr__(self) -> str:
+        return f"SchemaProfile({self.name})"
+
+    def matches(self, header: Sequence) -> bool:
+        """表头是否包含配置中的全部列"""
+        present = set(header)
+        return all(col in present for col in self.columns.values())
+
+    def usecols(self) -> List[Any]:
+        """需要读取的列，保持配置中的顺序并去重"""
+        return list(dict.fromkeys(self.columns.values()))
+
+    def read_options(self) -> Dict[str, Any]:
+        """
+        读取表格时传给 pandas 的参数
+
+        返回:
+            Dict[str, Any]: usecols 与 dtype
+        """
+        dtype = {}
+        for field, col in self.columns.items():
+            if field in self.dtypes:
+                dtype[col] = self.dtypes[field]
+            elif field in TEXT_FIELDS:
+                dtype[col] = str
+        return {'usecols': self.usecols(), 'dtype': dtype}
+
+    def column(self, df: pd.DataFrame, field: str) -> Optional[pd.Series]:
+        """取出字段对应的列，配置中没有该字段时返回None"""
+        col = self.columns.get(field)
+        return df[col] if col is not None else None
+
+    def dates(self, df: pd.DataFrame, field: str) -> Optional[pd.Series]:
+        """
+        按配置的格式解析日期列
+
+        参数:
+            df (pd.DataFrame): 数据框
+            field (str): 日期字段
+
+        返回:
+            Optional[pd.Series]: datetime64列，无法解析的值为NaT；配置中没有该字段时返回None
+        """
+        values = self.column(df, field)
+        if values is None:
+            return None
+        return pd.to_datetime(values, format=self.date_formats.get(field), errors='coerce')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可写入JSON的字典（列类型以字符串保存）"""
+        return {'name': self.name, 'columns': self.columns, 'date_formats': self.date_formats,
+                'dtypes': {field: str(dtype) if not isinstance(dtype, type) else dtype.__name__
+                           for field, dtype in self.dtypes.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SchemaProfile':
+        """由 to_dict 的结果创建配置"""
+        return cls(data['name'], data['columns'], data.get('date_formats'), data.get('dtypes'))
+
+
+# 本程序导出的CSV/Excel格式；同一列的日期格式一致（全为日期或全带时间），由pandas自动识别
+EXPORT_PROFILE = SchemaProfile(
+    'gantt-export',
+    {'AssignTo': 'AssignTo', 'ArtifactID': 'ArtifactID', 'Description': 'Description',
+     'StartDate': 'Start', 'EndDate': 'End', 'Progress': 'Progress', 'Dependencies': 'Dependencies'},
+)
+
+
+# 表头哈希缓存的最大条目数
+SIGNATURE_CACHE_SIZE = 256
+
+
+class SchemaRegistry:
+    """已登记的配置，以及按表头哈希缓存的解析结果"""
+
+    def __init__(self,
+                 profiles: Optional[Iterable[SchemaProfile]] = None,
+                 cache_size: int = SIGNATURE_CACHE_SIZE):
+        """
+        初始化配置登记表
+
+        参数:
+            profiles (Iterable[SchemaProfile]): 初始配置，按登记顺序匹配
+            cache_size (int): 最多缓存的表头数量，超出时淘汰最久未用的表头
+                （例如渲染服务中每个客户端的表头都不同）
+        """
+        self.profiles: Dict[str, SchemaProfile] = {}
+        self.cache_size = cache_size
+        self._by_signature: 'OrderedDict[str, SchemaProfile]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        for profile in profiles or ():
+            self.register(profile)
+
+    def register(self, profile: SchemaProfile) -> None:
+        """
+        登记配置，同名配置被替换
+
+        参数:
+            profile (SchemaProfile): 配置
+        """
+        self.profiles[profile.name] = profile
+        # 已缓存的表头可能改为匹配新配置
+        self._by_signature.clear()
+
+    def get(self, name: str) -> SchemaProfile:
+        """
+        按名称取配置
+
+        异常:
+            KeyError: 如果配置不存在
+        """
+        return self.profiles[name]
+
+    def resolve(self, header: Sequence) -> SchemaProfile:
+        """
+        确定表头对应的配置：先查表头哈希缓存，再按登记顺序匹配，最后推断列映射
+
+        参数:
+            header (Sequence): 表头列名
+
+        返回:
+            SchemaProfile: 配置
+        """
+        header = list(header)
+        signature = header_signature(header)
+        profile = self._by_signature.get(signature)
+        if profile is not None:
+            self._by_signature.move_to_end(signature)
+            self.hits += 1
+            return profile
+        self.misses += 1
+        profile = next((candidate for candidate in self.profiles.values() if candidate.matches(header)), None)
+        if profile is None:
+            columns = infer_columns(header)
+            # 没有识别出描述列时使用第一列
+            if 'Description' not in columns and header:
+                columns['Description'] = header[0]
+            profile = SchemaProfile(f'inferred-{signature[:8]}', columns)
+        self._by_signature[signature] = profile
+        while len(self._by_signature) > self.cache_size:
+            self._by_signature.popitem(last=False)
+        return profile
+
+    def save(self, filepath: str) -> None:
+        """将已登记的配置保存为JSON文件"""
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump([profile.to_dict() for profile in self.profiles.values()], f, ensure_ascii=False, indent=2)
+
+    def load(self, filepath: str) -> None:
+        """从JSON文件登记配置"""
+        with open(filepath, encoding='utf-8') as f:
+            for data in json.load(f):
+                self.register(SchemaProfile.from_dict(data))
+
+
+# 加载文件时默认使用的登记表
+default_registry = SchemaRegistry([EXPORT_PROFILE])
+
+
+def resolve_profile(profile: Any, header: Sequence) -> SchemaProfile:
+    """
+    确定读取文件使用的配置
+
+    参数:
+        profile (SchemaProfile | str | None): 配置、default_registry 中的配置名称，或None表示按表头确定
+        header (Sequence): 表头列名
+
+    返回:
+        SchemaProfile: 配置
+
+    异常:
+        ValueError: 如果指定的配置与表头不匹配
+    """
+    if profile is None:
+        return default_registry.resolve(header)
+    if isinstance(profile, str):
+        profile = default_registry.get(profile)
+    if not profile.matches(header):
+        missing = [col for col in profile.usecols() if col not in set(header)]
+        raise ValueError(f"表头缺少配置 {profile.name} 中的列: {', '.join(map(str, missing))}")
+    return profile
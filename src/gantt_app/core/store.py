@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+SQLite项目存储
+
+任务、依赖关系和快照保存在带索引的表中。按日期窗口或负责人只加载需要的任务，
+写入按批在事务中执行，文件数据库使用WAL模式。
+加载结果是普通的 GanttChart，其余接口与内存中的甘特图完全相同。
+"""
+
+import datetime
+import sqlite3
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from gantt_app.core.chart_improved import Task
+from gantt_app.core.index import split_assignees
+
+
+DEFAULT_BATCH_SIZE = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    artf_id     TEXT PRIMARY KEY,
+    position    INTEGER NOT NULL,
+    assign_to   TEXT NOT NULL,
+    description TEXT NOT NULL,
+    start_date  TEXT NOT NULL,
+    end_date    TEXT NOT NULL,
+    progress    REAL NOT NULL,
+    color       TEXT,
+    source      TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_position ON tasks(position);
+CREATE INDEX IF NOT EXISTS tasks_start ON tasks(start_date);
+CREATE INDEX IF NOT EXISTS tasks_end ON tasks(end_date);
+
+CREATE TABLE IF NOT EXISTS task_assignees (
+    artf_id TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    PRIMARY KEY (name, artf_id)
+);
+CREATE INDEX IF NOT EXISTS task_assignees_task ON task_assignees(artf_id);
+
+CREATE TABLE IF NOT EXISTS dependencies (
+    artf_id    TEXT NOT NULL,
+    seq        INTEGER NOT NULL,
+    depends_on TEXT NOT NULL,
+    PRIMARY KEY (artf_id, seq)
+);
+CREATE INDEX IF NOT EXISTS dependencies_target ON dependencies(depends_on);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    label    TEXT,
+    taken_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS snapshot_tasks (
+    snapshot_id  INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    position     INTEGER NOT NULL,
+    artf_id      TEXT NOT NULL,
+    assign_to    TEXT NOT NULL,
+    description  TEXT NOT NULL,
+    start_date   TEXT NOT NULL,
+    end_date     TEXT NOT NULL,
+    progress     REAL NOT NULL,
+    color        TEXT,
+    source       TEXT,
+    dependencies TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, position)
+);
+"""
+
+_TASK_COLUMNS = 'artf_id, assign_to, description, start_date, end_date, progress, color, source'
+
+
+def _format_date(value: datetime.datetime) -> str:
+    # ISO文本的字典序与时间顺序一致，可直接用于范围查询
+    return value.isoformat(sep=' ')
+
+
+def _parse_date(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value)
+
+
+def _task_row(task: Task) -> tuple:
+    return (str(task.artfId), str(task.assignTo), str(task.description),
+            _format_date(task.start_date), _format_date(task.end_date),
+            float(task.progress), task.color, task.source)
+
+
+def _make_task(row: Sequence, dependencies: List[str]) -> Task:
+    artf_id, assign_to, description, start, end, progress, color, source = row
+    return Task(assign_to, artf_id, description, _parse_date(start), _parse_date(end),
+                progress, color, dependencies, source)
+
+
+def _batches(items: List, size: int) -> Iterator[List]:
+    for offset in range(0, len(items), size):
+        yield items[offset:offset + size]
+
+
+class SQLiteStore:
+    """基于SQLite的任务存储"""
+
+    def __init__(self, path: str = ':memory:', batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        打开或创建存储
+
+        参数:
+            path (str): 数据库文件路径，':memory:' 表示内存数据库
+            batch_size (int): 每个 executemany 批次的行数
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        if path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode = WAL')
+            self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self.conn.close()
+
+    def __enter__(self) -> 'SQLiteStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # 写入
+
+    def write_tasks(self, tasks: Iterable[Task], replace: bool = False) -> int:
+        """
+        在一个事务中批量写入任务
+
+        已存在的ArtifactID会被更新并保持原来的顺序，新任务追加在末尾；
+        同一批中重复的ID只保留最后一个。
+
+        参数:
+            tasks (Iterable[Task]): 任务集合
+            replace (bool): 是否先清空已有任务（保存完整项目时使用）
+
+        返回:
+            int: 写入的任务数
+        """
+        rows = {}
+        for task in tasks:
+            rows[str(task.artfId)] = task
+        tasks = list(rows.values())
+        ids = list(rows)
+
+        with self.conn:
+            if replace:
+                self.conn.execute('DELETE FROM tasks')
+                self.conn.execute('DELETE FROM task_assignees')
+                self.conn.execute('DELETE FROM dependencies')
+            else:
+                for batch in _batches(ids, self.batch_size):
+                    marks = ','.join('?' * len(batch))
+                    self.conn.execute(f'DELETE FROM task_assignees WHERE artf_id IN ({marks})', batch)
+                    self.conn.execute(f'DELETE FROM dependencies WHERE artf_id IN ({marks})', batch)
+
+            base = self.conn.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM tasks').fetchone()[0]
+            for offset, batch in enumerate(_batches(tasks, self.batch_size)):
+                first = base + offset * self.batch_size
+                self.conn.executemany(
+                    f'INSERT INTO tasks (position, {_TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT(artf_id) DO UPDATE SET assign_to = excluded.assign_to, '
+                    'description = excluded.description, start_date = excluded.start_date, '
+                    'end_date = excluded.end_date, progress = excluded.progress, '
+                    'color = excluded.color, source = excluded.source',
+                    ((first + i,) + _task_row(task) for i, task in enumerate(batch)))
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO task_assignees (artf_id, name) VALUES (?, ?)',
+                    ((str(task.artfId), name) for task in batch for name in split_assignees(task.assignTo)))
+                self.conn.executemany(
+                    'INSERT INTO dependencies (artf_id, seq, depends_on) VALUES (?, ?, ?)',
+                    ((str(task.artfId), seq, dep) for task in batch
+                     for seq, dep in enumerate(task.dependencies)))
+        return len(tasks)
+
+    def delete_tasks(self, artf_ids: Iterable[str]) -> int:
+        """
+        删除任务
+
+        参数:
+            artf_ids (Iterable[str]): 任务ID
+
+        返回:
+            int: 删除的任务数
+        """
+        deleted = 0
+        with self.conn:
+            for batch in _batches(list(artf_ids), self.batch_size):
+                marks = ','.join('?' * len(batch))
+                deleted += self.conn.execute(f'DELETE FROM tasks WHERE artf_id IN ({marks})', batch).rowcount
+                self.conn.execute(f'DELETE FROM task_assignees WHERE artf_id IN ({marks})', batch)
+                self.conn.execute(f'DELETE FROM dependencies WHERE artf_id IN ({marks})', batch)
+        return deleted
+
+    # 查询
+
+    def _where(self,
+               start: Optional[datetime.datetime],
+               end: Optional[datetime.datetime],
+               assignee: Optional[str]) -> Tuple[str, list]:
+        """日期窗口（与窗口有重叠的任务）与负责人过滤条件"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('t.end_date >= ?')
+            params.append(_format_date(start))
+        if end is not None:
+            clauses.append('t.start_date <= ?')
+            params.append(_format_date(end))
+        if assignee is not None:
+            clauses.append('t.artf_id IN (SELECT artf_id FROM task_assignees WHERE name = ?)')
+            params.append(assignee)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def iter_tasks(self,
+                   start: Optional[datetime.datetime] = None,
+                   end: Optional[datetime.datetime] = None,
+                   assignee: Optional[str] = None) -> Iterator[Task]:
+        """
+        按原顺序逐个读取满足条件的任务
+
+        参数:
+            start (datetime): 窗口开始，只返回结束不早于该时间的任务
+            end (datetime): 窗口结束，只返回开始不晚于该时间的任务
+            assignee (str): 负责人，多人负责的任务对其中每个人都可见
+
+        返回:
+            Iterator[Task]: 任务迭代器
+        """
+        where, params = self._where(start, end, assignee)
+        cursor = self.conn.execute(
+            f'SELECT {", ".join("t." + c.strip() for c in _TASK_COLUMNS.split(","))}, '
+            'd.depends_on FROM tasks t LEFT JOIN dependencies d ON d.artf_id = t.artf_id'
+            f'{where} ORDER BY t.position, d.seq', params)
+
+        current, dependencies = None, []
+        for row in cursor:
+            if current is not None and row[0] != current[0]:
+                yield _make_task(current, dependencies)
+                dependencies = []
+            current = row[:-1]
+            if row[-1] is not None:
+                dependencies.append(row[-1])
+        if current is not None:
+            yield _make_task(current, dependencies)
+
+    def count(self,
+              start: Optional[datetime.datetime] = None,
+              end: Optional[datetime.datetime] = None,
+              assignee: Optional[str] = None) -> int:
+        """满足条件的任务数，不加载任务"""
+        where, params = self._where(start, end, assignee)
+        return self.conn.execute(f'SELECT COUNT(*) FROM tasks t{where}', params).fetchone()[0]
+
+    def assignees(self) -> List[str]:
+        """全部负责人"""
+        return [row[0] for row in self.conn.execute('SELECT DISTINCT name FROM task_assignees ORDER BY name')]
+
+    def date_range(self) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
+        """全部任务的最早开始与最晚结束时间，没有任务时返回None"""
+        first, last = self.conn.execute('SELECT MIN(start_date), MAX(end_date) FROM tasks').fetchone()
+        if first is None:
+            return None
+        return _parse_date(first), _parse_date(last)
+
+    def dependents_of(self, artf_id: str) -> List[str]:
+        """依赖指定任务的任务ID"""
+        return [row[0] for row in self.conn.execute(
+            'SELECT artf_id FROM dependencies WHERE depends_on = ? ORDER BY artf_id', (artf_id,))]
+
+    # 快照
+
+    def save_snapshot(self, tasks: Iterable[Task], label: Optional[str] = None) -> int:
+        """
+        保存一个快照，例如作为对比基线
+
+        参数:
+            tasks (Iterable[Task]): 任务集合
+            label (str): 快照说明
+
+        返回:
+            int: 快照ID
+        """
+        with self.conn:
+            snapshot_id = self.conn.execute(
+                'INSERT INTO snapshots (label, taken_at) VALUES (?, ?)',
+                (label, _format_date(datetime.datetime.now()))).lastrowid
+            self.conn.executemany(
+                f'INSERT INTO snapshot_tasks (snapshot_id, position, {_TASK_COLUMNS}, dependencies) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((snapshot_id, position) + _task_row(task) + (','.join(task.dependencies),)
+                 for position, task in enumerate(tasks)))
+        return snapshot_id
+
+    def snapshots(self) -> List[Tuple[int, Optional[str], datetime.datetime]]:
+        """全部快照的 (ID, 说明, 时间)"""
+        return [(row[0], row[1], _parse_date(row[2]))
+                for row in self.conn.execute('SELECT id, label, taken_at FROM snapshots ORDER BY id')]
+
+    def iter_snapshot(self, snapshot_id: int) -> Iterator[Task]:
+        """按原顺序读取快照中的任务"""
+        cursor = self.conn.execute(
+            f'SELECT {_TASK_COLUMNS}, dependencies FROM snapshot_tasks '
+            'WHERE snapshot_id = ? ORDER BY position', (snapshot_id,))
+        for row in cursor:
+            yield _make_task(row[:-1], row[-1].split(',') if row[-1] else [])
+
+    def delete_snapshot(self, snapshot_id: int) -> None:
+        """删除快照"""
+        with self.conn:
+            self.conn.execute('DELETE FROM snapshots WHERE id = ?', (snapshot_id,))
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+泳道分组
+
+按负责人（或任意列）把任务分组，每组内用贪心区间划分把时间上不重叠的任务排在同一行，
+行数等于组内同时进行的任务的最大数量。折叠的组只显示一条汇总条，
+开始、结束与进度由 groupby 一次算出。所有任务条合并为少数几个 PolyCollection。
+"""
+
+import heapq
+from typing import Callable, Collection, List, Sequence, Union
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.collections import PolyCollection
+
+from gantt_app.core.columns import task_columns
+
+
+PROGRESS_COLOR = '#50C878'
+SUMMARY_COLOR = '#5a6470'
+BAND_COLOR = '#f2f2f2'
+
+# 分组依据的简写
+GROUP_ALIASES = {'assignee': 'AssignTo', 'assignTo': 'AssignTo', 'owner': 'AssignTo'}
+
+
+def pack_lanes(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    贪心区间划分：按开始时间依次放入最早空出的行，都不空时新开一行
+
+    一个任务结束时另一个任务开始视为不重叠。得到的行数等于同时进行的任务的最大数量（最优）。
+
+    参数:
+        starts (np.ndarray): 开始时间
+        ends (np.ndarray): 结束时间
+
+    返回:
+        np.ndarray: 每个任务所在的行号（从0开始）
+    """
+    lanes = np.zeros(len(starts), dtype=np.int64)
+    free: List[tuple] = []
+    count = 0
+    for i in np.argsort(starts, kind='stable').tolist():
+        if free and free[0][0] <= starts[i]:
+            lane = heapq.heapreplace(free, (ends[i], free[0][1]))[1]
+        else:
+            lane = count
+            count += 1
+            heapq.heappush(free, (ends[i], lane))
+        lanes[i] = lane
+    return lanes
+
+
+def group_keys(tasks: Sequence, by: Union[str, Callable]) -> np.ndarray:
+    """
+    每个任务的分组值
+
+    参数:
+        tasks (Sequence[Task]): 任务
+        by (str | Callable): task_columns 的列名（如 'AssignTo'、'Progress'）、其简写 'assignee'，
+            或接收任务返回分组值的函数
+
+    返回:
+        np.ndarray: 分组值（字符串）
+
+    异常:
+        ValueError: 如果列名未知
+    """
+    if callable(by):
+        return np.array([str(by(task)) for task in tasks], dtype=object)
+    column = GROUP_ALIASES.get(by, by)
+    columns = task_columns(tasks)
+    if column not in columns:
+        raise ValueError(f"未知的分组列: {by}")
+    values = columns[column]
+    if column in ('Start', 'End'):
+        return np.array(pd.DatetimeIndex(values).strftime('%Y-%m-%d'), dtype=object)
+    return np.array([str(value) for value in values.tolist()], dtype=object)
+
+
+class SwimlaneLayout:
+    """泳道布局：每个任务所在的行，以及折叠组的汇总条"""
+
+    def __init__(self,
+                 tasks: Sequence,
+                 by: Union[str, Callable] = 'AssignTo',
+                 collapsed: Union[bool, Collection[str], None] = None):
+        """
+        计算布局
+
+        组按首次出现的顺序自上而下排列，行高为1，第一行的纵坐标最大（与逐行绘制一致）。
+
+        参数:
+            tasks (Sequence[Task]): 任务
+            by (str | Callable): 分组依据，见 group_keys
+            collapsed (bool | Collection[str]): 折叠的组名，True 表示折叠全部组
+        """
+        columns = task_columns(tasks)
+        codes, names = pd.factorize(pd.Series(group_keys(tasks, by), dtype=object))
+        self.groups: List[str] = list(names)
+        self.start = mdates.date2num(columns['Start'])
+        self.end = self.start + columns['Duration'].astype(float)
+        self.progress = columns['Progress'].astype(float)
+        self.codes = codes
+        self.counts = np.bincount(codes, minlength=len(self.groups))
+
+        if collapsed is True:
+            self.collapsed = np.ones(len(self.groups), dtype=bool)
+        else:
+            wanted = set(collapsed or ())
+            self.collapsed = np.array([name in wanted for name in self.groups], dtype=bool)
+
+        # 展开的组按组分别做区间划分
+        lanes = np.zeros(len(tasks), dtype=np.int64)
+        self.lane_counts = np.ones(len(self.groups), dtype=np.int64)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(self.groups) + 1))
+        for group in np.flatnonzero(~self.collapsed).tolist():
+            members = order[bounds[group]:bounds[group + 1]]
+            packed = pack_lanes(self.start[members], self.end[members])
+            lanes[members] = packed
+            self.lane_counts[group] = int(packed.max()) + 1 if len(packed) else 1
+
+        first_row = np.concatenate([[0], np.cumsum(self.lane_counts)[:-1]])
+        self.rows = int(self.lane_counts.sum())
+        # 组的顶部一行与底部一行的纵坐标
+        self.group_top = (self.rows - first_row).astype(float)
+        self.group_bottom = self.group_top - self.lane_counts + 1
+
+        self.visible = np.flatnonzero(~self.collapsed[codes])
+        self.task_y = np.full(len(tasks), np.nan)
+        self.task_y[self.visible] = self.group_top[codes[self.visible]] - lanes[self.visible]
+
+        self.summary = self._summarize()
+
+    def _summarize(self) -> pd.DataFrame:
+        """折叠组的汇总：最早开始、最晚结束、任务数与按工期加权的进度"""
+        hidden = self.collapsed[self.codes]
+        duration = self.end - self.start
+        frame = pd.DataFrame({'group': self.codes[hidden], 'start': self.start[hidden], 'end': self.end[hidden],
+                              'duration': duration[hidden], 'done': (duration * self.progress / 100)[hidden]})
+        summary = frame.groupby('group').agg(start=('start', 'min'), end=('end', 'max'), count=('start', 'size'),
+                                             duration=('duration', 'sum'), done=('done', 'sum'))
+        summary['progress'] = np.where(summary['duration'] > 0, summary['done'] / summary['duration'] * 100, 0.0)
+        summary['y'] = self.group_top[summary.index.to_numpy()]
+        summary.index = [self.groups[code] for code in summary.index]
+        return summary[['start', 'end', 'count', 'progress', 'y']]
+
+    def tick_positions(self) -> np.ndarray:
+        """每个组的纵轴标签位置（组的中线）"""
+        return (self.group_top + self.group_bottom) / 2
+
+    def tick_labels(self) -> List[str]:
+        """每个组的纵轴标签：组名与任务数，折叠的组加标记"""
+        return [f"{'▸ ' if collapsed else ''}{name} ({count})"
+                for name, count, collapsed in zip(self.groups, self.counts.tolist(), self.collapsed.tolist())]
+
+
+def _rect_verts(x0: np.ndarray, x1: np.ndarray, y: np.ndarray, half=0.4) -> np.ndarray:
+    """批量生成以 y 为中线、半高为 half 的矩形顶点，形状为 (个数, 4, 2)"""
+    y0, y1 = y - half, y + half
+    return np.stack([np.column_stack([x0, y0]), np.column_stack([x0, y1]),
+                     np.column_stack([x1, y1]), np.column_stack([x1, y0])], axis=1)
+
+
+def draw_swimlanes(ax, tasks: Sequence, layout: SwimlaneLayout) -> None:
+    """
+    按泳道布局绘制任务条、折叠组的汇总条和组的底色
+
+    参数:
+        ax: matplotlib坐标轴
+        tasks (Sequence[Task]): 任务
+        layout (SwimlaneLayout): 布局
+    """
+    # 相邻的组交替使用底色，底色横向铺满坐标轴（x为坐标轴比例）
+    shaded = np.arange(len(layout.groups)) % 2 == 1
+    if shaded.any():
+        top, bottom = layout.group_top[shaded] + 0.5, layout.group_bottom[shaded] - 0.5
+        bands = _rect_verts(np.zeros(len(top)), np.ones(len(top)), (top + bottom) / 2, (top - bottom) / 2)
+        ax.add_collection(PolyCollection(bands, facecolors=BAND_COLOR, edgecolors='none', zorder=0,
+                                         transform=ax.get_yaxis_transform()), autolim=False)
+
+    rows = layout.visible
+    if len(rows):
+        start, end, y = layout.start[rows], layout.end[rows], layout.task_y[rows]
+        done = start + (end - start) * np.clip(layout.progress[rows], 0, 100) / 100
+        ax.add_collection(PolyCollection(_rect_verts(start, end, y),
+                                         facecolors=[tasks[row].color for row in rows.tolist()],
+                                         edgecolors='black', alpha=0.8, zorder=2), autolim=False)
+        ax.add_collection(PolyCollection(_rect_verts(start, done, y), facecolors=PROGRESS_COLOR,
+                                         edgecolors='none', alpha=0.6, zorder=2.1), autolim=False)
+
+    summary = layout.summary
+    if len(summary):
+        start, end, y = (summary[name].to_numpy(dtype=float) for name in ('start', 'end', 'y'))
+        done = start + (end - start) * np.clip(summary['progress'].to_numpy(), 0, 100) / 100
+        ax.add_collection(PolyCollection(_rect_verts(start, end, y, 0.3), facecolors=SUMMARY_COLOR,
+                                         edgecolors='black', alpha=0.8, zorder=2), autolim=False)
+        ax.add_collection(PolyCollection(_rect_verts(start, done, y, 0.3), facecolors=PROGRESS_COLOR,
+                                         edgecolors='none', alpha=0.6, zorder=2.1), autolim=False)
+
+    ax.set_ylim(0.5, layout.rows + 0.5)
+    ax.set_yticks(layout.tick_positions())
+    ax.set_yticklabels(layout.tick_labels())
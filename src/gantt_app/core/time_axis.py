@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自适应时间轴
+
+根据可见时间跨度和坐标轴像素宽度在日/周/月/季度/年之间选择刻度，
+并在上方绘制更粗一级的第二层表头（例如周之上显示月份）。
+无论时间跨度多长，刻度数量都不会超过宽度允许的数量。
+"""
+
+import math
+from typing import Callable, List, Optional, Tuple
+
+import matplotlib.dates as mdates
+import matplotlib.ticker as mticker
+
+
+# 每个刻度标签至少占用的像素宽度
+DEFAULT_MIN_TICK_PX = 50
+
+
+def _quarter_formatter() -> mticker.Formatter:
+    """季度标签，例如 Q3"""
+    return mticker.FuncFormatter(lambda x, pos: f"Q{(mdates.num2date(x).month - 1) // 3 + 1}")
+
+
+class TimeScale:
+    """一种刻度尺度：刻度间隔与对应的定位器、格式"""
+
+    def __init__(self,
+                 name: str,
+                 spacing_days: float,
+                 locator: Callable[[], mdates.DateLocator],
+                 formatter: Callable[[], mticker.Formatter],
+                 upper: Optional[str] = None):
+        """
+        初始化刻度尺度
+
+        参数:
+            name (str): 尺度名称
+            spacing_days (float): 相邻刻度的近似间隔（天）
+            locator (Callable): 创建刻度定位器的函数
+            formatter (Callable): 创建标签格式器的函数
+            upper (str): 第二层表头使用的尺度名称，None表示不需要第二层
+        """
+        self.name = name
+        self.spacing_days = spacing_days
+        self.locator = locator
+        self.formatter = formatter
+        self.upper = upper
+
+    def __repr__(self) -> str:
+        return f"TimeScale({self.name})"
+
+
+def _fmt(pattern: str) -> Callable[[], mticker.Formatter]:
+    return lambda: mdates.DateFormatter(pattern)
+
+
+# 按刻度间隔从小到大排列的候选尺度
+SCALES: List[TimeScale] = [
+    TimeScale('day', 1, lambda: mdates.DayLocator(), _fmt('%d'), 'month'),
+    TimeScale('2day', 2, lambda: mdates.DayLocator(interval=2), _fmt('%d'), 'month'),
+    TimeScale('week', 7, lambda: mdates.WeekdayLocator(byweekday=mdates.MO), _fmt('%m-%d'), 'month'),
+    TimeScale('2week', 14, lambda: mdates.WeekdayLocator(byweekday=mdates.MO, interval=2), _fmt('%m-%d'), 'month'),
+    TimeScale('month', 30.44, lambda: mdates.MonthLocator(), _fmt('%m'), 'year'),
+    TimeScale('quarter', 91.31, lambda: mdates.MonthLocator(bymonth=[1, 4, 7, 10]), _quarter_formatter, 'year'),
+    TimeScale('halfyear', 182.6, lambda: mdates.MonthLocator(bymonth=[1, 7]), _fmt('%m'), 'year'),
+    TimeScale('year', 365.25, lambda: mdates.YearLocator(), _fmt('%Y')),
+]
+
+# 第二层表头使用的尺度
+UPPER_SCALES = {
+    'month': TimeScale('month', 30.44, lambda: mdates.MonthLocator(), _fmt('%Y-%m')),
+    'year': TimeScale('year', 365.25, lambda: mdates.YearLocator(), _fmt('%Y')),
+}
+
+
+def choose_scale(span_days: float, width_px: float,
+                 min_tick_px: float = DEFAULT_MIN_TICK_PX) -> Tuple[TimeScale, int]:
+    """
+    根据时间跨度和像素宽度选择刻度尺度
+
+    参数:
+        span_days (float): 可见时间跨度（天）
+        width_px (float): 坐标轴宽度（像素）
+        min_tick_px (float): 每个刻度至少占用的像素
+
+    返回:
+        Tuple[TimeScale, int]: 选中的尺度，以及预计的最大刻度数
+    """
+    max_ticks = max(2, int(width_px // min_tick_px))
+    for scale in SCALES:
+        if span_days / scale.spacing_days <= max_ticks:
+            return scale, max_ticks
+
+    # 超长跨度：按年，并放大年间隔使刻度数不超过上限
+    base = math.ceil(span_days / 365.25 / max_ticks)
+    return TimeScale(f'{base}year', 365.25 * base,
+                     lambda: mdates.YearLocator(base=base), _fmt('%Y')), max_ticks
+
+
+class AdaptiveTimeAxis:
+    """根据坐标轴可见范围自动调整刻度的时间轴"""
+
+    def __init__(self, ax, min_tick_px: float = DEFAULT_MIN_TICK_PX, two_tier: bool = True):
+        """
+        初始化自适应时间轴，并在x轴范围变化（缩放、平移）时自动更新
+
+        参数:
+            ax: matplotlib坐标轴，x轴为日期
+            min_tick_px (float): 每个刻度至少占用的像素
+            two_tier (bool): 是否绘制第二层表头
+        """
+        self.ax = ax
+        self.min_tick_px = min_tick_px
+        self.scale: Optional[TimeScale] = None
+        self.upper_axis = ax.secondary_xaxis('top') if two_tier else None
+        self.update()
+        ax.callbacks.connect('xlim_changed', lambda _ax: self.update())
+
+    def _width_px(self) -> float:
+        """坐标轴在画布上的像素宽度"""
+        return self.ax.get_window_extent().width
+
+    def update(self) -> TimeScale:
+        """
+        按当前可见范围重新选择刻度
+
+        返回:
+            TimeScale: 选中的尺度
+        """
+        x_min, x_max = self.ax.get_xlim()
+        scale, _ = choose_scale(abs(x_max - x_min), self._width_px(), self.min_tick_px)
+        if self.scale is not None and scale.name == self.scale.name:
+            return scale
+        self.scale = scale
+
+        self.ax.xaxis.set_major_locator(scale.locator())
+        self.ax.xaxis.set_major_formatter(scale.formatter())
+        self.ax.xaxis.set_minor_locator(mticker.NullLocator())
+
+        if self.upper_axis is not None:
+            upper = UPPER_SCALES.get(scale.upper)
+            if upper is None:
+                self.upper_axis.xaxis.set_major_locator(mticker.NullLocator())
+            else:
+                self.upper_axis.xaxis.set_major_locator(upper.locator())
+                self.upper_axis.xaxis.set_major_formatter(upper.formatter())
+        return scale
+
+
+def apply_time_axis(ax, min_tick_px: float = DEFAULT_MIN_TICK_PX, two_tier: bool = True) -> AdaptiveTimeAxis:
+    """
+    为坐标轴安装自适应时间轴
+
+    参数:
+        ax: matplotlib坐标轴，需已设置好x轴日期范围
+        min_tick_px (float): 每个刻度至少占用的像素
+        two_tier (bool): 是否绘制第二层表头
+
+    返回:
+        AdaptiveTimeAxis: 时间轴对象
+    """
+    return AdaptiveTimeAxis(ax, min_tick_px, two_tier)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+工作日历
+
+基于NumPy的工作日函数（busday_count/busday_offset）批量计算工作日时长、
+按工作日平移日期，以及查找需要在图上标出的非工作时段。
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+import matplotlib.dates as mdates
+import matplotlib.transforms as mtransforms
+
+from gantt_app.core.columns import datetime_column
+
+
+def _to_days(dates) -> np.ndarray:
+    """将日期序列转换为datetime64[D]数组"""
+    dates = np.asarray(dates)
+    if dates.dtype == object:
+        dates = datetime_column(list(dates))
+    return dates.astype('datetime64[D]')
+
+
+class WorkCalendar:
+    """工作日历，由每周工作日掩码和节假日列表定义"""
+
+    def __init__(self,
+                 weekmask: str = '1111100',
+                 holidays: Optional[Iterable] = None,
+                 name: str = '默认日历'):
+        """
+        初始化工作日历
+
+        参数:
+            weekmask (str): 周一到周日是否为工作日，例如 '1111100' 或 'Mon Tue Wed Thu Fri'
+            holidays (Iterable): 节假日日期
+            name (str): 日历名称
+        """
+        holidays = _to_days(list(holidays)) if holidays is not None else np.array([], dtype='datetime64[D]')
+        self.name = name
+        self.busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=holidays)
+
+    @property
+    def weekmask(self) -> np.ndarray:
+        """每周工作日掩码"""
+        return self.busdaycal.weekmask
+
+    @property
+    def holidays(self) -> np.ndarray:
+        """节假日（已排序、去除周末）"""
+        return self.busdaycal.holidays
+
+    def is_working_day(self, dates) -> np.ndarray:
+        """
+        判断日期是否为工作日
+
+        参数:
+            dates: 日期序列
+
+        返回:
+            np.ndarray: 布尔数组
+        """
+        return np.is_busday(_to_days(dates), busdaycal=self.busdaycal)
+
+    def working_days(self, start, end) -> np.ndarray:
+        """
+        批量计算 [start, end) 区间内的工作日数
+
+        与 Task.duration 的区间约定一致：结束日期当天不计入。
+
+        参数:
+            start: 开始日期序列
+            end: 结束日期序列
+
+        返回:
+            np.ndarray: 工作日数数组
+        """
+        start, end = _to_days(start), _to_days(end)
+        return np.busday_count(start, end, busdaycal=self.busdaycal)
+
+    def add_working_days(self, dates, offsets) -> np.ndarray:
+        """
+        将日期按工作日平移
+
+        非工作日先顺延到下一个工作日再平移。
+
+        参数:
+            dates: 日期序列
+            offsets: 平移的工作日数，可为标量或与dates等长的数组
+
+        返回:
+            np.ndarray: datetime64[D]数组
+        """
+        dates = _to_days(dates)
+        offsets = np.broadcast_to(np.asarray(offsets, dtype=np.int64), dates.shape)
+        return np.busday_offset(dates, offsets, roll='forward', busdaycal=self.busdaycal)
+
+    def non_working_spans(self, start, end) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        查找区间内连续的非工作时段
+
+        参数:
+            start: 区间开始日期
+            end: 区间结束日期（不含）
+
+        返回:
+            Tuple[np.ndarray, np.ndarray]: 各时段的开始日期与结束日期（不含）
+        """
+        days = np.arange(_to_days([start])[0], _to_days([end])[0], dtype='datetime64[D]')
+        off = ~np.is_busday(days, busdaycal=self.busdaycal)
+        # 通过前后差分找出每段连续非工作日的边界
+        edges = np.diff(np.concatenate([[False], off, [False]]).astype(np.int8))
+        begins = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return days[begins], days[begins] + (ends - begins)
+
+
+class CalendarSet:
+    """按负责人分配工作日历"""
+
+    def __init__(self, default: Optional[WorkCalendar] = None):
+        """
+        初始化日历集合
+
+        参数:
+            default (WorkCalendar): 未单独指定日历的负责人使用的日历
+        """
+        self.default = default or WorkCalendar()
+        self.by_assignee: Dict[str, WorkCalendar] = {}
+
+    def assign(self, assignee: str, calendar: WorkCalendar) -> None:
+        """
+        为负责人指定日历
+
+        参数:
+            assignee (str): 负责人
+            calendar (WorkCalendar): 工作日历
+        """
+        self.by_assignee[assignee] = calendar
+
+    def calendar_for(self, assignee: str) -> WorkCalendar:
+        """获取负责人使用的日历"""
+        return self.by_assignee.get(assignee, self.default)
+
+    def _groups(self, tasks):
+        """按日历对任务分组，返回 (日历, 行号数组) 列表"""
+        rows_by_calendar: Dict[int, Tuple[WorkCalendar, list]] = {}
+        for row, task in enumerate(tasks):
+            calendar = self.calendar_for(task.assignTo)
+            rows_by_calendar.setdefault(id(calendar), (calendar, []))[1].append(row)
+        return [(calendar, np.array(rows)) for calendar, rows in rows_by_calendar.values()]
+
+    def working_durations(self, tasks) -> np.ndarray:
+        """
+        计算所有任务的工作日时长，每个日历一次批量调用
+
+        参数:
+            tasks (Sequence[Task]): 任务序列
+
+        返回:
+            np.ndarray: 与任务顺序对应的工作日数
+        """
+        start = _to_days(datetime_column([task.start_date for task in tasks]))
+        end = _to_days(datetime_column([task.end_date for task in tasks]))
+        result = np.zeros(len(tasks), dtype=np.int64)
+        for calendar, rows in self._groups(tasks):
+            result[rows] = calendar.working_days(start[rows], end[rows])
+        return result
+
+    def shift_tasks(self, tasks, offsets) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算任务按工作日平移后的开始与结束日期，保持各自的工作日时长
+
+        参数:
+            tasks (Sequence[Task]): 任务序列
+            offsets: 平移的工作日数，标量或与任务等长的数组
+
+        返回:
+            Tuple[np.ndarray, np.ndarray]: 新的开始日期与结束日期（datetime64[D]）
+        """
+        start = _to_days(datetime_column([task.start_date for task in tasks]))
+        end = _to_days(datetime_column([task.end_date for task in tasks]))
+        offsets = np.broadcast_to(np.asarray(offsets, dtype=np.int64), start.shape)
+        new_start = np.empty_like(start)
+        new_end = np.empty_like(end)
+        for calendar, rows in self._groups(tasks):
+            length = calendar.working_days(start[rows], end[rows])
+            new_start[rows] = calendar.add_working_days(start[rows], offsets[rows])
+            new_end[rows] = calendar.add_working_days(new_start[rows], length)
+        return new_start, new_end
+
+
+def shade_non_working(ax, calendar: WorkCalendar, start, end,
+                      color: str = '#d9d9d9', alpha: float = 0.4) -> Optional[PolyCollection]:
+    """
+    用一个PolyCollection在坐标轴上标出非工作时段
+
+    参数:
+        ax: matplotlib坐标轴
+        calendar (WorkCalendar): 工作日历
+        start: 区间开始日期
+        end: 区间结束日期
+        color (str): 填充颜色
+        alpha (float): 透明度
+
+    返回:
+        Optional[PolyCollection]: 添加的集合，区间内没有非工作日时返回None
+    """
+    begins, ends = calendar.non_working_spans(start, end)
+    if len(begins) == 0:
+        return None
+
+    x0 = mdates.date2num(begins)
+    x1 = mdates.date2num(ends)
+    zeros, ones = np.zeros_like(x0), np.ones_like(x0)
+    verts = np.stack([np.column_stack([x0, zeros]), np.column_stack([x0, ones]),
+                      np.column_stack([x1, ones]), np.column_stack([x1, zeros])], axis=1)
+    # x使用数据坐标，y覆盖整个坐标轴高度
+    transform = mtransforms.blended_transform_factory(ax.transData, ax.transAxes)
+    collection = PolyCollection(verts, facecolors=color, edgecolors='none',
+                                alpha=alpha, zorder=0, transform=transform)
+    ax.add_collection(collection, autolim=False)
+    return collection
@@ -0,0 +1,652 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+本地HTTP渲染服务 (gantt-serve)
+
+接收任务数据（CSV/JSON）或项目文件路径，返回PNG/SVG甘特图。
+渲染在预热过的工作进程中完成：进程启动时已导入matplotlib、加载字体并完成一次渲染，
+请求不再承担这些启动开销。相同输入的结果被缓存，同时到达的相同请求只渲染一次。
+本模块不导入Qt，使用Agg后端。
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from gantt_app.core.chart_improved import GanttChart
+from gantt_app.core.figure_pool import default_pool
+from gantt_app.core.progressive import tight_bbox
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 128
+MAX_BODY_BYTES = 50 * 1024 * 1024
+# 单张图片的最大像素数（宽×高），RGBA缓冲约 4 字节/像素，即约200MB
+MAX_PIXELS = 50_000_000
+
+MEDIA_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+# 工作进程预热用的示例任务
+SAMPLE_CSV = (
+    "AssignTo,ArtifactID,Description,Start,End,Progress,Dependencies\n"
+    "张三,T-1,需求分析,2025-05-01,2025-05-05,100,\n"
+    "李四,T-2,系统设计,2025-05-06,2025-05-12,50,T-1\n"
+    "王五,T-3,开发实现,2025-05-13,2025-05-30,0,T-2\n"
+)
+
+
+def chart_from_request(kind: str, data: Any, title: Optional[str] = None) -> GanttChart:
+    """
+    由请求数据创建甘特图
+
+    参数:
+        kind (str): 'csv'（data为CSV字节）、'json'（data为JSON字节）或 'path'（data为CSV/Excel文件路径）
+        data: 请求数据
+        title (str): 图表标题
+
+    返回:
+        GanttChart: 甘特图
+
+    异常:
+        ValueError: 如果数据格式不正确或没有任务
+    """
+    chart = GanttChart()
+    if kind == 'csv':
+        chart.load_from_csv(io.BytesIO(data))
+    elif kind == 'json':
+        payload = json.loads(data)
+        records = payload.get('tasks', []) if isinstance(payload, dict) else payload
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise ValueError("JSON应为任务对象的列表，或包含 tasks 列表的对象")
+        rows = [{key: ','.join(map(str, value)) if isinstance(value, list) else value
+                 for key, value in record.items()} for record in records]
+        chart.load_from_dataframe(pd.DataFrame.from_records(rows))
+        if isinstance(payload, dict) and title is None:
+            title = payload.get('title')
+    elif kind == 'path':
+        if data.lower().endswith('.csv'):
+            chart.load_from_csv(data)
+        else:
+            chart.load_from_excel(data)
+        if title is None:
+            title = os.path.splitext(os.path.basename(data))[0]
+    else:
+        raise ValueError(f"不支持的数据类型: {kind}")
+    if not chart.tasks:
+        raise ValueError("没有任务可以渲染")
+    if title:
+        chart.set_title(title)
+    return chart
+
+
+def render_request(kind: str, data: Any, options: Dict[str, Any]) -> bytes:
+    """
+    渲染一个请求，在工作进程中执行
+
+    参数:
+        kind (str): 数据类型，见 chart_from_request
+        data: 请求数据
+        options (Dict[str, Any]): format、dpi、figsize、title
+
+    返回:
+        bytes: 图片内容
+    """
+    chart = chart_from_request(kind, data, options.get('title'))
+    buffer = io.BytesIO()
+    with default_pool.figure(tuple(options['figsize'])) as fig:
+        chart.draw(fig)
+        fig.savefig(buffer, format=options['format'], dpi=options['dpi'], bbox_inches=tight_bbox(fig))
+    return buffer.getvalue()
+
+
+def _warm_worker() -> None:
+    """工作进程初始化：完成一次PNG和SVG渲染，加载字体与渲染缓存"""
+    for fmt in MEDIA_TYPES:
+        render_request('csv', SAMPLE_CSV.encode('utf-8'), {'format': fmt, 'dpi': 50, 'figsize': (6, 4)})
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+class RenderError(Exception):
+    """请求无法处理，附带HTTP状态码"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class RenderService:
+    """预热的渲染工作池，带结果缓存与相同请求合并"""
+
+    def __init__(self,
+                 workers: int = 2,
+                 cache_size: int = DEFAULT_CACHE_SIZE,
+                 root: Optional[str] = None,
+                 use_processes: bool = True):
+        """
+        初始化渲染服务
+
+        参数:
+            workers (int): 渲染工作进程（或线程）数
+            cache_size (int): 最多缓存的图片数量，0表示不缓存
+            root (str): 允许按路径渲染的项目目录，为None时不接受路径请求
+            use_processes (bool): 使用进程池；为False时在本进程的线程中渲染
+        """
+        self.workers = max(1, workers)
+        self.cache_size = cache_size
+        self.root = os.path.realpath(root) if root else None
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._cache: 'OrderedDict[str, bytes]' = OrderedDict()
+        # 正在渲染的请求 -> 结果（在锁内登记，提交到工作池在锁外进行）
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # 启动、重建与关闭工作池时持有；预热耗时较长，不占用缓存锁
+        self._start_lock = threading.Lock()
+        self.counters = {'requests': 0, 'hits': 0, 'coalesced': 0, 'rendered': 0, 'errors': 0}
+
+    def start(self) -> 'RenderService':
+        """
+        启动工作池，并等待每个工作进程完成预热；已启动时直接返回
+
+        多个线程同时调用时只会创建一个工作池。
+
+        返回:
+            RenderService: 自身
+        """
+        with self._start_lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+        return self
+
+    def _create_executor(self) -> Executor:
+        if self.use_processes:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+            # 提交与进程数相同的任务，确保所有进程都已启动并完成初始化
+            for future in [executor.submit(_pid) for _ in range(self.workers)]:
+                future.result()
+            return executor
+        _warm_worker()
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='gantt-render')
+
+    def _restart(self, broken: Executor) -> Executor:
+        """
+        工作进程异常退出后工作池不再接受任务，用新的工作池替换它
+
+        参数:
+            broken (Executor): 已损坏的工作池；已被其他线程替换时不再重建
+
+        返回:
+            Executor: 当前的工作池
+        """
+        with self._start_lock:
+            if self._executor is broken:
+                print("渲染工作池已损坏，正在重建", file=sys.stderr)
+                broken.shutdown(wait=False)
+                self._executor = self._create_executor()
+            elif self._executor is None:
+                self._executor = self._create_executor()
+            return self._executor
+
+    def close(self) -> None:
+        """关闭工作池"""
+        with self._start_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'RenderService':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def resolve_path(self, path: str) -> str:
+        """
+        把请求中的相对路径解析为项目目录下的文件
+
+        异常:
+            RenderError: 未配置项目目录（403）、路径在项目目录之外（403）或文件不存在（404）
+        """
+        if self.root is None:
+            raise RenderError(403, "服务未配置项目目录，不接受路径请求")
+        resolved = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([resolved, self.root]) != self.root:
+            raise RenderError(403, f"路径不在项目目录内: {path}")
+        if not os.path.isfile(resolved):
+            raise RenderError(404, f"文件不存在: {path}")
+        return resolved
+
+    @staticmethod
+    def _key(kind: str, data: Any, options: Dict[str, Any]) -> str:
+        digest = hashlib.sha1(kind.encode('utf-8'))
+        if kind == 'path':
+            # 文件内容变化后修改时间或大小随之变化，缓存自然失效
+            stat = os.stat(data)
+            digest.update(f"{data}\x1f{stat.st_mtime_ns}\x1f{stat.st_size}".encode('utf-8'))
+        else:
+            digest.update(data)
+        digest.update(json.dumps(options, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()
+
+    def render(self, kind: str, data: Any, options: Dict[str, Any],
+               timeout: Optional[float] = None) -> Tuple[bytes, str]:
+        """
+        渲染请求；缓存中已有时直接返回，相同的请求正在渲染时等待其结果
+
+        参数:
+            kind (str): 'csv'、'json' 或 'path'（data为相对项目目录的路径）
+            data: 请求数据
+            options (Dict[str, Any]): format、dpi、figsize、title
+            timeout (float): 最长等待秒数
+
+        返回:
+            Tuple[bytes, str]: 图片内容，以及 'hit'、'coalesced' 或 'rendered'
+
+        异常:
+            RenderError: 如果路径无效（403/404），或渲染中工作进程异常退出（503，工作池已重建）
+            ValueError: 如果数据格式不正确
+        """
+        if self._executor is None:
+            self.start()
+        if kind == 'path':
+            data = self.resolve_path(data)
+        key = self._key(kind, data, options)
+        with self._lock:
+            self.counters['requests'] += 1
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                self.counters['hits'] += 1
+                return image, 'hit'
+            future = self._inflight.get(key)
+            if future is not None:
+                self.counters['coalesced'] += 1
+                outcome = 'coalesced'
+            else:
+                future = self._inflight[key] = Future()
+                self.counters['rendered'] += 1
+                outcome = 'rendered'
+        executor = None
+        if outcome == 'rendered':
+            # 已完成的任务会立即在当前线程执行回调，因此在锁外注册
+            future.add_done_callback(lambda done: self._finish(key, done))
+            executor = self._submit(future, kind, data, options)
+        try:
+            return future.result(timeout), outcome
+        except BrokenExecutor:
+            with self._lock:
+                self.counters['errors'] += 1
+            # 渲染中工作进程异常退出：由提交的请求重建工作池，之后的请求不受影响
+            if executor is not None:
+                self._restart(executor)
+            raise RenderError(503, "渲染进程异常退出，工作池已重建，请重试")
+        except Exception:
+            with self._lock:
+                self.counters['errors'] += 1
+            raise
+
+    def _submit(self, future: Future, kind: str, data: Any, options: Dict[str, Any]) -> Optional[Executor]:
+        """
+        把渲染任务提交到工作池，结果转交给已登记的 future；不持有缓存锁，重建工作池时不阻塞其他请求
+
+        返回:
+            Optional[Executor]: 实际提交到的工作池，提交失败时为None
+        """
+        executor = self._executor or self.start()._executor
+        try:
+            try:
+                work = executor.submit(render_request, kind, data, options)
+            except BrokenExecutor:
+                # 空闲时工作进程已退出（例如被系统终止），重建后提交到新的工作池
+                executor = self._restart(executor)
+                work = executor.submit(render_request, kind, data, options)
+        except Exception as e:
+            future.set_exception(e)
+            return None
+
+        def transfer(done: Future) -> None:
+            if done.cancelled():
+                future.cancel()
+            elif done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result())
+
+        work.add_done_callback(transfer)
+        return executor
+
+    def _finish(self, key: str, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if self.cache_size > 0 and not future.cancelled() and future.exception() is None:
+                self._cache[key] = future.result()
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """请求计数、缓存与工作池状态"""
+        with self._lock:
+            return dict(self.counters, cached=len(self._cache), inflight=len(self._inflight),
+                        workers=self.workers, processes=self.use_processes)
+
+
+def _float_pair(value: str) -> Tuple[float, float]:
+    width, height = (float(part) for part in value.split(','))
+    return width, height
+
+
+def parse_options(query: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    由查询参数得到渲染选项
+
+    参数:
+        query (Dict[str, List[str]]): parse_qs 的结果，支持 format、dpi、size（宽,高 英寸）、title
+
+    返回:
+        Dict[str, Any]: 渲染选项
+
+    异常:
+        RenderError: 如果参数无效（400）
+    """
+    fmt = query.get('format', ['png'])[0].lower()
+    if fmt not in MEDIA_TYPES:
+        raise RenderError(400, f"不支持的图片格式: {fmt}")
+    try:
+        dpi = float(query.get('dpi', ['100'])[0])
+        figsize = _float_pair(query.get('size', ['12,8'])[0])
+    except ValueError:
+        raise RenderError(400, "dpi 或 size 参数无效")
+    if not 10 <= dpi <= 600 or not all(0 < value <= 100 for value in figsize):
+        raise RenderError(400, "dpi 或 size 超出范围")
+    if figsize[0] * dpi * figsize[1] * dpi > MAX_PIXELS:
+        raise RenderError(400, f"图片过大：size × dpi 超过 {MAX_PIXELS} 像素")
+    options = {'format': fmt, 'dpi': dpi, 'figsize': figsize}
+    if 'title' in query:
+        options['title'] = query['title'][0]
+    return options
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """
+    请求处理
+
+    GET  /health                 服务状态（JSON）
+    GET  /render?path=...        渲染项目目录下的CSV/Excel文件
+    POST /render                 渲染请求体中的CSV（text/csv）或JSON（application/json）任务数据
+    """
+
+    server_version = 'gantt-serve/0.1'
+    service: RenderService = None
+
+    def log_message(self, format: str, *args) -> None:
+        if not getattr(self.server, 'quiet', False):
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Dict[str, Any]) -> None:
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8')
+
+    def _handle(self, kind: Optional[str], data: Any, query: Dict[str, List[str]]) -> None:
+        started = time.perf_counter()
+        try:
+            options = parse_options(query)
+            if kind is None:
+                raise RenderError(400, "缺少任务数据：请使用 POST 提交CSV/JSON，或 GET ?path=...")
+            image, outcome = self.service.render(kind, data, options)
+        except RenderError as e:
+            self._send_json(e.status, {'error': str(e)})
+            return
+        except (ValueError, FileNotFoundError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"{type(e).__name__}: {str(e)}"})
+            return
+        self._send(200, image, MEDIA_TYPES[options['format']],
+                   {'X-Render': outcome, 'X-Render-Time': f"{time.perf_counter() - started:.4f}"})
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/health':
+            self._send_json(200, self.service.stats())
+        elif url.path == '/render':
+            path = query.get('path', [None])[0]
+            self._handle('path' if path else None, path, query)
+        else:
+            self._send_json(404, {'error': f"未知的地址: {url.path}"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != '/render':
+            self._send_json(404, {'error': f"未知的地址: {url.path}"})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {'error': "请求体过大"})
+            return
+        body = self.rfile.read(length)
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type.endswith('json') or body.lstrip()[:1] in (b'{', b'['):
+            kind = 'json'
+        else:
+            kind = 'csv'
+        self._handle(kind if body else None, body, parse_qs(url.query))
+
+
+def make_server(service: RenderService,
+                host: str = DEFAULT_HOST,
+                port: int = DEFAULT_PORT,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    """
+    创建HTTP服务器，port为0时使用系统分配的空闲端口
+
+    参数:
+        service (RenderService): 渲染服务
+        host (str): 监听地址
+        port (int): 端口
+        quiet (bool): 不输出访问日志
+
+    返回:
+        ThreadingHTTPServer: 服务器，调用 serve_forever() 开始处理请求
+    """
+    handler = type('BoundRenderRequestHandler', (RenderRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server
+
+
+def run_benchmark(url: str,
+                  body: bytes,
+                  content_type: str = 'text/csv',
+                  requests: int = 100,
+                  concurrency: int = 4,
+                  distinct: bool = False) -> Dict[str, Any]:
+    """
+    对渲染服务发起并发请求，统计延迟与吞吐量
+
+    参数:
+        url (str): 渲染地址，例如 http://127.0.0.1:8765/render?format=png
+        body (bytes): 请求体
+        content_type (str): 请求体类型
+        requests (int): 请求总数
+        concurrency (int): 并发数
+        distinct (bool): 每个请求使用不同的标题，使缓存和请求合并都不生效
+
+    返回:
+        Dict[str, Any]: requests、concurrency、seconds、throughput（请求/秒）、
+            p50/p95/max（毫秒）、errors 以及各结果来源（X-Render）的次数
+    """
+    latencies: List[float] = []
+    outcomes: Dict[str, int] = {}
+    errors = 0
+    lock = threading.Lock()
+    counter = iter(range(requests))
+    separator = '&' if '?' in url else '?'
+
+    def worker():
+        nonlocal errors
+        for i in counter:
+            target = f"{url}{separator}title=bench-{i}" if distinct else url
+            request = urllib.request.Request(target, data=body, headers={'Content-Type': content_type})
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    outcome = response.headers.get('X-Render', '')
+            except (urllib.error.URLError, OSError):
+                with lock:
+                    errors += 1
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(max(1, concurrency))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(value: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(round(value / 100 * (len(latencies) - 1))))] * 1000
+
+    return {'requests': requests, 'concurrency': concurrency, 'seconds': seconds,
+            'throughput': len(latencies) / seconds if seconds else 0.0,
+            'p50': percentile(50), 'p95': percentile(95), 'max': percentile(100),
+            'errors': errors, 'outcomes': outcomes}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog='gantt-serve',
+        description="本地HTTP甘特图渲染服务：POST CSV/JSON 或 GET ?path= 返回PNG/SVG")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"监听地址（默认{DEFAULT_HOST}）")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"端口（默认{DEFAULT_PORT}）")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="渲染工作进程数（默认CPU核数）")
+    parser.add_argument('--threads', action='store_true', help="在服务进程的线程中渲染，不启动工作进程")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"缓存的图片数量（默认{DEFAULT_CACHE_SIZE}，0表示不缓存）")
+    parser.add_argument('--root', default=None, help="允许 GET ?path= 渲染的项目目录")
+    parser.add_argument('--quiet', action='store_true', help="不输出访问日志")
+    parser.add_argument('--benchmark', type=int, default=0, metavar='N',
+                        help="在本机空闲端口启动服务，发送N个请求测量延迟与吞吐量后退出")
+    parser.add_argument('--concurrency', type=int, default=4, help="基准测试的并发数（默认4）")
+    parser.add_argument('--input', default=None, help="基准测试使用的CSV文件（默认使用内置示例）")
+    return parser
+
+
+def _print_benchmark(label: str, result: Dict[str, Any]) -> None:
+    print(f"{label}: {result['requests']} 个请求，并发 {result['concurrency']}，"
+          f"耗时 {result['seconds']:.2f}s，吞吐 {result['throughput']:.1f} 请求/秒，"
+          f"P50 {result['p50']:.1f}ms，P95 {result['p95']:.1f}ms，最大 {result['max']:.1f}ms，"
+          f"失败 {result['errors']}，来源 {result['outcomes']}")
+
+
+def benchmark(service: RenderService, body: bytes, requests: int, concurrency: int) -> None:
+    """
+    在本机空闲端口启动服务，分别测量每次都渲染与命中缓存两种情况
+
+    参数:
+        service (RenderService): 渲染服务
+        body (bytes): CSV请求体
+        requests (int): 每种情况的请求数
+        concurrency (int): 并发数
+    """
+    server = make_server(service, '127.0.0.1', 0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/render?format=png"
+        _print_benchmark("渲染", run_benchmark(url, body, requests=requests, concurrency=concurrency,
+                                             distinct=True))
+        _print_benchmark("缓存", run_benchmark(url, body, requests=requests, concurrency=concurrency))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行主函数
+
+    参数:
+        argv (List[str]): 命令行参数，默认使用sys.argv
+
+    返回:
+        int: 退出码
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers 必须大于0")
+
+    service = RenderService(args.workers, args.cache_size, args.root, use_processes=not args.threads)
+    started = time.perf_counter()
+    service.start()
+    print(f"已预热 {service.workers} 个渲染{'线程' if args.threads else '进程'} "
+          f"({time.perf_counter() - started:.2f}s)")
+    try:
+        if args.benchmark:
+            if args.input:
+                with open(args.input, 'rb') as f:
+                    body = f.read()
+            else:
+                body = SAMPLE_CSV.encode('utf-8')
+            benchmark(service, body, args.benchmark, args.concurrency)
+            return 0
+        server = make_server(service, args.host, args.port, quiet=args.quiet)
+        print(f"渲染服务已启动: http://{args.host}:{server.server_address[1]}/render")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+基于QGraphicsScene的原生甘特图视图
+
+只为视口内可见的行和时间范围创建图元，滚动时回收复用；
+行高与左侧任务表保持一致，拖动任务条可直接修改对应任务的日期。
+"""
+
+import datetime
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QRectF, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor, QPainter, QPen
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsRectItem, QGraphicsScene, QGraphicsView
+
+
+PROGRESS_COLOR = '#50C878'
+
+
+class TaskTableModel(QAbstractTableModel):
+    """任务表数据模型，行顺序与甘特图任务顺序一致"""
+
+    HEADERS = ['负责人', '任务ID', '描述', '开始', '结束', '进度']
+
+    def __init__(self, chart, parent=None):
+        """
+        初始化任务表模型
+
+        参数:
+            chart (GanttChart): 甘特图对象
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.chart = chart
+
+    def set_chart(self, chart) -> None:
+        """更换甘特图并刷新整个表格"""
+        self.beginResetModel()
+        self.chart = chart
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.chart.tasks)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        task = self.chart.tasks[index.row()]
+        values = (task.assignTo, task.artfId, task.description,
+                  task.start_date.strftime('%Y-%m-%d'), task.end_date.strftime('%Y-%m-%d'),
+                  f"{task.progress:g}%")
+        return str(values[index.column()])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def refresh_row(self, row: int) -> None:
+        """通知视图某一行的数据已变化"""
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+
+class TaskBarItem(QGraphicsRectItem):
+    """可水平拖动的任务条图元，进度条作为子图元绘制"""
+
+    def __init__(self, view: 'GanttView'):
+        super().__init__()
+        self.view = view
+        self.row = -1
+        self.setFlag(QGraphicsItem.ItemIsMovable, True)
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+        self.setPen(QPen(Qt.black, 0))
+        self.progress_item = QGraphicsRectItem(self)
+        self.progress_item.setPen(QPen(Qt.NoPen))
+        self.progress_item.setBrush(QBrush(QColor(PROGRESS_COLOR)))
+        self.progress_item.setOpacity(0.6)
+
+    def bind(self, row: int, task) -> None:
+        """
+        将图元绑定到某一行的任务并更新几何
+
+        参数:
+            row (int): 任务行号
+            task (Task): 任务对象
+        """
+        view = self.view
+        x = view.date_to_x(task.start_date)
+        width = max(view.date_to_x(task.end_date) - x, 2.0)
+        height = view.row_height * view.bar_ratio
+        # 图元位置即左上角，矩形使用本地坐标，拖动时只需改变位置；
+        # 定位期间解除只能水平移动的限制
+        self.row = -1
+        self.setPos(x, row * view.row_height + (view.row_height - height) / 2)
+        self.row = row
+        self.setRect(0, 0, width, height)
+        self.progress_item.setRect(0, 0, width * min(max(task.progress, 0), 100) / 100, height)
+        self.setBrush(QBrush(QColor(task.color)))
+        self.setToolTip(f"{task.assignTo}-{task.artfId}: {task.description}")
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemPositionChange and self.row >= 0:
+            # 只允许水平拖动
+            return type(value)(value.x(), self.pos().y())
+        return super().itemChange(change, value)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self.row >= 0:
+            self.view.finish_drag(self)
+
+
+class GanttView(QGraphicsView):
+    """虚拟化的甘特图视图"""
+
+    # 拖动调整后发出，参数为任务行号
+    taskMoved = pyqtSignal(int)
+
+    def __init__(self, chart, row_height: int = 24, pixels_per_day: float = 16.0, parent=None):
+        """
+        初始化甘特图视图
+
+        参数:
+            chart (GanttChart): 甘特图对象
+            row_height (int): 行高（像素），应与任务表行高一致
+            pixels_per_day (float): 每天的像素宽度
+            parent: 父控件
+        """
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.setRenderHint(QPainter.Antialiasing, False)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+
+        self.row_height = row_height
+        self.bar_ratio = 0.7
+        self.pixels_per_day = pixels_per_day
+        self.origin = datetime.datetime.now()
+        self.chart = chart
+        # 设置后拖动通过命令历史修改任务，以便撤销
+        self.history = None
+        self._active: Dict[int, TaskBarItem] = {}
+        self._pool: List[TaskBarItem] = []
+
+        self.horizontalScrollBar().valueChanged.connect(self.update_visible_items)
+        self.verticalScrollBar().valueChanged.connect(self.update_visible_items)
+        self.set_chart(chart)
+
+    # 坐标换算
+
+    def date_to_x(self, date: datetime.datetime) -> float:
+        """日期转换为场景x坐标"""
+        return (date - self.origin).total_seconds() / 86400.0 * self.pixels_per_day
+
+    def x_to_days(self, dx: float) -> float:
+        """场景x方向距离转换为天数"""
+        return dx / self.pixels_per_day
+
+    # 数据与缩放
+
+    def set_chart(self, chart) -> None:
+        """
+        显示新的甘特图，只计算一次时间范围，图元按需创建
+
+        参数:
+            chart (GanttChart): 甘特图对象
+        """
+        self.chart = chart
+        for item in list(self._active.values()):
+            self._release(item)
+        self._active.clear()
+
+        if chart.tasks:
+            start = min(task.start_date for task in chart.tasks)
+            end = max(task.end_date for task in chart.tasks)
+        else:
+            start = end = datetime.datetime.now()
+        # 左右各留出一周，便于拖动
+        self.origin = datetime.datetime.combine(start.date(), datetime.time()) - datetime.timedelta(days=7)
+        self._end = end + datetime.timedelta(days=7)
+        self._update_scene_rect()
+        self.update_visible_items()
+
+    def set_row_height(self, row_height: int) -> None:
+        """设置行高以匹配任务表"""
+        if row_height != self.row_height:
+            self.row_height = row_height
+            self.refresh()
+
+    def set_pixels_per_day(self, pixels_per_day: float) -> None:
+        """
+        设置水平缩放
+
+        参数:
+            pixels_per_day (float): 每天的像素宽度
+        """
+        self.pixels_per_day = max(0.05, min(pixels_per_day, 400.0))
+        self.refresh()
+
+    def zoom(self, factor: float) -> None:
+        """按比例缩放时间轴"""
+        self.set_pixels_per_day(self.pixels_per_day * factor)
+
+    def fit_width(self) -> None:
+        """缩放使整个时间范围适应视口宽度"""
+        days = max((self._end - self.origin).total_seconds() / 86400.0, 1.0)
+        self.set_pixels_per_day(self.viewport().width() / days)
+
+    def refresh(self) -> None:
+        """几何参数变化后重新定位所有可见图元"""
+        self._update_scene_rect()
+        for row, item in self._active.items():
+            item.bind(row, self.chart.tasks[row])
+        self.update_visible_items()
+
+    def _update_scene_rect(self) -> None:
+        self.scene().setSceneRect(QRectF(0, 0, max(self.date_to_x(self._end), 1.0),
+                                         max(len(self.chart.tasks) * self.row_height, 1)))
+
+    # 虚拟化
+
+    def _acquire(self) -> TaskBarItem:
+        """从回收池取出图元，池为空时新建"""
+        if self._pool:
+            item = self._pool.pop()
+            item.show()
+            return item
+        item = TaskBarItem(self)
+        self.scene().addItem(item)
+        return item
+
+    def _release(self, item: TaskBarItem) -> None:
+        """隐藏图元并放回回收池"""
+        item.hide()
+        item.row = -1
+        self._pool.append(item)
+
+    def visible_rows(self) -> range:
+        """当前视口覆盖的任务行范围"""
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        first = max(int(rect.top() // self.row_height), 0)
+        last = min(int(rect.bottom() // self.row_height) + 1, len(self.chart.tasks))
+        return range(first, last)
+
+    def update_visible_items(self, *args) -> None:
+        """为可见行和时间范围内的任务创建图元，回收其余图元"""
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        left = self.origin + datetime.timedelta(days=self.x_to_days(rect.left()))
+        right = self.origin + datetime.timedelta(days=self.x_to_days(rect.right()))
+
+        wanted = set()
+        for row in self.visible_rows():
+            task = self.chart.tasks[row]
+            if task.end_date >= left and task.start_date <= right:
+                wanted.add(row)
+
+        for row in [row for row in self._active if row not in wanted]:
+            item = self._active.pop(row)
+            if self.scene().mouseGrabberItem() is item:
+                # 正在拖动的图元保留
+                self._active[row] = item
+                continue
+            self._release(item)
+        for row in wanted:
+            if row not in self._active:
+                item = self._acquire()
+                item.bind(row, self.chart.tasks[row])
+                self._active[row] = item
+
+    def item_count(self) -> int:
+        """当前可见的图元数量"""
+        return len(self._active)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_visible_items()
+
+    # 编辑
+
+    def finish_drag(self, item: TaskBarItem) -> None:
+        """
+        拖动结束后按整天取整，更新对应任务的日期并只重绘该图元
+
+        设置了命令历史时，同一任务的连续拖动合并为一条可撤销的命令。
+
+        参数:
+            item (TaskBarItem): 被拖动的图元
+        """
+        task = self.chart.tasks[item.row]
+        days = round(self.x_to_days(item.pos().x() - self.date_to_x(task.start_date)))
+        if days:
+            delta = datetime.timedelta(days=days)
+            if self.history is not None:
+                self.history.edit_task(item.row, merge_key='drag',
+                                       start_date=task.start_date + delta, end_date=task.end_date + delta)
+            else:
+                self.chart.update_task(item.row, start_date=task.start_date + delta,
+                                       end_date=task.end_date + delta)
+        item.bind(item.row, task)
+        if days:
+            self.taskMoved.emit(item.row)
+
+    def update_row(self, row: int) -> None:
+        """
+        任务数据在外部被修改后，只更新该行的图元
+
+        参数:
+            row (int): 任务行号
+        """
+        item = self._active.get(row)
+        if item is not None:
+            item.bind(row, self.chart.tasks[row])
+
+    # 背景网格
+
+    def drawBackground(self, painter: QPainter, rect: QRectF) -> None:
+        """只在暴露区域内绘制行分隔线和每周竖线"""
+        painter.fillRect(rect, Qt.white)
+        painter.setPen(QPen(QColor('#e6e6e6'), 0))
+
+        first = max(int(rect.top() // self.row_height), 0)
+        last = int(rect.bottom() // self.row_height) + 1
+        for row in range(first, last + 1):
+            y = row * self.row_height
+            painter.drawLine(int(rect.left()), y, int(rect.right()) + 1, y)
+
+        # 每周一的竖线，缩放过小时改为每四周一条
+        step = 7 if self.pixels_per_day * 7 >= 8 else 28
+        monday = self.origin - datetime.timedelta(days=self.origin.weekday())
+        day = int(self.x_to_days(rect.left()) // step) * step
+        while True:
+            x = self.date_to_x(monday + datetime.timedelta(days=day))
+            if x > rect.right():
+                break
+            painter.drawLine(int(x), int(rect.top()), int(x), int(rect.bottom()) + 1)
+            day += step
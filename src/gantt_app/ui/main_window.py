@@ -1,17 +1,23 @@
- #!/usr/bin/env python
+#!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
 """
 甘特图应用程序主窗口
 """
 
+import datetime
+
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QTableView, QMenuBar, QAction
+    QPushButton, QLabel, QTableView, QMenuBar, QAction,
+    QAbstractItemView, QFileDialog, QMessageBox
 )
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeySequence
 
-from gantt_app.core.chart import GanttChart
+from gantt_app.core.chart_improved import GanttChart, Task
+from gantt_app.core.commands import CommandHistory
+from gantt_app.ui.gantt_view import GanttView, TaskTableModel
 
 
 class MainWindow(QMainWindow):
@@ -22,6 +28,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("甘特图生成器")
         self.resize(900, 600)
         self.chart = GanttChart()
+        self.history = CommandHistory(self.chart)
         self.init_ui()
         
     def init_ui(self):
@@ -51,15 +58,22 @@ class MainWindow(QMainWindow):
         task_panel = QWidget()
         task_layout = QVBoxLayout(task_panel)
         task_layout.addWidget(QLabel("项目任务"))
-        task_table = QTableView()
-        task_layout.addWidget(task_table)
+        self.task_model = TaskTableModel(self.chart, self)
+        self.task_table = QTableView()
+        self.task_table.setModel(self.task_model)
+        self.task_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # 按像素滚动，使任务表与甘特图的滚动位置一一对应
+        self.task_table.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        task_layout.addWidget(self.task_table)
         
         # 右侧图表区域
         chart_panel = QWidget()
         chart_layout = QVBoxLayout(chart_panel)
         chart_layout.addWidget(QLabel("甘特图"))
-        chart_view = QWidget()
-        chart_layout.addWidget(chart_view)
+        row_height = self.task_table.verticalHeader().defaultSectionSize()
+        self.chart_view = GanttView(self.chart, row_height=row_height)
+        self.chart_view.history = self.history
+        chart_layout.addWidget(self.chart_view)
         
         # 设置内容比例
         content_layout.addWidget(task_panel, 1)
@@ -77,6 +91,14 @@ class MainWindow(QMainWindow):
         save_btn.clicked.connect(self.on_save_project)
         export_btn.clicked.connect(self.on_export_chart)
         
+        # 任务表与甘特图的行位置同步
+        self.task_table.verticalScrollBar().valueChanged.connect(
+            self.chart_view.verticalScrollBar().setValue)
+        self.chart_view.verticalScrollBar().valueChanged.connect(
+            self.task_table.verticalScrollBar().setValue)
+        self.chart_view.taskMoved.connect(self.task_model.refresh_row)
+        self.chart_view.taskMoved.connect(lambda row: self._update_edit_actions())
+        
     def _create_menu_bar(self):
         """创建菜单栏"""
         menu_bar = self.menuBar()
@@ -84,7 +106,9 @@ class MainWindow(QMainWindow):
         # 文件菜单
         file_menu = menu_bar.addMenu("文件")
         file_menu.addAction(QAction("新建", self))
-        file_menu.addAction(QAction("打开", self))
+        open_action = QAction("打开", self)
+        open_action.triggered.connect(self.on_open_project)
+        file_menu.addAction(open_action)
         file_menu.addAction(QAction("保存", self))
         file_menu.addSeparator()
         file_menu.addAction(QAction("导出", self))
@@ -93,21 +117,107 @@ class MainWindow(QMainWindow):
         
         # 编辑菜单
         edit_menu = menu_bar.addMenu("编辑")
-        edit_menu.addAction(QAction("添加任务", self))
-        edit_menu.addAction(QAction("删除任务", self))
+        self.undo_action = QAction("撤销", self)
+        self.undo_action.setShortcut(QKeySequence.Undo)
+        self.undo_action.triggered.connect(self.on_undo)
+        self.redo_action = QAction("重做", self)
+        self.redo_action.setShortcut(QKeySequence.Redo)
+        self.redo_action.triggered.connect(self.on_redo)
+        edit_menu.addAction(self.undo_action)
+        edit_menu.addAction(self.redo_action)
+        edit_menu.addSeparator()
+        add_action = QAction("添加任务", self)
+        add_action.triggered.connect(self.on_add_task)
+        delete_action = QAction("删除任务", self)
+        delete_action.setShortcut(QKeySequence.Delete)
+        delete_action.triggered.connect(self.on_delete_tasks)
+        edit_menu.addAction(add_action)
+        edit_menu.addAction(delete_action)
         edit_menu.addAction(QAction("编辑任务", self))
+        self._update_edit_actions()
         
         # 视图菜单
         view_menu = menu_bar.addMenu("视图")
-        view_menu.addAction(QAction("缩放适应", self))
-        view_menu.addAction(QAction("放大", self))
-        view_menu.addAction(QAction("缩小", self))
+        fit_action = QAction("缩放适应", self)
+        fit_action.triggered.connect(self.chart_view.fit_width)
+        zoom_in_action = QAction("放大", self)
+        zoom_in_action.triggered.connect(lambda: self.chart_view.zoom(1.25))
+        zoom_out_action = QAction("缩小", self)
+        zoom_out_action.triggered.connect(lambda: self.chart_view.zoom(0.8))
+        view_menu.addAction(fit_action)
+        view_menu.addAction(zoom_in_action)
+        view_menu.addAction(zoom_out_action)
         
         # 帮助菜单
         help_menu = menu_bar.addMenu("帮助")
         help_menu.addAction(QAction("使用帮助", self))
         help_menu.addAction(QAction("关于", self))
     
+    def set_chart(self, chart):
+        """显示新的甘特图，并开始新的编辑历史"""
+        self.chart = chart
+        self.history = CommandHistory(chart)
+        self.chart_view.history = self.history
+        self.task_model.set_chart(chart)
+        self.chart_view.set_chart(chart)
+        self._update_edit_actions()
+    
+    def _update_edit_actions(self):
+        """根据历史状态启用或禁用撤销、重做"""
+        self.undo_action.setEnabled(self.history.can_undo())
+        self.redo_action.setEnabled(self.history.can_redo())
+    
+    def _refresh_after(self, command):
+        """命令执行、撤销或重做后刷新界面，字段修改只刷新受影响的行"""
+        if command is None:
+            return
+        if command.structural:
+            self.task_model.set_chart(self.chart)
+            self.chart_view.set_chart(self.chart)
+        else:
+            for row in command.rows:
+                self.task_model.refresh_row(row)
+                self.chart_view.update_row(row)
+        self._update_edit_actions()
+    
+    def on_undo(self):
+        """撤销"""
+        self._refresh_after(self.history.undo())
+    
+    def on_redo(self):
+        """重做"""
+        self._refresh_after(self.history.redo())
+    
+    def on_add_task(self):
+        """在末尾添加一个新任务"""
+        start = datetime.datetime.combine(datetime.date.today(), datetime.time())
+        task = Task('未分配', f"ID-{len(self.chart.tasks) + 1:04d}", "新任务",
+                    start, start + datetime.timedelta(days=7))
+        self._refresh_after(self.history.add_tasks([task]))
+    
+    def on_delete_tasks(self):
+        """删除任务表中选中的任务"""
+        rows = [index.row() for index in self.task_table.selectionModel().selectedRows()]
+        if rows:
+            self._refresh_after(self.history.remove_rows(rows))
+    
+    def on_open_project(self):
+        """打开CSV或Excel任务文件"""
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "打开任务文件", "", "任务文件 (*.csv *.xlsx *.xls)")
+        if not filepath:
+            return
+        chart = GanttChart()
+        try:
+            if filepath.lower().endswith('.csv'):
+                chart.load_from_csv(filepath)
+            else:
+                chart.load_from_excel(filepath)
+        except (ValueError, FileNotFoundError) as e:
+            QMessageBox.warning(self, "打开失败", str(e))
+            return
+        self.set_chart(chart)
+    
     def on_new_project(self):
         """创建新项目"""
         pass
@@ -118,4 +228,4 @@ class MainWindow(QMainWindow):
     
     def on_export_chart(self):
         """导出图表"""
-        pass
\ No newline at end of file
+        pass
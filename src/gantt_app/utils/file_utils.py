@@ -8,6 +8,9 @@
 import os
 import json
 import pickle
+import fnmatch
+import heapq
+from operator import itemgetter
 from datetime import datetime
 
 
@@ -66,26 +69,157 @@ def load_project(filepath):
     return data
 
 
-def get_recent_files(directory, max_count=5):
+class MtimeIndex:
+    """
+    持久化的目录扫描索引
+
+    按目录记录目录自身的修改时间以及其中的文件名、子目录名。再次扫描时，
+    目录修改时间未变的目录直接复用记录的文件列表，不再列目录，只对记录的文件重新stat，
+    因此原地改写文件内容（不改变目录修改时间）也能取得新的修改时间。
+    """
+
+    def __init__(self, filepath):
+        """
+        初始化索引
+
+        参数:
+            filepath (str): 索引文件路径，文件不存在时从空索引开始
+        """
+        self.filepath = filepath
+        self.entries = {}
+        if os.path.exists(filepath):
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (ValueError, OSError):
+                print(f"索引文件损坏，将重新建立: {filepath}")
+
+    def lookup(self, directory, dir_mtime):
+        """
+        查找目录的缓存记录
+
+        参数:
+            directory (str): 目录路径
+            dir_mtime (int): 目录当前的修改时间（纳秒）
+
+        返回:
+            tuple: (文件名到修改时间的字典, 子目录名列表)，记录过期或不存在时返回None
+        """
+        entry = self.entries.get(directory)
+        if entry is None or entry['mtime_ns'] != dir_mtime:
+            return None
+        return entry['files'], entry['dirs']
+
+    def store(self, directory, dir_mtime, files, dirs):
+        """记录一个目录的扫描结果"""
+        self.entries[directory] = {'mtime_ns': dir_mtime, 'files': files, 'dirs': dirs}
+
+    def save(self):
+        """将索引写回文件"""
+        ensure_dir(os.path.dirname(self.filepath) or '.')
+        with open(self.filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+
+
+def _scan_directory(directory, want_dirs):
+    """
+    列出一个目录中的文件与子目录
+
+    os.scandir 的 is_file/is_dir 使用目录项自带的类型信息，每个文件只需一次stat取修改时间。
+    """
+    files = {}
+    dirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    files[entry.name] = entry.stat().st_mtime
+                elif want_dirs and entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+            except OSError:
+                # 扫描过程中被删除的文件
+                continue
+    return files, dirs
+
+
+def _restat_files(directory, files):
+    """
+    重新读取索引中记录的文件的修改时间
+
+    目录修改时间未变说明没有文件增删，只需逐个stat记录中的文件，无需重新列目录。
+    """
+    refreshed = {}
+    for name in files:
+        try:
+            refreshed[name] = os.stat(os.path.join(directory, name)).st_mtime
+        except OSError:
+            # 目录修改时间精度不足时，删除的文件可能仍在记录中
+            continue
+    return refreshed
+
+
+def scan_files(directory, recursive=False, pattern=None, index=None):
+    """
+    遍历目录中的文件及其修改时间
+
+    参数:
+        directory (str): 目录路径
+        recursive (bool): 是否递归子目录
+        pattern (str): 文件名通配模式，例如 "*.csv"
+        index (MtimeIndex): 可选的扫描索引，未变化的目录不再重新列目录
+
+    返回:
+        Iterator[tuple]: (文件路径, 修改时间) 的迭代器
+    """
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            cached = None
+            if index is not None:
+                dir_mtime = os.stat(current).st_mtime_ns
+                cached = index.lookup(current, dir_mtime)
+            if cached is None:
+                # 使用索引时总是记录子目录，使索引与是否递归无关
+                files, dirs = _scan_directory(current, recursive or index is not None)
+                if index is not None:
+                    index.store(current, dir_mtime, files, dirs)
+            else:
+                files, dirs = cached
+                files = _restat_files(current, files)
+                index.store(current, dir_mtime, files, dirs)
+        except (PermissionError, FileNotFoundError):
+            continue
+
+        for name, mtime in files.items():
+            if pattern is None or fnmatch.fnmatch(name, pattern):
+                yield os.path.join(current, name), mtime
+        if recursive:
+            pending.extend(os.path.join(current, name) for name in dirs)
+
+
+def get_recent_files(directory, max_count=5, recursive=False, pattern=None, index_path=None):
     """
     获取目录中最近修改的文件
     
     参数:
         directory (str): 目录路径
         max_count (int): 最大文件数量
+        recursive (bool): 是否递归子目录
+        pattern (str): 文件名通配模式，例如 "*.csv"
+        index_path (str): 持久化扫描索引的路径，提供时重复调用只重新扫描发生变化的目录
     
     返回:
-        list: 最近文件路径列表
+        list: 最近文件路径列表，按修改时间从新到旧排列
     """
     if not os.path.exists(directory):
         return []
     
-    files = []
-    for filename in os.listdir(directory):
-        filepath = os.path.join(directory, filename)
-        if os.path.isfile(filepath):
-            files.append((filepath, os.path.getmtime(filepath)))
-    
-    # 按修改时间排序
-    sorted_files = sorted(files, key=lambda x: x[1], reverse=True)
-    return [f[0] for f in sorted_files[:max_count]]
\ No newline at end of file
+    index = MtimeIndex(index_path) if index_path else None
+    # 只保留前max_count个，无需对全部文件排序
+    recent = heapq.nlargest(max_count,
+                            scan_files(directory, recursive, pattern, index),
+                            key=itemgetter(1))
+    if index is not None:
+        index.save()
+    return [f[0] for f in recent]
@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+监视目录中的CSV/Excel导出文件，并增量地重新加载到甘特图
+
+Linux下使用inotify接收文件变化通知，其他平台或inotify不可用时退回到轮询。
+只有发生变化的文件会被重新解析，图表中也只替换来自该文件的任务。
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+DEFAULT_PATTERNS = ('*.csv', '*.xlsx', '*.xls')
+
+MODIFIED = 'modified'
+DELETED = 'deleted'
+
+# inotify事件掩码，见 <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _matches(filename: str, patterns: Iterable[str]) -> bool:
+    """判断文件名是否匹配监视模式，忽略Office的临时锁文件"""
+    if filename.startswith('~$') or filename.startswith('.'):
+        return False
+    return any(fnmatch.fnmatch(filename.lower(), pattern) for pattern in patterns)
+
+
+def _scan(directory: str, patterns: Tuple[str, ...]) -> Dict[str, Tuple[int, int]]:
+    """记录目录中每个匹配文件的修改时间与大小"""
+    snapshot = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and _matches(entry.name, patterns):
+                stat = entry.stat()
+                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class _PollingBackend:
+    """基于目录快照比较的轮询后端"""
+
+    def __init__(self, directory: str, patterns: Tuple[str, ...], interval: float):
+        self.directory = directory
+        self.patterns = patterns
+        self.interval = interval
+        self._snapshot = _scan(directory, patterns)
+
+    def read(self, timeout: float) -> Dict[str, str]:
+        """等待至多timeout秒，返回变化的文件"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = _scan(self.directory, self.patterns)
+            changes = {path: MODIFIED for path, state in current.items()
+                       if self._snapshot.get(path) != state}
+            changes.update({path: DELETED for path in self._snapshot if path not in current})
+            self._snapshot = current
+
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                return changes
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        """轮询后端无需释放资源"""
+        pass
+
+
+class _InotifyBackend:
+    """基于Linux inotify的通知后端"""
+
+    def __init__(self, directory: str, patterns: Tuple[str, ...]):
+        self.directory = directory
+        self.patterns = patterns
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1失败")
+
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"无法监视目录: {directory}")
+        # 目录中已知的匹配文件，事件队列溢出后据此找出期间被删除的文件
+        self._known = set(_scan(directory, patterns))
+
+    def read(self, timeout: float) -> Dict[str, str]:
+        """等待至多timeout秒，返回变化的文件"""
+        changes = {}
+        overflow = False
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        while ready:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if not _matches(name, self.patterns):
+                    continue
+                path = os.path.join(self.directory, name)
+                changes[path] = DELETED if mask & (IN_DELETE | IN_MOVED_FROM) else MODIFIED
+
+            ready, _, _ = select.select([self._fd], [], [], 0)
+
+        if overflow:
+            return self._rescan()
+        for path, change in changes.items():
+            if change == DELETED:
+                self._known.discard(path)
+            else:
+                self._known.add(path)
+        return changes
+
+    def _rescan(self) -> Dict[str, str]:
+        """
+        事件队列溢出时内核丢弃了部分事件，重新扫描目录：
+        全部匹配文件视为已修改，已知但不再存在的文件视为已删除
+        """
+        print(f"inotify事件队列溢出，重新扫描目录: {self.directory}")
+        current = set(_scan(self.directory, self.patterns))
+        changes = {path: MODIFIED for path in current}
+        changes.update({path: DELETED for path in self._known - current})
+        self._known = current
+        return changes
+
+    def close(self) -> None:
+        """关闭inotify描述符"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class FolderWatcher:
+    """目录监视器，优先使用inotify，失败时退回轮询"""
+
+    def __init__(self,
+                 directory: str,
+                 patterns: Iterable[str] = DEFAULT_PATTERNS,
+                 use_inotify: Optional[bool] = None,
+                 interval: float = 1.0):
+        """
+        初始化目录监视器
+
+        参数:
+            directory (str): 要监视的目录
+            patterns (Iterable[str]): 文件名匹配模式
+            use_inotify (bool): True强制使用inotify，False强制轮询，None自动选择
+            interval (float): 轮询间隔（秒）
+
+        异常:
+            FileNotFoundError: 如果目录不存在
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"目录不存在: {directory}")
+
+        self.directory = directory
+        patterns = tuple(pattern.lower() for pattern in patterns)
+
+        self._backend = None
+        if use_inotify or (use_inotify is None and sys.platform.startswith('linux')):
+            try:
+                self._backend = _InotifyBackend(directory, patterns)
+            except (OSError, AttributeError) as e:
+                if use_inotify:
+                    raise
+                print(f"inotify不可用，改用轮询: {str(e)}")
+        if self._backend is None:
+            self._backend = _PollingBackend(directory, patterns, interval)
+
+    @property
+    def backend(self) -> str:
+        """当前使用的后端名称"""
+        return 'inotify' if isinstance(self._backend, _InotifyBackend) else 'polling'
+
+    def changes(self, timeout: float = 1.0) -> Dict[str, str]:
+        """
+        等待并返回发生变化的文件
+
+        参数:
+            timeout (float): 最长等待时间（秒）
+
+        返回:
+            Dict[str, str]: 文件路径到变化类型（'modified' 或 'deleted'）的映射
+        """
+        return self._backend.read(timeout)
+
+    def close(self) -> None:
+        """停止监视并释放资源"""
+        self._backend.close()
+
+    def __enter__(self) -> 'FolderWatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class LiveReloader:
+    """将目录中的导出文件增量同步到甘特图"""
+
+    def __init__(self,
+                 chart,
+                 directory: str,
+                 patterns: Iterable[str] = DEFAULT_PATTERNS,
+                 use_inotify: Optional[bool] = None,
+                 interval: float = 1.0):
+        """
+        初始化实时重载器
+
+        参数:
+            chart (GanttChart): 要同步的甘特图
+            directory (str): 导出文件所在目录
+            patterns (Iterable[str]): 文件名匹配模式
+            use_inotify (bool): 见 FolderWatcher
+            interval (float): 轮询间隔（秒）
+        """
+        self.chart = chart
+        self.directory = directory
+        self.patterns = tuple(pattern.lower() for pattern in patterns)
+        self.watcher = FolderWatcher(directory, self.patterns, use_inotify, interval)
+        # 来源文件 -> (ArtifactID数组, 对应任务在 chart.tasks 中的行号数组)
+        # 行号随图表的增删通知整体平移，重新加载一个文件只访问该文件的任务
+        self._sources: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._stale = False
+        chart.subscribe(self._on_chart_changed)
+
+    def load_all(self) -> None:
+        """初次加载目录中所有匹配的文件"""
+        with os.scandir(self.directory) as entries:
+            paths = sorted(entry.path for entry in entries
+                           if entry.is_file() and _matches(entry.name, self.patterns))
+        for path in paths:
+            self.ingest(path)
+
+    def _load_file(self, path: str) -> list:
+        """使用图表自身的加载方法解析单个文件"""
+        loader = type(self.chart)()
+        if path.lower().endswith('.csv'):
+            loader.load_from_csv(path)
+        else:
+            loader.load_from_excel(path)
+        return loader.tasks
+
+    def _on_chart_changed(self, event: str, rows: List[int]) -> None:
+        """按图表的变化通知平移各来源的行号"""
+        if event == 'removed':
+            removed = np.array(rows, dtype=np.int64)
+            for path, (ids, positions) in self._sources.items():
+                if not len(positions) or positions.max() < removed[0]:
+                    continue
+                keep = ~np.isin(positions, removed)
+                positions = positions[keep]
+                self._sources[path] = (ids[keep], positions - np.searchsorted(removed, positions))
+        elif event == 'added':
+            # 追加到末尾不影响已有的行号；插入到中间时下次加载前重建
+            if rows and rows[0] < len(self.chart.tasks) - len(rows):
+                self._stale = True
+        elif event == 'reset':
+            self._stale = True
+
+    def _rows_of(self, path: str) -> Dict[str, int]:
+        """
+        来自某个文件的任务的 ArtifactID -> 行号
+
+        只核对该文件的任务；行号与图表不一致（图表被外部替换过任务）时重建全部来源的行号。
+        """
+        entry = self._sources.get(path)
+        if entry is not None and not self._stale:
+            tasks = self.chart.tasks
+            ids, positions = entry
+            if all(pos < len(tasks) and tasks[pos].source == path and tasks[pos].artfId == artfid
+                   for artfid, pos in zip(ids.tolist(), positions.tolist())):
+                return dict(zip(ids.tolist(), positions.tolist()))
+        if entry is not None or self._stale:
+            self._rebuild_positions()
+        ids, positions = self._sources.get(path, (np.empty(0, dtype=object), np.empty(0, dtype=np.int64)))
+        return dict(zip(ids.tolist(), positions.tolist()))
+
+    def _rebuild_positions(self) -> None:
+        """根据 chart.tasks 重建全部来源的行号"""
+        rows: Dict[str, Dict[str, int]] = {path: {} for path in self._sources}
+        for pos, task in enumerate(self.chart.tasks):
+            if task.source in rows:
+                rows[task.source][task.artfId] = pos
+        for path, found in rows.items():
+            self._store(path, found)
+        self._stale = False
+
+    def _store(self, path: str, rows: Dict[str, int]) -> None:
+        self._sources[path] = (np.array(list(rows), dtype=object),
+                               np.fromiter(rows.values(), dtype=np.int64, count=len(rows)))
+
+    def ingest(self, path: str) -> int:
+        """
+        重新加载单个文件，只替换来自该文件的任务
+
+        同一文件中ID相同的任务原位替换，新的任务追加到末尾，文件中已不存在的任务被移除。
+
+        参数:
+            path (str): 文件路径
+
+        返回:
+            int: 加载的任务数
+        """
+        new_tasks = self._load_file(path)
+        old_rows = self._rows_of(path)
+        new_rows: Dict[str, int] = {}
+
+        for task in new_tasks:
+            task.source = path
+            pos = old_rows.get(task.artfId, new_rows.get(task.artfId))
+            if pos is None:
+                pos = len(self.chart.tasks)
+                self.chart.add_task(task)
+            else:
+                self.chart.replace_task(pos, task)
+            new_rows[task.artfId] = pos
+
+        # 先记录新的行号，删除旧任务时由变化通知统一平移
+        self._store(path, new_rows)
+        stale = [pos for artfid, pos in old_rows.items() if artfid not in new_rows]
+        if stale:
+            self.chart.remove_rows(stale)
+        return len(new_tasks)
+
+    def remove_source(self, path: str) -> None:
+        """
+        移除来自某个文件的全部任务
+
+        参数:
+            path (str): 文件路径
+        """
+        if path not in self._sources:
+            return
+        rows = self._rows_of(path)
+        del self._sources[path]
+        if rows:
+            self.chart.remove_rows(list(rows.values()))
+
+    def poll(self, timeout: float = 1.0) -> List[str]:
+        """
+        等待一次文件变化并重新加载受影响的文件
+
+        参数:
+            timeout (float): 最长等待时间（秒）
+
+        返回:
+            List[str]: 已处理的文件路径
+        """
+        changes = self.watcher.changes(timeout)
+        for path, change in changes.items():
+            try:
+                if change == DELETED or not os.path.exists(path):
+                    self.remove_source(path)
+                else:
+                    self.ingest(path)
+            except (ValueError, FileNotFoundError) as e:
+                # 文件可能仍在写入中，等待下一次变化
+                print(f"重新加载文件时出错: {path}: {str(e)}")
+        return list(changes)
+
+    def run(self,
+            should_stop: Callable[[], bool] = lambda: False,
+            on_reload: Optional[Callable[[List[str]], None]] = None,
+            timeout: float = 1.0) -> None:
+        """
+        持续监视目录直到 should_stop 返回True
+
+        参数:
+            should_stop (Callable[[], bool]): 停止条件
+            on_reload (Callable[[List[str]], None]): 每次重新加载后的回调
+            timeout (float): 每次等待的最长时间（秒）
+        """
+        while not should_stop():
+            paths = self.poll(timeout)
+            if paths and on_reload:
+                on_reload(paths)
+
+    def close(self) -> None:
+        """停止监视并取消订阅图表的变化"""
+        self.chart.unsubscribe(self._on_chart_changed)
+        self.watcher.close()
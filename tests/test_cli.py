@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+命令行批量转换单元测试
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+from gantt_app.cli import main, output_stems
+
+
+class TestCli(unittest.TestCase):
+    """gantt-render 命令测试"""
+
+    def setUp(self):
+        """创建输入文件"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.inputs = []
+        for name in ("team_a", "team_b"):
+            path = os.path.join(self.tmpdir.name, f"{name}.csv")
+            pd.DataFrame({'AssignTo': ["张三", "李四"], 'ArtifactID': ["A-1", "A-2"],
+                          'Description': ["设计", "实现"], 'Start': ["2025-05-01", "2025-05-03"],
+                          'End': ["2025-05-05", "2025-05-20"], 'Progress': [50, 0]}).to_csv(path, index=False)
+            self.inputs.append(path)
+        self.output_dir = os.path.join(self.tmpdir.name, "out")
+
+    def tearDown(self):
+        """清理临时目录"""
+        self.tmpdir.cleanup()
+
+    def test_parallel_outputs(self):
+        """测试并行输出多种格式"""
+        code = main(self.inputs + ["-o", self.output_dir, "-f", "png,svg,csv", "-j", "2"])
+        self.assertEqual(code, 0)
+        self.assertEqual(sorted(os.listdir(self.output_dir)),
+                         ["team_a.csv", "team_a.png", "team_a.svg", "team_b.csv", "team_b.png", "team_b.svg"])
+
+    def test_same_stem_from_different_directories(self):
+        """不同目录中同名的输入文件输出到不同的文件"""
+        other = os.path.join(self.tmpdir.name, "b", "team_a.csv")
+        os.makedirs(os.path.dirname(other))
+        with open(self.inputs[0], 'rb') as src, open(other, 'wb') as dst:
+            dst.write(src.read())
+        self.assertEqual(output_stems([self.inputs[0], other, self.inputs[1]]),
+                         {self.inputs[0]: "team_a", other: "b_team_a",
+                          self.inputs[1]: "team_b"})
+        code = main([self.inputs[0], other, "-o", self.output_dir, "-f", "csv", "-j", "1"])
+        self.assertEqual(code, 0)
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ["b_team_a.csv", "team_a.csv"])
+
+    def test_failure_is_reported(self):
+        """测试单个文件失败不影响其他文件"""
+        missing = os.path.join(self.tmpdir.name, "missing.csv")
+        code = main([missing, self.inputs[0], "-o", self.output_dir, "-f", "pdf", "-j", "1"])
+        self.assertEqual(code, 1)
+        self.assertEqual(os.listdir(self.output_dir), ["team_a.pdf"])
+
+    def test_never_imports_qt(self):
+        """测试命令行模块不会导入Qt"""
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        env.pop('DISPLAY', None)
+        script = ("import sys, gantt_app.cli, matplotlib; "
+                  "assert not [m for m in sys.modules if m.startswith(('PyQt', 'PySide'))]; "
+                  "assert matplotlib.get_backend().lower() == 'agg'")
+        subprocess.run([sys.executable, "-c", script], check=True, env=env)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+撤销/重做命令历史单元测试
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.commands import CommandHistory
+
+
+def make_task(i, assignee="张三"):
+    """创建测试任务"""
+    start = datetime(2025, 5, 1) + timedelta(days=i)
+    return Task(assignee, f"T-{i}", f"任务{i}", start, start + timedelta(days=3))
+
+
+class FakeClock:
+    """可控时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCommandHistory(unittest.TestCase):
+    """命令历史测试"""
+
+    def setUp(self):
+        """准备五个任务"""
+        self.chart = GanttChart()
+        for i in range(5):
+            self.chart.add_task(make_task(i))
+        self.clock = FakeClock()
+        self.history = CommandHistory(self.chart, clock=self.clock)
+
+    def test_edit_undo_redo_updates_index(self):
+        """测试字段修改的撤销重做，并同步索引"""
+        self.history.edit_task(1, assignTo="李四", progress=100)
+        self.assertEqual([t.artfId for t in self.chart.query(assignee="李四", progress='done')], ["T-1"])
+        self.history.undo()
+        self.assertEqual(self.chart.tasks[1].assignTo, "张三")
+        self.assertEqual(self.chart.tasks[1].progress, 0)
+        self.assertEqual(self.chart.query(assignee="李四"), [])
+        self.history.redo()
+        self.assertEqual(self.chart.tasks[1].progress, 100)
+        self.assertIsNone(self.history.edit_task(1, progress=100))
+
+    def test_drag_moves_coalesce(self):
+        """测试时间窗口内的连续拖动合并为一条命令"""
+        task = self.chart.tasks[2]
+        original, original_end = task.start_date, task.end_date
+
+        def drag(days):
+            delta = timedelta(days=days)
+            self.history.edit_task(2, merge_key='drag', start_date=original + delta, end_date=original_end + delta)
+
+        for step in range(1, 4):
+            self.clock.now += 0.2
+            drag(step)
+        self.assertEqual(len(self.history), 1)
+        self.clock.now += 5
+        drag(10)
+        self.assertEqual(len(self.history), 2)
+
+        self.history.undo()
+        self.assertEqual(task.start_date, original + timedelta(days=3))
+        self.history.undo()
+        self.assertEqual(task.start_date, original)
+        self.assertFalse(self.history.can_undo())
+
+    def test_add_and_remove(self):
+        """测试添加与删除任务的撤销会恢复原位置"""
+        self.history.add_tasks([make_task(9)])
+        self.assertEqual(self.chart.get_task("T-9"), self.chart.tasks[5])
+        self.history.undo()
+        self.assertEqual(len(self.chart.tasks), 5)
+        self.assertIsNone(self.chart.get_task("T-9"))
+
+        removed = self.chart.tasks[1]
+        self.history.remove_rows([3, 1])
+        self.assertEqual([t.artfId for t in self.chart.tasks], ["T-0", "T-2", "T-4"])
+        self.assertFalse(self.history.can_redo())
+        self.history.undo()
+        self.assertEqual([t.artfId for t in self.chart.tasks], ["T-0", "T-1", "T-2", "T-3", "T-4"])
+        self.assertIs(self.chart.tasks[1], removed)
+        self.assertEqual(self.chart.index.by_id["T-4"], 4)
+
+    def test_memory_budget(self):
+        """测试超出内存预算时丢弃最早的命令"""
+        history = CommandHistory(self.chart, memory_budget=2000, clock=self.clock)
+        for i in range(100):
+            self.clock.now += 10
+            history.edit_task(i % 5, description=f"说明{i}")
+        self.assertLessEqual(history.memory_usage, 2000)
+        self.assertGreater(len(history), 1)
+        self.assertLess(len(history), 100)
+
+    def test_invalid_field(self):
+        """测试不可编辑的字段"""
+        with self.assertRaises(ValueError):
+            self.history.edit_task(0, artfId="X")
+
+    def test_invalid_values_rejected(self):
+        """测试违反任务约束的修改被拒绝，任务、索引与历史都不变"""
+        task = self.chart.tasks[0]
+        before = (task.end_date, task.progress, self.chart.date_range())
+        with self.assertRaises(ValueError):
+            self.history.edit_task(0, end_date=task.start_date - timedelta(days=1))
+        with self.assertRaises(ValueError):
+            self.history.edit_task(0, progress=250)
+        self.assertEqual((task.end_date, task.progress, self.chart.date_range()), before)
+        self.assertFalse(self.history.can_undo())
+
+
+if __name__ == "__main__":
+    unittest.main()
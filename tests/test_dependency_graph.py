@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+依赖图单元测试
+"""
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.dependency_graph import DependencyGraph, validate_dependencies
+
+
+def make_task(artfid, dependencies=()):
+    """创建测试任务"""
+    start = datetime(2025, 5, 1)
+    return Task("张三", artfid, f"任务{artfid}", start, start + timedelta(days=3), 0,
+                dependencies=list(dependencies))
+
+
+def assert_topological(test, graph, tasks):
+    """依赖图给出的顺序满足全部未形成循环的依赖"""
+    position = {artfid: i for i, artfid in enumerate(graph.order())}
+    # 每个循环的前两个ID即被拒绝的依赖边
+    rejected = {tuple(cycle[:2]) for cycle in graph.validate().cycles}
+    for task in tasks:
+        for dep in task.dependencies:
+            if dep in position and dep != task.artfId and (dep, task.artfId) not in rejected:
+                test.assertLess(position[dep], position[task.artfId])
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """依赖图测试"""
+
+    def test_order(self):
+        """拓扑序中前置任务在前"""
+        tasks = [make_task('C', ['B']), make_task('B', ['A']), make_task('A')]
+        graph = DependencyGraph(tasks)
+        self.assertEqual(graph.order(), ['A', 'B', 'C'])
+        self.assertEqual(len(graph), 2)
+        self.assertTrue(graph.validate().ok)
+
+    def test_report(self):
+        """报告不存在的前置任务、自身依赖、循环和重复ID"""
+        tasks = [make_task('A', ['C']), make_task('B', ['A', 'X']), make_task('C', ['B']),
+                 make_task('D', ['D']), make_task('D')]
+        report = validate_dependencies(tasks)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.dangling, [('B', 'X')])
+        self.assertEqual(report.self_references, ['D'])
+        self.assertEqual(report.duplicates, ['D'])
+        self.assertEqual(len(report.cycles), 1)
+        cycle = report.cycles[0]
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertEqual(set(cycle), {'A', 'B', 'C'})
+        # 与行顺序相反的依赖 C -> A 被拒绝
+        self.assertEqual(cycle[:2], ['C', 'A'])
+        self.assertIn("循环依赖", str(report))
+
+    def test_incremental_cycle(self):
+        """逐个添加任务时检测循环，删除一条边后被拒绝的边重新加入"""
+        graph = DependencyGraph()
+        graph.append(make_task('A'))
+        graph.append(make_task('B', ['A']))
+        graph.append(make_task('C', ['B']))
+        self.assertEqual(graph.find_cycle('C', 'A'), ['C', 'A', 'B', 'C'])
+        self.assertIsNone(graph.find_cycle('A', 'C'))
+        graph.refresh(0, make_task('A', ['C']))
+        self.assertEqual(len(graph.validate().cycles), 1)
+        self.assertEqual(len(graph), 2)
+        graph.refresh(1, make_task('B'))
+        self.assertEqual(graph.validate().cycles, [])
+        self.assertEqual(len(graph), 2)
+        self.assertLess(graph.order().index('C'), graph.order().index('A'))
+
+    def test_remove_makes_dangling(self):
+        """删除被依赖的任务后报告不存在的前置任务"""
+        graph = DependencyGraph([make_task('A'), make_task('B', ['A'])])
+        graph.remove(0)
+        self.assertEqual(graph.validate().dangling, [('B', 'A')])
+        graph.insert(0, make_task('A'))
+        self.assertTrue(graph.validate().ok)
+
+    def test_random_edits(self):
+        """随机增删改后拓扑序始终有效，循环与重新构建的结果一致"""
+        rng = random.Random(7)
+        ids = [f'T{i}' for i in range(40)]
+        tasks = [make_task(artfid) for artfid in ids]
+        graph = DependencyGraph(tasks)
+        for _ in range(300):
+            row = rng.randrange(len(tasks))
+            deps = rng.sample(ids, rng.randrange(3))
+            tasks[row] = make_task(tasks[row].artfId, deps)
+            graph.refresh(row, tasks[row])
+            assert_topological(self, graph, tasks)
+            self.assertEqual(bool(graph.validate().cycles), bool(DependencyGraph(tasks).validate().cycles))
+
+
+class TestChartDependencyGraph(unittest.TestCase):
+    """甘特图依赖图同步测试"""
+
+    def test_sync(self):
+        """依赖图随甘特图的增删改更新"""
+        chart = GanttChart()
+        chart.add_task(make_task('A'))
+        chart.add_task(make_task('B', ['A']))
+        graph = chart.dependency_graph()
+        self.assertIs(chart.dependency_graph(), graph)
+
+        chart.add_task(make_task('C', ['B']))
+        chart.update_task(0, dependencies=['C'])
+        self.assertEqual(len(chart.validate_dependencies().cycles), 1)
+
+        chart.remove_rows([1])
+        report = chart.validate_dependencies()
+        self.assertEqual(report.cycles, [])
+        self.assertEqual(report.dangling, [('C', 'B')])
+
+        chart.insert_tasks([1], [make_task('B')])
+        self.assertEqual(graph.order(), ['B', 'C', 'A'])
+
+        chart.clear_tasks()
+        self.assertEqual(graph.order(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
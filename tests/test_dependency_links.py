@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+依赖连线单元测试
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core import dependency_links
+from gantt_app.core.dependency_links import (DependencyLinks, dependency_edges, draw_dependency_links,
+                                             route_links)
+
+
+def make_task(i, dependencies=None, offset=0):
+    """创建测试任务"""
+    start = datetime(2025, 5, 1) + timedelta(days=offset)
+    return Task("张三", f"T-{i}", f"任务{i}", start, start + timedelta(days=3), 0,
+                dependencies=dependencies)
+
+
+def make_axes():
+    """创建不依赖pyplot的坐标轴"""
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig.subplots()
+
+
+class TestDependencyEdges(unittest.TestCase):
+    """依赖关系解析测试"""
+
+    def test_edges(self):
+        """依赖按ID匹配到行号，未知ID与自身依赖被忽略"""
+        tasks = [make_task(0), make_task(1, [' T-0 ', 'T-9']), make_task(2, ['T-1', 'T-2', 'T-0'])]
+        sources, targets = dependency_edges(tasks)
+        self.assertEqual(sources.tolist(), [0, 1, 0])
+        self.assertEqual(targets.tolist(), [1, 2, 2])
+
+    def test_no_dependencies(self):
+        """没有依赖时返回空数组"""
+        sources, targets = dependency_edges([make_task(0)])
+        self.assertEqual(len(sources), 0)
+        self.assertEqual(len(targets), 0)
+
+
+class TestRouteLinks(unittest.TestCase):
+    """正交走线测试"""
+
+    def test_orthogonal_route(self):
+        """前置任务在上方时，水平段走在后续任务所在行上方的空隙"""
+        verts = route_links(np.array([10.0]), np.array([5.0]), np.array([12.0]), np.array([3.0]))
+        self.assertEqual(verts.shape, (1, dependency_links.VERTICES_PER_LINK, 2))
+        path = verts[0, :6]
+        self.assertEqual(path[:, 0].tolist(), [10.0, 10.5, 10.5, 11.5, 11.5, 12.0])
+        self.assertEqual(path[:, 1].tolist(), [5.0, 5.0, 3.5, 3.5, 3.0, 3.0])
+        # 相邻顶点只在一个方向上变化
+        steps = np.diff(path, axis=0)
+        self.assertTrue(np.all((steps[:, 0] == 0) | (steps[:, 1] == 0)))
+
+    def test_upward_route(self):
+        """前置任务在下方时，水平段走在后续任务所在行下方的空隙"""
+        verts = route_links(np.array([10.0]), np.array([1.0]), np.array([12.0]), np.array([3.0]))
+        self.assertEqual(verts[0, 2, 1], 2.5)
+
+    def test_same_row_straight(self):
+        """同一行且后续任务在右侧时为直线"""
+        verts = route_links(np.array([10.0]), np.array([3.0]), np.array([15.0]), np.array([3.0]))
+        self.assertTrue(np.all(verts[0, :6, 1] == 3.0))
+
+    def test_same_row_backward(self):
+        """同一行且后续任务在左侧时从上方空隙绕回"""
+        verts = route_links(np.array([10.0]), np.array([3.0]), np.array([5.0]), np.array([3.0]))
+        self.assertEqual(verts[0, 2, 1], 3.5)
+        self.assertEqual(verts[0, 3, 0], 4.5)
+
+
+class TestDependencyLinks(unittest.TestCase):
+    """坐标轴上的依赖连线测试"""
+
+    def setUp(self):
+        """100个任务依次依赖前一个任务"""
+        self.tasks = [make_task(0)] + [make_task(i, [f'T-{i - 1}'], offset=i) for i in range(1, 100)]
+        self.ax = make_axes()
+        self.ax.set_xlim(datetime(2025, 4, 25), datetime(2025, 9, 1))
+        self.ax.set_ylim(0.5, 100.5)
+
+    def test_single_collection(self):
+        """全部连线合并为一个LineCollection"""
+        links = DependencyLinks(self.ax, self.tasks)
+        self.assertEqual(len(links), 99)
+        collections = [c for c in self.ax.collections if isinstance(c, LineCollection)]
+        self.assertEqual(collections, [links.collection])
+        self.assertEqual(len(links.collection.get_segments()), 99)
+
+    def test_cull_on_view_change(self):
+        """纵轴范围变化后只保留与视图相交的连线"""
+        links = DependencyLinks(self.ax, self.tasks)
+        self.ax.set_ylim(90.5, 100.5)
+        self.assertEqual(int(links.visible.sum()), 10)
+        self.assertEqual(len(links.collection.get_segments()), 10)
+        self.ax.set_ylim(0.5, 100.5)
+        self.assertEqual(len(links.collection.get_segments()), 99)
+
+    def test_dedupe_when_zoomed_out(self):
+        """可见连线过多时，屏幕上重合的连线只保留一条"""
+        tasks = [make_task(0)] + [make_task(i, ['T-0']) for i in range(1, 3)]
+        tasks += [make_task(i, ['T-1']) for i in range(3, 6)]
+        links = DependencyLinks(self.ax, tasks)
+        original = dependency_links.DEDUPE_THRESHOLD
+        dependency_links.DEDUPE_THRESHOLD = 0
+        try:
+            self.ax.set_ylim(-1000, 1000)
+            visible = links.cull()
+        finally:
+            dependency_links.DEDUPE_THRESHOLD = original
+        self.assertEqual(visible, 5)
+        self.assertLess(len(links.collection.get_segments()), 5)
+
+    def test_remove(self):
+        """移除后不再响应视图变化"""
+        links = DependencyLinks(self.ax, self.tasks)
+        links.remove()
+        self.assertEqual(len(self.ax.collections), 0)
+        self.ax.set_ylim(90.5, 100.5)
+
+    def test_draw_without_dependencies(self):
+        """没有依赖关系时不添加图元"""
+        self.assertIsNone(draw_dependency_links(self.ax, [make_task(0), make_task(1)]))
+        self.assertEqual(len(self.ax.collections), 0)
+
+
+class TestChartDrawLinks(unittest.TestCase):
+    """甘特图绘制依赖连线测试"""
+
+    def setUp(self):
+        self.chart = GanttChart()
+        self.chart.add_task(make_task(0))
+        self.chart.add_task(make_task(1, ['T-0'], offset=5))
+
+    def test_draw_links(self):
+        """绘制甘特图时添加依赖连线"""
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = self.chart.draw(fig)
+        lines = [c for c in ax.collections if isinstance(c, LineCollection)]
+        self.assertEqual(len(lines), 1)
+        segment = lines[0].get_segments()[0]
+        # 从第一行任务的结束处指向第二行任务的开始处
+        self.assertEqual(segment[0][1], 2.0)
+        self.assertEqual(segment[5][1], 1.0)
+        fig.canvas.draw()
+
+    def test_draw_without_links(self):
+        """links=False 时不绘制连线"""
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = self.chart.draw(fig, links=False)
+        self.assertFalse(any(isinstance(c, LineCollection) for c in ax.collections))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+快照对比单元测试
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import matplotlib
+matplotlib.use('Agg')
+import pandas as pd
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.diff import diff_charts
+
+
+def make_task(artfid, start_offset, length, progress=0, assignee="开发者"):
+    """创建测试任务"""
+    start = datetime(2025, 5, 1) + timedelta(days=start_offset)
+    return Task(assignee, artfid, f"任务{artfid}", start, start + timedelta(days=length), progress)
+
+
+class TestDiffCharts(unittest.TestCase):
+    """快照对比测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.baseline = GanttChart()
+        for task in [make_task("A", 0, 5), make_task("B", 3, 4, 20), make_task("C", 6, 2)]:
+            self.baseline.add_task(task)
+
+        self.current = GanttChart()
+        for task in [make_task("A", 0, 5), make_task("B", 5, 4, 50), make_task("D", 9, 3)]:
+            self.current.add_task(task)
+
+    def test_classification(self):
+        """测试新增、删除、变更的分类"""
+        diff = diff_charts(self.baseline, self.current)
+        self.assertEqual(diff.summary(), {'added': 1, 'removed': 1, 'changed': 1, 'unchanged': 1})
+        self.assertEqual(list(diff.added['ArtifactID']), ["D"])
+        self.assertEqual(list(diff.removed['ArtifactID']), ["C"])
+        self.assertEqual(list(diff.changed['ArtifactID']), ["B"])
+
+    def test_variance(self):
+        """测试日期与进度偏差"""
+        table = diff_charts(self.baseline, self.current).table.set_index('ArtifactID')
+        self.assertEqual(table.loc["B", 'StartVariance'], 2)
+        self.assertEqual(table.loc["B", 'EndVariance'], 2)
+        self.assertEqual(table.loc["B", 'ProgressVariance'], 30)
+        self.assertEqual(table.loc["A", 'EndVariance'], 0)
+        self.assertTrue(pd.isna(table.loc["D", 'StartVariance']))
+
+    def test_export(self):
+        """测试导出偏差表"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "variance.csv")
+            diff_charts(self.baseline, self.current).export_csv(path)
+            df = pd.read_csv(path)
+        self.assertEqual(len(df), 4)
+        self.assertIn('EndVariance', df.columns)
+
+    def test_render_with_baseline(self):
+        """测试带基线条渲染"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "chart.png")
+            fig = self.current.render(save_path=path, baseline=self.baseline)
+            self.assertTrue(os.path.exists(path))
+        self.assertEqual(len(fig.axes[0].collections), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
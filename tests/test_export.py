@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+流式CSV导出单元测试
+"""
+
+import csv
+import gzip
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.export import write_csv_stream, verify_csv_stream
+
+
+class TestCsvStream(unittest.TestCase):
+    """流式CSV导出测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.chart = GanttChart()
+        base = datetime(2025, 5, 1)
+        for i in range(25):
+            self.chart.add_task(Task(
+                assignTo=f"开发者{i % 3}",
+                artfid=f"TASK-{i}",
+                description=f"任务,{i}",
+                start_date=base + timedelta(days=i),
+                end_date=base + timedelta(days=i + 3),
+                progress=i * 4,
+                dependencies=[f"TASK-{i - 1}"] if i else None
+            ))
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """清理临时目录"""
+        self.tmpdir.cleanup()
+
+    def test_matches_dataframe(self):
+        """测试分块导出与DataFrame内容一致"""
+        path = os.path.join(self.tmpdir.name, "tasks.csv")
+        self.chart.export_csv(path, chunk_size=7)
+
+        df = pd.read_csv(path, keep_default_na=False)
+        expected = self.chart.to_dataframe()
+        self.assertEqual(list(df.columns), list(expected.columns))
+        self.assertEqual(len(df), 25)
+        self.assertEqual(df.iloc[3]['Description'], "任务,3")
+        self.assertEqual(df.iloc[3]['Dependencies'], "TASK-2")
+        self.assertEqual(list(df['Duration']), list(expected['Duration']))
+        self.assertEqual(pd.to_datetime(df.iloc[24]['End']), datetime(2025, 5, 28))
+
+    def test_date_format_matches_baseline(self):
+        """测试日期格式与 DataFrame.to_csv 一致，并接受 PathLike 路径"""
+        path = pathlib.Path(self.tmpdir.name) / "tasks.csv"
+
+        def dates(text):
+            return [row[3:5] for row in csv.reader(io.StringIO(text))][1:3]
+
+        self.chart.export_csv(path)
+        self.assertEqual(dates(path.read_text(encoding='utf-8')),
+                         [["2025-05-01", "2025-05-04"], ["2025-05-02", "2025-05-05"]])
+
+        self.chart.update_task(0, end_date=datetime(2025, 5, 4, 12, 30))
+        self.chart.export_csv(path)
+        self.assertEqual(dates(path.read_text(encoding='utf-8')),
+                         [["2025-05-01", "2025-05-04 12:30:00"], ["2025-05-02", "2025-05-05 00:00:00"]])
+        self.assertEqual(dates(path.read_text(encoding='utf-8')),
+                         dates(self.chart.to_dataframe().to_csv(index=False)))
+
+        gz_path = pathlib.Path(self.tmpdir.name) / "tasks.csv.gz"
+        write_csv_stream(self.chart.tasks, gz_path, footer=True)
+        self.assertTrue(verify_csv_stream(gz_path))
+
+    def test_roundtrip_load(self):
+        """测试导出文件可以重新加载"""
+        path = os.path.join(self.tmpdir.name, "tasks.csv")
+        self.chart.export_csv(path)
+
+        loaded = GanttChart().load_from_csv(path)
+        self.assertEqual(len(loaded.tasks), 25)
+        self.assertEqual(loaded.tasks[5].dependencies, ["TASK-4"])
+
+    def test_gzip_with_footer(self):
+        """测试gzip压缩与校验尾注"""
+        path = os.path.join(self.tmpdir.name, "tasks.csv.gz")
+        result = write_csv_stream(self.chart.tasks, path, chunk_size=10, footer=True)
+
+        self.assertEqual(result['rows'], 25)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[-2], "#rows=25")
+        self.assertEqual(lines[-1], f"#sha256={result['sha256']}")
+        self.assertTrue(verify_csv_stream(path))
+
+    def test_footer_detects_tampering(self):
+        """测试尾注能发现文件被修改"""
+        path = os.path.join(self.tmpdir.name, "tasks.csv")
+        write_csv_stream(self.chart.tasks, path, footer=True)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content.replace("TASK-7", "TASK-8", 1))
+        self.assertFalse(verify_csv_stream(path))
+
+    def test_invalid_arguments(self):
+        """测试非法参数"""
+        path = os.path.join(self.tmpdir.name, "tasks.csv")
+        with self.assertRaises(ValueError):
+            write_csv_stream(self.chart.tasks, path, chunk_size=0)
+        with self.assertRaises(ValueError):
+            write_csv_stream(self.chart.tasks, path, compression="bz2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+无pyplot渲染与Figure池单元测试
+"""
+
+import gc
+import logging
+import os
+import tempfile
+import tracemalloc
+import unittest
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import matplotlib.pyplot as plt
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.figure_pool import FigurePool, render_image
+
+
+def make_chart(title, count):
+    """创建测试甘特图"""
+    chart = GanttChart()
+    chart.set_title(title)
+    for i in range(count):
+        start = datetime(2025, 5, 1) + timedelta(days=i * 2)
+        chart.add_task(Task("张三", f"{title}-{i}", f"任务{i}", start, start + timedelta(days=3), i * 10))
+    return chart
+
+
+# 小尺寸低分辨率，让测试更快
+SMALL = dict(figsize=(4, 3), dpi=30)
+
+
+class TestFigurePool(unittest.TestCase):
+    """Figure池测试"""
+
+    def setUp(self):
+        self.pool = FigurePool()
+        self.chart = make_chart("A", 4)
+
+    def test_reuses_figure(self):
+        """连续渲染复用同一个Figure，不产生pyplot Figure"""
+        figures = plt.get_fignums()
+        for _ in range(5):
+            data = render_image(self.chart, pool=self.pool, **SMALL)
+            self.assertTrue(data.startswith(b'\x89PNG'))
+        self.assertEqual(self.pool.created, 1)
+        self.assertEqual(len(self.pool), 1)
+        self.assertEqual(plt.get_fignums(), figures)
+
+    def test_released_figure_is_blank(self):
+        """放回池中的Figure被清空"""
+        render_image(self.chart, pool=self.pool, **SMALL)
+        with self.pool.figure() as fig:
+            self.assertEqual(fig.axes, [])
+            self.assertEqual(tuple(fig.get_size_inches()), (12, 8))
+
+    def test_error_discards_figure(self):
+        """渲染出错时Figure不放回池中"""
+        with self.assertRaises(ValueError):
+            render_image(GanttChart(), pool=self.pool, **SMALL)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_file_target(self):
+        """保存到文件，格式由扩展名决定"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "chart.svg")
+            self.assertIsNone(render_image(self.chart, path, pool=self.pool, **SMALL))
+            with open(path, encoding='utf-8') as f:
+                self.assertIn('<svg', f.read(500))
+
+    def test_flat_memory(self):
+        """预热后连续渲染，内存不随渲染次数增长"""
+        for _ in range(10):
+            render_image(self.chart, pool=self.pool, **SMALL)
+        gc.collect()
+        # 测试框架会保留捕获到的字体缺字警告和日志，这里不让它们计入
+        font_log = logging.getLogger('matplotlib.font_manager')
+        level = font_log.level
+        font_log.setLevel(logging.ERROR)
+        tracemalloc.start()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                before = tracemalloc.take_snapshot()
+                for _ in range(40):
+                    render_image(self.chart, pool=self.pool, **SMALL)
+                gc.collect()
+                after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+            font_log.setLevel(level)
+        # 只统计绘图代码的分配
+        scope = [tracemalloc.Filter(True, '*matplotlib*'), tracemalloc.Filter(True, '*gantt_app*')]
+        growth = sum(stat.size_diff for stat in
+                     after.filter_traces(scope).compare_to(before.filter_traces(scope), 'filename'))
+        self.assertLess(growth, 256 * 1024)
+
+    def test_thread_concurrency(self):
+        """多个线程同时渲染不同的甘特图，结果与串行渲染一致"""
+        charts = [make_chart(title, count) for title, count in (("A", 3), ("B", 6), ("C", 9))]
+        expected = [render_image(chart, pool=self.pool, **SMALL) for chart in charts]
+        jobs = charts * 3
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda chart: render_image(chart, pool=self.pool, **SMALL), jobs))
+        for i, data in enumerate(results):
+            self.assertEqual(data, expected[i % 3])
+        self.assertLessEqual(len(self.pool), self.pool.max_idle)
+
+
+if __name__ == "__main__":
+    unittest.main()
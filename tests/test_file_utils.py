@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文件工具函数单元测试
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from gantt_app.utils import file_utils
+from gantt_app.utils.file_utils import get_recent_files
+
+
+class TestRecentFiles(unittest.TestCase):
+    """最近文件扫描测试"""
+
+    def setUp(self):
+        """创建带有确定修改时间的文件"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+        os.makedirs(os.path.join(self.root, "sub"))
+        self.files = {
+            "a.csv": 100, "b.xlsx": 400, "c.csv": 300,
+            os.path.join("sub", "d.csv"): 500, os.path.join("sub", "e.txt"): 200,
+        }
+        for name, mtime in self.files.items():
+            path = os.path.join(self.root, name)
+            with open(path, 'w') as f:
+                f.write(name)
+            os.utime(path, (mtime, mtime))
+
+    def tearDown(self):
+        """清理临时目录"""
+        self.tmpdir.cleanup()
+
+    def _names(self, paths):
+        return [os.path.relpath(p, self.root) for p in paths]
+
+    def test_top_k(self):
+        """测试只返回最新的若干文件"""
+        self.assertEqual(self._names(get_recent_files(self.root, max_count=2)), ["b.xlsx", "c.csv"])
+        self.assertEqual(get_recent_files(os.path.join(self.root, "missing")), [])
+
+    def test_recursive_and_pattern(self):
+        """测试递归与通配过滤"""
+        recent = get_recent_files(self.root, max_count=3, recursive=True, pattern="*.csv")
+        self.assertEqual(self._names(recent), [os.path.join("sub", "d.csv"), "c.csv", "a.csv"])
+
+    def test_index_skips_unchanged_directories(self):
+        """测试索引使未变化的目录无需重新扫描"""
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        index_path = os.path.join(cache_dir.name, "cache", "index.json")
+        first = get_recent_files(self.root, recursive=True, index_path=index_path)
+        self.assertTrue(os.path.exists(index_path))
+
+        with mock.patch.object(file_utils.os, 'scandir', side_effect=AssertionError("不应重新扫描")):
+            second = get_recent_files(self.root, recursive=True, index_path=index_path)
+        self.assertEqual(first, second)
+
+        # 原地改写文件不改变目录修改时间，但仍能取得新的修改时间
+        rewritten = os.path.join(self.root, "a.csv")
+        dir_stat = os.stat(self.root)
+        with open(rewritten, 'w') as f:
+            f.write("rewritten")
+        os.utime(rewritten, (800, 800))
+        os.utime(self.root, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+        with mock.patch.object(file_utils.os, 'scandir', side_effect=AssertionError("不应重新扫描")):
+            recent = get_recent_files(self.root, max_count=1, recursive=True, index_path=index_path)
+        self.assertEqual(recent, [rewritten])
+
+        # 新增文件会改变目录修改时间，只有该目录被重新扫描
+        new_path = os.path.join(self.root, "sub", "f.csv")
+        with open(new_path, 'w') as f:
+            f.write("new")
+        os.utime(new_path, (900, 900))
+        recent = get_recent_files(self.root, max_count=1, recursive=True, index_path=index_path)
+        self.assertEqual(recent, [new_path])
+
+
+if __name__ == "__main__":
+    unittest.main()
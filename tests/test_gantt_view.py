@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+原生甘特图视图单元测试
+"""
+
+import os
+import unittest
+from datetime import datetime, timedelta
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+try:
+    from PyQt5.QtWidgets import QApplication
+except ImportError:
+    QApplication = None
+
+from gantt_app.core.chart_improved import Task, GanttChart
+
+
+@unittest.skipIf(QApplication is None, "需要PyQt5")
+class TestGanttView(unittest.TestCase):
+    """虚拟化视图测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """创建一个大图表"""
+        from gantt_app.ui.gantt_view import GanttView
+
+        self.chart = GanttChart()
+        base = datetime(2025, 1, 1)
+        for i in range(10000):
+            start = base + timedelta(days=i % 365)
+            self.chart.add_task(Task(f"人员{i % 20}", f"T-{i}", f"任务{i}", start, start + timedelta(days=5), 40))
+        self.view = GanttView(self.chart, row_height=20)
+        self.view.resize(800, 400)
+        self.view.show()
+        self.app.processEvents()
+
+    def tearDown(self):
+        self.view.close()
+
+    def _items(self):
+        return self.view.scene().items()
+
+    def test_only_visible_items_created(self):
+        """测试只为可见行创建图元"""
+        self.assertGreater(self.view.item_count(), 0)
+        self.assertLessEqual(self.view.item_count(), 400 // 20 + 1)
+
+    def test_items_recycled_on_scroll(self):
+        """测试滚动时复用图元而不是不断新建"""
+        created = len(self._items())
+        bar = self.view.verticalScrollBar()
+        for value in range(0, bar.maximum(), bar.maximum() // 20):
+            bar.setValue(value)
+            self.view.horizontalScrollBar().setValue(int(self.view.date_to_x(
+                self.chart.tasks[self.view.visible_rows().start].start_date)))
+        self.assertLessEqual(len(self._items()), created * 3)
+        for row in self.view._active:
+            self.assertIn(row, self.view.visible_rows())
+
+    def test_drag_reschedules_task(self):
+        """测试拖动任务条修改任务日期"""
+        moved = []
+        self.view.taskMoved.connect(moved.append)
+        row, item = next(iter(self.view._active.items()))
+        task = self.chart.tasks[row]
+        old_start, old_end = task.start_date, task.end_date
+
+        item.setPos(item.pos().x() + 3 * self.view.pixels_per_day + 2, item.pos().y() + 50)
+        self.view.finish_drag(item)
+
+        self.assertEqual(task.start_date, old_start + timedelta(days=3))
+        self.assertEqual(task.end_date, old_end + timedelta(days=3))
+        self.assertEqual(moved, [row])
+        self.assertEqual(item.pos().y(), row * 20 + 3)
+
+    def test_main_window(self):
+        """测试主窗口使用原生视图并同步行高"""
+        from gantt_app.ui.main_window import MainWindow
+
+        window = MainWindow()
+        window.set_chart(self.chart)
+        self.assertEqual(window.task_model.rowCount(), 10000)
+        self.assertEqual(window.chart_view.row_height,
+                         window.task_table.verticalHeader().defaultSectionSize())
+        window.close()
+
+    def test_main_window_undo_drag(self):
+        """测试主窗口中拖动后撤销与重做"""
+        from gantt_app.ui.main_window import MainWindow
+
+        window = MainWindow()
+        window.set_chart(self.chart)
+        view = window.chart_view
+        view.resize(800, 400)
+        self.app.processEvents()
+        row, item = next(iter(view._active.items()))
+        task = self.chart.tasks[row]
+        old_start = task.start_date
+
+        for _ in range(3):
+            item.setPos(item.pos().x() + view.pixels_per_day, item.pos().y())
+            view.finish_drag(item)
+        self.assertEqual(task.start_date, old_start + timedelta(days=3))
+        self.assertTrue(window.undo_action.isEnabled())
+
+        window.on_undo()
+        self.assertEqual(task.start_date, old_start)
+        self.assertFalse(window.undo_action.isEnabled())
+        window.on_redo()
+        self.assertEqual(task.start_date, old_start + timedelta(days=3))
+        window.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
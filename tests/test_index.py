@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+任务索引单元测试
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.index import IN_PROGRESS, NOT_STARTED, RunningExtreme
+
+
+def make_task(artfid, assignee, progress=0):
+    """创建测试任务"""
+    start = datetime(2025, 5, 1)
+    return Task(assignee, artfid, f"任务{artfid}", start, start + timedelta(days=3), progress)
+
+
+class TestTaskIndex(unittest.TestCase):
+    """任务索引测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.chart = GanttChart()
+        for task in [make_task("A", "张三"), make_task("B", "李四", 50),
+                     make_task("C", "张三,李四", 30), make_task("D", "王五", 100)]:
+            self.chart.add_task(task)
+
+    def test_lookup_by_id(self):
+        """测试按ID查找"""
+        self.assertIs(self.chart.get_task("C"), self.chart.tasks[2])
+        self.assertIsNone(self.chart.get_task("missing"))
+
+    def test_tasks_for_assignee(self):
+        """测试按负责人查找，多人负责的任务对每个人可见"""
+        self.assertEqual([t.artfId for t in self.chart.tasks_for("张三")], ["A", "C"])
+        self.assertEqual([t.artfId for t in self.chart.tasks_for("李四")], ["B", "C"])
+        self.assertEqual(self.chart.tasks_for("无名"), [])
+
+    def test_query_intersection(self):
+        """测试组合条件查询"""
+        self.assertEqual([t.artfId for t in self.chart.query(assignee="李四", progress=IN_PROGRESS)],
+                         ["B", "C"])
+        self.assertEqual([t.artfId for t in self.chart.query(assignee="张三", progress=NOT_STARTED)],
+                         ["A"])
+        self.assertEqual([t.artfId for t in self.chart.query(ids=["A", "D"], progress="done")], ["D"])
+        self.assertEqual(self.chart.query(), [])
+
+    def test_duplicate_detection(self):
+        """测试插入时检测重复ID"""
+        self.chart.add_task(make_task("A", "赵六"))
+        self.assertEqual(self.chart.index.duplicates, {"A": [4]})
+        self.assertIs(self.chart.get_task("A"), self.chart.tasks[0])
+
+        # 移除第一个后，重复的任务成为该ID的唯一任务
+        self.chart.remove_tasks([self.chart.tasks[0]])
+        self.assertEqual(self.chart.index.duplicates, {})
+        self.assertEqual(self.chart.get_task("A").assignTo, "赵六")
+
+    def test_replace_and_clear(self):
+        """测试替换任务与清空后索引保持一致"""
+        self.chart.replace_task(1, make_task("B", "王五", 100))
+        self.assertEqual([t.artfId for t in self.chart.tasks_for("王五")], ["B", "D"])
+        self.assertEqual([t.artfId for t in self.chart.tasks_for("李四")], ["C"])
+
+        self.chart.clear_tasks()
+        self.assertIsNone(self.chart.get_task("B"))
+        self.assertEqual(self.chart.tasks_for("王五"), [])
+
+
+class TestRunningExtreme(unittest.TestCase):
+    """增量最值测试"""
+
+    def test_min_and_max_with_discard(self):
+        """删除当前最值后回退到次值，重复值按计数删除"""
+        low, high = RunningExtreme(), RunningExtreme(maximum=True)
+        for value in [5, 3, 3, 9]:
+            low.add(value)
+            high.add(value)
+        self.assertEqual((low.value(), high.value()), (3, 9))
+        low.discard(3)
+        high.discard(9)
+        self.assertEqual((low.value(), high.value()), (3, 5))
+        low.discard(3)
+        self.assertEqual(low.value(), 5)
+
+    def test_chart_date_range_follows_updates(self):
+        """修改任务日期后甘特图的日期范围随之更新"""
+        chart = GanttChart()
+        chart.add_task(make_task("A", "张三"))
+        chart.add_task(make_task("B", "李四"))
+        self.assertEqual(chart.date_range(), (datetime(2025, 5, 1), datetime(2025, 5, 4)))
+        chart.update_task(1, start_date=datetime(2025, 4, 1), end_date=datetime(2025, 6, 1))
+        self.assertEqual(chart.date_range(), (datetime(2025, 4, 1), datetime(2025, 6, 1)))
+        chart.remove_rows([1])
+        self.assertEqual(chart.date_range(), (datetime(2025, 5, 1), datetime(2025, 5, 4)))
+        chart.clear_tasks()
+        self.assertIsNone(chart.date_range())
+
+    def test_direct_edit_then_update(self):
+        """直接修改任务对象后，绘图仍显示完整范围，之后的 update_task 去掉旧值"""
+        chart = GanttChart()
+        chart.add_task(make_task("A", "张三"))
+        chart.tasks[0].end_date = datetime(2025, 8, 1)
+        ax = chart.draw(Figure())
+        self.assertAlmostEqual(ax.get_xlim()[1], mdates.date2num(datetime(2025, 8, 1)))
+        chart.update_task(0, end_date=datetime(2025, 5, 3))
+        self.assertEqual(chart.date_range(), (datetime(2025, 5, 1), datetime(2025, 5, 3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多数据源导入单元测试
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+from gantt_app.core.ingest import IngestPipeline, Source, combine_sheets, load_workbook
+from gantt_app.core.schema import SchemaProfile, default_registry
+
+
+def write_csv(path, rows, mtime):
+    """写出测试CSV并设置修改时间"""
+    pd.DataFrame([{'AssignTo': assignee, 'ArtifactID': artfid, 'Description': artfid,
+                   'Start': '2025-05-01', 'End': end, 'Progress': progress}
+                  for assignee, artfid, end, progress in rows]).to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+class TestIngestPipeline(unittest.TestCase):
+    """导入流程测试"""
+
+    def setUp(self):
+        """准备三个有重叠ID的数据源"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.old = os.path.join(self.tmpdir.name, "old.csv")
+        self.new = os.path.join(self.tmpdir.name, "new.csv")
+        self.other = os.path.join(self.tmpdir.name, "other.csv")
+        write_csv(self.old, [("张三", "A", "2025-05-05", 10), ("张三", "B", "2025-05-06", 0)], 1000)
+        write_csv(self.new, [("张三", "A", "2025-05-09", 60), ("李四", "C", "2025-05-07", 0)], 2000)
+        write_csv(self.other, [("王五", "B", "2025-05-20", 90)], 1500)
+
+    def tearDown(self):
+        """清理临时目录"""
+        self.tmpdir.cleanup()
+
+    def test_latest_wins(self):
+        """测试默认保留最新文件中的任务"""
+        result = IngestPipeline([self.old, self.new, self.other]).run()
+        chart = result.chart
+        self.assertEqual([t.artfId for t in chart.tasks], ["A", "B", "C"])
+        self.assertEqual(chart.get_task("A").progress, 60)
+        self.assertEqual(chart.get_task("B").source, self.other)
+        self.assertEqual(result.sources_of("A"), [self.old, self.new])
+        self.assertEqual(result.conflicts["A"], [self.old])
+
+    def test_source_priority(self):
+        """测试按数据源优先级合并"""
+        sources = [Source(self.old, priority=10), Source(self.new, priority=1), Source(self.other, priority=5)]
+        chart = IngestPipeline(sources, policy='priority').run().chart
+        self.assertEqual(chart.get_task("A").progress, 10)
+        self.assertEqual(chart.get_task("B").source, self.old)
+        self.assertEqual(chart.get_task("C").source, self.new)
+
+    def test_failures_do_not_abort(self):
+        """测试单个数据源失败时其余照常合并"""
+        missing = os.path.join(self.tmpdir.name, "missing.csv")
+        result = IngestPipeline([missing, self.new]).run()
+        self.assertIn(missing, result.errors)
+        self.assertEqual(len(result.chart.tasks), 2)
+
+    def test_async_and_processes(self):
+        """测试asyncio与进程池方式得到相同结果"""
+        pipeline = IngestPipeline([self.old, self.new, self.other], max_workers=2, use_processes=True)
+        result = asyncio.run(pipeline.run_async())
+        self.assertEqual(sorted(t.artfId for t in result.chart.tasks), ["A", "B", "C"])
+        self.assertEqual(result.chart.get_task("A").progress, 60)
+
+    def test_invalid_policy(self):
+        """测试不支持的策略"""
+        with self.assertRaises(ValueError):
+            IngestPipeline([self.old], policy='random')
+
+
+def team_sheet(prefix, count):
+    """一个团队工作表"""
+    return pd.DataFrame({'ID': [f"{prefix}-{i}" for i in range(count)],
+                         'Task': [f"{prefix}任务{i}" for i in range(count)],
+                         'Owner': [prefix] * count,
+                         'Start': ['2025-05-01'] * count,
+                         'Due': ['2025-05-08'] * count})
+
+
+class TestWorkbookIngest(unittest.TestCase):
+    """多工作表导入测试"""
+
+    def frames(self, sheets):
+        return {name: (df, default_registry.resolve(list(df.columns))) for name, df in sheets.items()}
+
+    def test_combine_sheets(self):
+        """各工作表按顺序合并，记录工作表来源"""
+        frames = self.frames({'前端': team_sheet('FE', 3), '后端': team_sheet('BE', 2)})
+        result = combine_sheets('plan.xlsx', frames, max_workers=2)
+        self.assertEqual([task.artfId for task in result.chart.tasks], ['FE-0', 'FE-1', 'FE-2', 'BE-0', 'BE-1'])
+        self.assertEqual(result.sheets, {'前端': [0, 1, 2], '后端': [3, 4]})
+        self.assertEqual(result.sheet_of(3), '后端')
+        self.assertEqual(result.sources_of('FE-1'), ['前端'])
+        self.assertEqual({task.source for task in result.chart.tasks}, {'plan.xlsx'})
+
+    def test_sheet_failure_does_not_abort(self):
+        """单个工作表转换失败时其余工作表照常导入"""
+        frames = self.frames({'前端': team_sheet('FE', 2)})
+        broken = SchemaProfile('broken', {'Description': 'Missing'})
+        frames['损坏'] = (team_sheet('XX', 2), broken)
+        result = combine_sheets('plan.xlsx', frames, errors={'空白': 'ValueError: 无法读取'})
+        self.assertEqual(len(result.chart.tasks), 2)
+        self.assertIn('KeyError', result.errors['损坏'])
+        self.assertIn('空白', result.errors)
+
+    def test_empty_sheet_reported(self):
+        """空白工作表不转换，记录在 empty 中"""
+        frames = self.frames({'前端': team_sheet('FE', 2)})
+        frames['空白'] = (pd.DataFrame(), None)
+        result = combine_sheets('plan.xlsx', frames)
+        self.assertEqual(list(result.sheets), ['前端'])
+        self.assertEqual(result.empty, ['空白'])
+
+    def test_generated_ids_are_unique_across_sheets(self):
+        """缺少ID的任务以工作表名称为前缀生成ID，重复的ID都保留"""
+        first, second = team_sheet('A', 2), team_sheet('A', 1)
+        frames = self.frames({'一组': first.drop(columns=['ID']), '二组': second})
+        frames['三组'] = frames['二组']
+        result = combine_sheets('plan.xlsx', frames)
+        ids = [task.artfId for task in result.chart.tasks]
+        self.assertEqual(ids[:2], ['一组-ID-0001', '一组-ID-0002'])
+        self.assertEqual(result.sources_of('A-0'), ['二组', '三组'])
+        self.assertIn('A-0', result.chart.index.duplicates)
+
+    @unittest.skipIf(openpyxl is None, "需要openpyxl")
+    def test_load_workbook(self):
+        """各工作表在工作线程或进程中分别解析，空白工作表与不存在的工作表都被记录"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "plan.xlsx")
+            with pd.ExcelWriter(path) as writer:
+                team_sheet('FE', 2).to_excel(writer, sheet_name='前端', index=False)
+                team_sheet('BE', 3).to_excel(writer, sheet_name='后端', index=False)
+                team_sheet('QA', 1).to_excel(writer, sheet_name='测试', index=False)
+                pd.DataFrame().to_excel(writer, sheet_name='空白', index=False)
+            for use_processes in (False, True):
+                result = load_workbook(path, sheets=['前端', 2, '空白', '不存在'], use_processes=use_processes)
+                self.assertEqual(list(result.sheets), ['前端', '测试'])
+                self.assertEqual([task.artfId for task in result.chart.tasks], ['FE-0', 'FE-1', 'QA-0'])
+                self.assertEqual(result.empty, ['空白'])
+                self.assertIn('不存在', result.errors)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+标签布局单元测试
+"""
+
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core import labels
+from gantt_app.core.labels import LabelLayer, TextMetrics, get_metrics, resolve_collisions
+
+
+class TestResolveCollisions(unittest.TestCase):
+    """碰撞剔除测试"""
+
+    def test_overlapping_boxes_in_same_band(self):
+        """测试同一带内重叠的标签只保留先出现的"""
+        left = np.array([0.0, 5.0, 20.0, 0.0])
+        right = np.array([10.0, 15.0, 30.0, 10.0])
+        bottom = np.array([0.0, 0.0, 0.0, 20.0])
+        accepted = resolve_collisions(left, bottom, right, bottom + 8, band=10)
+        np.testing.assert_array_equal(accepted, [True, False, True, True])
+
+    def test_box_spanning_two_bands(self):
+        """测试跨两个带的标签与两个带都做检查"""
+        left = np.array([0.0, 5.0])
+        bottom = np.array([12.0, 5.0])
+        accepted = resolve_collisions(left, bottom, left + 10, bottom + 8, band=10)
+        np.testing.assert_array_equal(accepted, [True, False])
+
+
+class TestTextMetrics(unittest.TestCase):
+    """文字度量测试"""
+
+    def test_widths_are_cached_per_character(self):
+        """测试按字符缓存宽度"""
+        metrics = get_metrics(8)
+        self.assertIs(metrics, get_metrics(8))
+        width = metrics.width("2025-05-01")
+        self.assertAlmostEqual(width, sum(metrics.char_width(c) for c in "2025-05-01"))
+        self.assertIs(metrics.path("任务"), metrics.path("任务"))
+
+    def test_path_cache_is_bounded(self):
+        """测试字形路径缓存有上限，淘汰最久未用的字符串"""
+        metrics = TextMetrics(8)
+        with mock.patch.object(labels, 'PATH_CACHE_SIZE', 3):
+            first = metrics.path("a")
+            for text in ("b", "c", "a", "d"):
+                metrics.path(text)
+        self.assertEqual(list(metrics._paths), ["c", "a", "d"])
+        self.assertIs(metrics.path("a"), first)
+
+
+class TestLabelRendering(unittest.TestCase):
+    """图表标签渲染测试"""
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_crowded_chart_culls_labels(self):
+        """测试拥挤的图表只绘制放得下的标签，且只用一个标签对象"""
+        chart = GanttChart()
+        base = datetime(2025, 5, 1)
+        for i in range(300):
+            chart.add_task(Task("张三", f"T-{i}", f"很长的任务描述{i}", base, base + timedelta(days=2)))
+
+        fig, ax = plt.subplots(figsize=(6, 4))
+        ax.set_xlim(base, base + timedelta(days=10))
+        ax.set_ylim(0, 301)
+        layer = chart._task_labels(np.arange(300, 0, -1, dtype=float))
+        ax.add_artist(layer)
+        fig.canvas.draw()
+
+        self.assertEqual(len(layer.texts), 900)
+        self.assertGreater(layer.visible_count, 0)
+        self.assertLess(layer.visible_count, 100)
+
+    def test_description_requires_room_inside_bar(self):
+        """测试描述文本在任务条内放不下时不显示"""
+        fig, ax = plt.subplots(figsize=(6, 2))
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 2)
+        layer = LabelLayer([1.0, 1.0], [0.5, 1.5], ["短", "很长很长很长很长的描述"],
+                           ['left', 'left'], ['center', 'center'], max_width=[3.0, 0.2])
+        ax.add_artist(layer)
+        fig.canvas.draw()
+        np.testing.assert_array_equal(layer.layout(fig.canvas.get_renderer()), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
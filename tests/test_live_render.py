@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+保留模式渲染器单元测试
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import matplotlib.dates as mdates
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.live_render import RetainedGanttRenderer
+
+
+def make_task(i):
+    """创建测试任务"""
+    start = datetime(2025, 5, 1) + timedelta(days=i % 30)
+    return Task("张三", f"T-{i}", f"任务{i}", start, start + timedelta(days=3), 50)
+
+
+class TestChartNotifications(unittest.TestCase):
+    """甘特图变化通知测试"""
+
+    def test_events(self):
+        """增删改都会通知订阅者"""
+        chart = GanttChart()
+        events = []
+        chart.subscribe(lambda event, rows: events.append((event, list(rows))))
+        chart.add_task(make_task(0))
+        chart.add_task(make_task(1))
+        chart.update_task(0, progress=80)
+        chart.remove_rows([1])
+        chart.clear_tasks()
+        self.assertEqual(events, [('added', [0]), ('added', [1]), ('modified', [0]),
+                                  ('removed', [1]), ('reset', [])])
+
+    def test_update_unknown_field(self):
+        """修改不存在的字段时抛出异常"""
+        chart = GanttChart()
+        chart.add_task(make_task(0))
+        with self.assertRaises(AttributeError):
+            chart.update_task(0, owner="李四")
+
+
+class TestRetainedGanttRenderer(unittest.TestCase):
+    """保留模式渲染器测试"""
+
+    def setUp(self):
+        """准备200个任务，纵轴只显示前10行"""
+        self.chart = GanttChart()
+        for i in range(200):
+            self.chart.add_task(make_task(i))
+        self.renderer = RetainedGanttRenderer(self.chart)
+        self.renderer.ax.set_ylim(190.5, 200.5)
+
+    def tearDown(self):
+        self.renderer.close()
+
+    def test_visible_rows_only(self):
+        """集合中只包含可见范围内的任务条"""
+        self.assertLessEqual(len(self.renderer.bars.get_paths()), 12)
+        self.assertIsNotNone(self.renderer.artists_for(self.chart.tasks[3]))
+        self.assertIsNone(self.renderer.artists_for(self.chart.tasks[150]))
+
+    def test_edit_updates_single_row(self):
+        """修改一个任务只改变对应的路径"""
+        task = self.chart.tasks[3]
+        index, _ = self.renderer.artists_for(task)
+        others = [p.vertices.copy() for i, p in enumerate(self.renderer.bars.get_paths()) if i != index]
+
+        self.chart.update_task(3, start_date=datetime(2025, 6, 1), end_date=datetime(2025, 6, 11), color='red')
+        self.assertEqual(self.renderer.update(), 1)
+
+        path = self.renderer.bars.get_paths()[index]
+        self.assertEqual(tuple(self.renderer.bars.get_facecolor()[index]), (1.0, 0.0, 0.0, 0.8))
+        start = mdates.date2num(datetime(2025, 6, 1))
+        self.assertAlmostEqual(path.vertices[0, 0], start)
+        self.assertAlmostEqual(path.vertices[2, 0], start + 10)
+        self.assertAlmostEqual(self.renderer.progress.get_paths()[index].vertices[2, 0], start + 5)
+        unchanged = [p.vertices for i, p in enumerate(self.renderer.bars.get_paths()) if i != index]
+        for before, after in zip(others, unchanged):
+            self.assertTrue((before == after).all())
+        self.assertEqual(self.renderer.labels.texts[200 + 3], '2025-06-01')
+
+    def test_date_range_extends_xlim(self):
+        """任务超出原日期范围时x轴随之扩展"""
+        self.chart.update_task(0, end_date=datetime(2025, 12, 31))
+        self.renderer.update()
+        self.assertAlmostEqual(self.renderer.ax.get_xlim()[1], mdates.date2num(datetime(2025, 12, 31)))
+
+    def test_structural_change_rebuilds(self):
+        """增删任务后重建映射"""
+        removed = self.chart.tasks[0]
+        self.chart.remove_rows([0])
+        self.chart.add_task(make_task(500))
+        self.assertEqual(self.renderer.update(), 200)
+        self.assertIsNone(self.renderer.row_of(removed))
+        self.assertEqual(self.renderer.row_of(self.chart.tasks[-1]), 199)
+        self.assertEqual(len(self.renderer.labels.texts), 600)
+
+    def test_scroll_and_draw(self):
+        """滚动后可见行随之切换，绘制不出错"""
+        self.renderer.ax.set_ylim(0.5, 10.5)
+        self.assertIsNotNone(self.renderer.artists_for(self.chart.tasks[195]))
+        self.assertIsNone(self.renderer.artists_for(self.chart.tasks[3]))
+        self.chart.update_task(195, color='red')
+        self.renderer.draw()
+        index, _ = self.renderer.artists_for(self.chart.tasks[195])
+        self.assertEqual(tuple(self.renderer.bars.get_facecolor()[index][:3]), (1.0, 0.0, 0.0))
+
+    def test_close_unsubscribes(self):
+        """取消订阅后不再接收变化"""
+        self.renderer.close()
+        self.chart.update_task(0, progress=90)
+        self.assertEqual(self.renderer.update(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
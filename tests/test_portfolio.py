@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多项目组合单元测试
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.portfolio import Portfolio, StringPool
+
+
+START = datetime(2025, 5, 1)
+
+
+def make_chart(rows):
+    """按 (负责人, ID, 开始偏移, 天数) 创建甘特图"""
+    chart = GanttChart()
+    for assignee, artfid, offset, length in rows:
+        start = START + timedelta(days=offset)
+        # 拼接出新的字符串对象，模拟从不同文件读入的重复字符串
+        chart.add_task(Task("".join(list(assignee)), artfid, artfid, start, start + timedelta(days=length)))
+    return chart
+
+
+def task_count(chart):
+    """子进程中运行的分析函数"""
+    return len(chart.tasks)
+
+
+class TestPortfolio(unittest.TestCase):
+    """项目组合测试"""
+
+    def setUp(self):
+        """两个项目共享负责人"""
+        self.alpha = make_chart([("张三", "A-1", 0, 3), ("张三, 李四", "A-2", 2, 2), ("王五", "A-3", 5, 1)])
+        self.beta = make_chart([("李四", "B-1", 1, 4), ("张三", "B-2", 1, 0)])
+        self.portfolio = Portfolio()
+        self.portfolio.add_project("alpha", self.alpha)
+        self.portfolio.add_project("beta", self.beta)
+
+    def test_shared_strings(self):
+        """测试相同的负责人与日期在项目间只保留一个实例"""
+        self.assertIs(self.alpha.tasks[0].assignTo, self.beta.tasks[1].assignTo)
+        self.assertIs(self.beta.tasks[0].start_date, self.beta.tasks[1].start_date)
+        pool = StringPool()
+        self.assertEqual(pool.code("x"), pool.code("x"))
+        self.assertIsNone(pool.find("y"))
+        with self.assertRaises(ValueError):
+            self.portfolio.add_project("alpha", GanttChart())
+
+    def test_tasks_for(self):
+        """测试跨项目查询某人的任务，返回原任务对象"""
+        tasks = self.portfolio.tasks_for("李四")
+        self.assertEqual([(name, task.artfId) for name, task in tasks], [("alpha", "A-2"), ("beta", "B-1")])
+        self.assertIs(tasks[0][1], self.alpha.tasks[1])
+        self.assertEqual(self.portfolio.tasks_for("无人"), [])
+        self.assertEqual(self.portfolio.people(), sorted(["张三", "李四", "王五"]))
+
+    def test_resource_load(self):
+        """测试组合范围的每日资源负荷"""
+        load = self.portfolio.resource_load()
+        self.assertEqual(len(load), 6)
+        # 张三: A-1 第0-2天, A-2 第2-3天, B-2 第1天（至少1天）
+        self.assertEqual(load["张三"].tolist(), [1, 2, 2, 1, 0, 0])
+        self.assertEqual(load["李四"].tolist(), [0, 1, 2, 2, 1, 0])
+        self.assertEqual(load["王五"].tolist(), [0, 0, 0, 0, 0, 1])
+
+        window = self.portfolio.resource_load(START + timedelta(days=2), START + timedelta(days=4), ["张三"])
+        self.assertEqual(window["张三"].tolist(), [2, 1])
+
+    def test_refresh_and_workers(self):
+        """测试修改后刷新缓存，以及分片并行计算"""
+        self.alpha.tasks[2].assignTo = "张三"
+        self.portfolio.refresh("alpha")
+        serial = self.portfolio.resource_load()
+        self.assertEqual(serial["张三"].tolist()[-1], 1)
+        parallel = self.portfolio.resource_load(workers=2)
+        self.assertTrue(serial.equals(parallel))
+        self.assertEqual(self.portfolio.map_projects(task_count, workers=2), {"alpha": 3, "beta": 2})
+        self.assertEqual(self.portfolio.summary().loc["beta", "Tasks"], 2)
+
+    def test_cache_follows_chart_changes(self):
+        """测试通过甘特图方法增删任务后无需手动刷新"""
+        self.assertEqual(len(self.portfolio.tasks_for("李四")), 2)
+        self.beta.remove_rows([0])
+        self.assertEqual([task.artfId for _, task in self.portfolio.tasks_for("李四")], ["A-2"])
+        self.beta.add_task(Task("赵六", "B-3", "B-3", START, START + timedelta(days=1)))
+        self.assertEqual([task.artfId for _, task in self.portfolio.tasks_for("赵六")], ["B-3"])
+
+        self.portfolio.remove_project("beta")
+        self.beta.add_task(Task("赵六", "B-4", "B-4", START, START + timedelta(days=1)))
+        self.assertNotIn("beta", self.portfolio._columns)
+        self.assertEqual(self.beta._listeners, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+进度历史与挣值分析单元测试
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.progress_history import ProgressHistory
+
+
+START = datetime(2025, 5, 1)
+
+
+def make_task(artfid, start_offset, length, progress=0, assignee="张三"):
+    """创建测试任务"""
+    start = START + timedelta(days=start_offset)
+    return Task(assignee, artfid, f"任务{artfid}", start, start + timedelta(days=length), progress)
+
+
+class TestProgressHistory(unittest.TestCase):
+    """进度历史测试"""
+
+    def setUp(self):
+        """A: 第0-10天，预算10；B: 第5-10天，预算5"""
+        self.chart = GanttChart()
+        self.chart.add_task(make_task("A", 0, 10))
+        self.chart.add_task(make_task("B", 5, 5, assignee="李四"))
+        self.history = ProgressHistory()
+        self.history.record(self.chart.tasks, START)
+        self.chart.tasks[0].progress = 50
+        self.history.record(self.chart.tasks, START + timedelta(days=5), actual_costs={"A": 4})
+        self.chart.tasks[0].progress = 100
+        self.chart.tasks[1].progress = 40
+        self.history.record(self.chart.tasks, START + timedelta(days=10), actual_costs={"A": 12, "B": 2})
+
+    def test_delta_encoding(self):
+        """测试只保存变化的任务"""
+        self.assertEqual(len(self.history), 3)
+        self.assertEqual(self.history.record(self.chart.tasks, START + timedelta(days=11)), 0)
+        series = self.history.task_series("A")
+        self.assertEqual(series.tolist(), [50.0, 100.0])
+
+    def test_project_curves(self):
+        """测试整个项目的PV、EV、AC、SPI与燃尽"""
+        curves = self.history.curves()
+        np.testing.assert_allclose(curves.pv[:, 0], [0, 5, 15])
+        np.testing.assert_allclose(curves.ev[:, 0], [0, 5, 12])
+        np.testing.assert_allclose(curves.ac[:, 0], [0, 4, 14])
+        np.testing.assert_allclose(curves.remaining[:, 0], [15, 10, 3])
+        self.assertTrue(np.isnan(curves.spi[0, 0]))
+        self.assertAlmostEqual(curves.spi[2, 0], 12 / 15)
+        self.assertAlmostEqual(curves.cpi[2, 0], 12 / 14)
+
+    def test_assignee_curves(self):
+        """测试按负责人汇总与日期范围过滤"""
+        curves = self.history.curves('assignee', start=START + timedelta(days=1))
+        self.assertEqual(curves.groups, ["张三", "李四"])
+        self.assertEqual(len(curves.dates), 2)
+        np.testing.assert_allclose(curves.group("李四")['ev'], [0, 2])
+        frame = curves.to_frame()
+        self.assertEqual(len(frame), 4)
+
+    def test_save_and_load(self):
+        """测试保存与加载"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "history.npz")
+            self.history.save(path)
+            loaded = ProgressHistory.load(path)
+        np.testing.assert_allclose(loaded.curves('assignee').ev, self.history.curves('assignee').ev)
+        self.chart.tasks[1].progress = 80
+        self.assertEqual(loaded.record(self.chart.tasks, START + timedelta(days=12)), 1)
+
+    def test_dates_must_not_go_back(self):
+        """测试快照日期不能倒退"""
+        with self.assertRaises(ValueError):
+            self.history.record(self.chart.tasks, START)
+
+    def test_chart_records_and_renders(self):
+        """测试导出时自动记录并在甘特图下方绘制曲线"""
+        self.chart.history = self.history
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.chart.export_csv(os.path.join(tmpdir, "tasks.csv"))
+            self.assertEqual(len(self.history), 4)
+            fig = self.chart.render(save_path=os.path.join(tmpdir, "gantt.png"), history=self.history)
+        self.assertEqual(len(fig.axes), 2)
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+渐进式导出单元测试
+"""
+
+import io
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from matplotlib.image import imread
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.figure_pool import FigurePool
+from gantt_app.core.progressive import export_progressive, tight_bbox
+
+
+def make_chart(count=6):
+    """创建测试甘特图"""
+    chart = GanttChart()
+    for i in range(count):
+        start = datetime(2025, 5, 1) + timedelta(days=i * 2)
+        chart.add_task(Task("张三", f"T-{i}", f"任务{i}", start, start + timedelta(days=4), 30))
+    return chart
+
+
+class TestProgressiveExport(unittest.TestCase):
+    """渐进式导出测试"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pool = FigurePool()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.chart = make_chart()
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.tmpdir.cleanup()
+
+    def test_tight_bbox_matches_matplotlib(self):
+        """计算的边界与 bbox_inches='tight' 的结果一致"""
+        with self.pool.figure(figsize=(6, 4)) as fig:
+            self.chart.draw(fig)
+            bbox = tight_bbox(fig, pad_inches=0)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=50, bbox_inches='tight', pad_inches=0)
+        height, width = imread(io.BytesIO(buffer.getvalue())).shape[:2]
+        self.assertAlmostEqual(bbox.width * 50, width, delta=2)
+        self.assertAlmostEqual(bbox.height * 50, height, delta=2)
+
+    def test_preview_then_full_resolution(self):
+        """预览立即可用，全分辨率图片在后台生成，两者裁剪范围相同"""
+        path = os.path.join(self.tmpdir.name, "chart.png")
+        job = export_progressive(self.chart, path, dpi=100, preview_dpi=20, figsize=(6, 4),
+                                 pool=self.pool, executor=self.executor)
+        preview = imread(io.BytesIO(job.preview))
+        self.assertEqual(job.result(timeout=60), path)
+        self.assertTrue(job.done())
+        full = imread(path)
+        # 全分辨率是预览的5倍
+        self.assertAlmostEqual(full.shape[1] / preview.shape[1], 5, delta=0.3)
+        self.assertAlmostEqual(full.shape[0] / preview.shape[0], 5, delta=0.3)
+        self.assertAlmostEqual(job.bbox.width * 100, full.shape[1], delta=2)
+        # 同一个Figure在保存完成后放回池中
+        self.assertEqual(self.pool.created, 1)
+        self.assertEqual(len(self.pool), 1)
+
+    def test_preview_returns_before_full_output(self):
+        """全分辨率输出未完成时已经可以拿到预览"""
+        gate = threading.Event()
+        self.executor.submit(gate.wait)
+        job = export_progressive(self.chart, io.BytesIO(), format='png', figsize=(6, 4),
+                                 pool=self.pool, executor=self.executor)
+        self.assertTrue(job.preview.startswith(b'\x89PNG'))
+        self.assertFalse(job.done())
+        gate.set()
+        self.assertGreater(len(job.result(timeout=60).getvalue()), len(job.preview))
+
+    def test_background_error(self):
+        """后台保存失败时异常由 result 抛出，Figure不放回池中"""
+        path = os.path.join(self.tmpdir.name, "missing", "chart.png")
+        job = export_progressive(self.chart, path, figsize=(6, 4), pool=self.pool, executor=self.executor)
+        with self.assertRaises(OSError):
+            job.result(timeout=60)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_empty_chart(self):
+        """没有任务时直接抛出异常"""
+        with self.assertRaises(ValueError):
+            export_progressive(GanttChart(), io.BytesIO(), format='png', pool=self.pool, executor=self.executor)
+        self.assertEqual(len(self.pool), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+蒙特卡洛进度风险模拟单元测试
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.risk import ScheduleSimulator, simulate_schedule
+
+
+START = datetime(2025, 5, 1)
+
+
+def make_task(artfid, start_offset, length, dependencies=None):
+    """创建测试任务"""
+    start = START + timedelta(days=start_offset)
+    return Task("开发者", artfid, f"任务{artfid}", start, start + timedelta(days=length),
+                dependencies=dependencies or [])
+
+
+class TestScheduleSimulator(unittest.TestCase):
+    """进度模拟测试"""
+
+    def setUp(self):
+        """A -> B -> C 为主链，D 与 B 并行且较短"""
+        self.chart = GanttChart()
+        for task in [make_task("A", 0, 5), make_task("B", 5, 4, ["A"]),
+                     make_task("C", 9, 3, ["B"]), make_task("D", 5, 2, ["A"])]:
+            self.chart.add_task(task)
+
+    def test_fixed_estimates_match_plan(self):
+        """测试工期固定时结果与确定性计算一致"""
+        estimates = {"A": (5, 5, 5), "B": (6, 6, 6), "C": (3, 3, 3), "D": (2, 2, 2)}
+        result = simulate_schedule(self.chart, samples=50, seed=1, estimates=estimates)
+        frame = result.percentiles()
+        self.assertEqual(list(frame.index), ["C", "D", "project"])
+        self.assertEqual(frame.loc["C", "P95"], np.datetime64(START + timedelta(days=14)))
+        self.assertEqual(frame.loc["D", "P50"], np.datetime64(START + timedelta(days=7)))
+        self.assertEqual(frame.loc["C", "OnTime"], 0.0)
+        self.assertEqual(result.critical_tasks(), ["A", "B", "C"])
+        self.assertEqual(result.criticality["D"], 0.0)
+
+    def test_pert_percentiles(self):
+        """测试PERT抽样的分位数单调且不早于乐观估计"""
+        result = ScheduleSimulator(self.chart.tasks).run(2000, milestones=["C"], seed=7)
+        frame = result.percentiles()
+        self.assertLessEqual(frame.loc["C", "P50"], frame.loc["C", "P80"])
+        self.assertLessEqual(frame.loc["C", "P80"], frame.loc["C", "P95"])
+        self.assertGreaterEqual(frame.loc["C", "P50"], np.datetime64(START + timedelta(days=9.6)))
+        self.assertEqual(result.criticality["C"], 1.0)
+        self.assertEqual(result.criticality["D"], 0.0)
+        # A 提前完成时 B 受计划开始日期约束，A 不在关键路径上
+        self.assertLess(result.criticality["A"], 1.0)
+
+    def test_triangular_and_workers(self):
+        """测试三角分布与多进程运行"""
+        simulator = ScheduleSimulator(self.chart.tasks, distribution='triangular', batch_size=64)
+        result = simulator.run(300, seed=3, workers=2)
+        self.assertEqual(result.samples, 300)
+        self.assertEqual(result.finish.shape, (300, 3))
+
+    def test_cycle_and_invalid_options(self):
+        """测试循环依赖与不支持的参数"""
+        self.chart.tasks[0].dependencies = ["C"]
+        with self.assertRaises(ValueError):
+            ScheduleSimulator(self.chart.tasks)
+        with self.assertRaises(ValueError):
+            ScheduleSimulator([], distribution='normal')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+列映射配置单元测试
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+from gantt_app.core.chart_improved import GanttChart
+from gantt_app.core.schema import (EXPORT_PROFILE, SchemaProfile, SchemaRegistry,
+                                   default_registry, header_signature, infer_columns)
+
+
+class TestInferColumns(unittest.TestCase):
+    """列名推断测试"""
+
+    def test_whole_word_matching(self):
+        """子串不再误匹配：Pending 不是结束日期，Valid 不是ID"""
+        columns = infer_columns(["Pending", "Valid", "Task Name", "Due Date", "Owner"])
+        self.assertEqual(columns, {'Description': "Task Name", 'EndDate': "Due Date", 'AssignTo': "Owner"})
+
+    def test_id_takes_precedence(self):
+        """带ID的列名识别为任务ID，驼峰命名被拆分"""
+        columns = infer_columns(["Task ID", "ArtifactID", "StartDate", "Actual Start", "% Complete"])
+        self.assertEqual(columns, {'ArtifactID': "Task ID", 'StartDate': "StartDate", 'Progress': "% Complete"})
+
+    def test_chinese_headers(self):
+        """中文列名"""
+        columns = infer_columns(["任务编号", "任务名称", "负责人", "开始日期", "实际开始", "截止日期", "状态"])
+        self.assertEqual(columns, {'ArtifactID': "任务编号", 'Description': "任务名称", 'AssignTo': "负责人",
+                                   'StartDate': "开始日期", 'EndDate': "截止日期", 'Status': "状态"})
+
+
+class TestSchemaRegistry(unittest.TestCase):
+    """配置登记表测试"""
+
+    def test_export_profile_and_cache(self):
+        """导出格式命中已登记的配置，相同表头第二次直接命中缓存"""
+        registry = SchemaRegistry([EXPORT_PROFILE])
+        header = ['AssignTo', 'ArtifactID', 'Description', 'Start', 'End', 'Duration', 'Progress', 'Dependencies']
+        self.assertIs(registry.resolve(header), EXPORT_PROFILE)
+        self.assertIs(registry.resolve(header), EXPORT_PROFILE)
+        self.assertEqual((registry.hits, registry.misses), (1, 1))
+
+    def test_inferred_profile_cached(self):
+        """未知表头只推断一次"""
+        registry = SchemaRegistry()
+        header = ["编号", "名称", "开始", "结束", "备注"]
+        profile = registry.resolve(header)
+        self.assertTrue(profile.name.startswith('inferred-'))
+        self.assertEqual(profile.columns['Description'], "编号")
+        self.assertIs(registry.resolve(list(header)), profile)
+        self.assertNotEqual(header_signature(header), header_signature(header[::-1]))
+
+    def test_signature_cache_is_bounded(self):
+        """表头缓存有上限，最近使用的表头保留"""
+        registry = SchemaRegistry(cache_size=2)
+        first = registry.resolve(["任务", "开始", "结束"])
+        registry.resolve(["任务1", "开始", "结束"])
+        registry.resolve(["任务", "开始", "结束"])
+        registry.resolve(["任务2", "开始", "结束"])
+        self.assertEqual(len(registry._by_signature), 2)
+        self.assertIs(registry.resolve(["任务", "开始", "结束"]), first)
+        self.assertEqual(registry.misses, 3)
+
+    def test_read_options(self):
+        """只读取用到的列，文本列按字符串读取"""
+        profile = SchemaProfile('p', {'ArtifactID': 'Key', 'StartDate': 'From', 'EndDate': 'To'},
+                                dtypes={'StartDate': str})
+        options = profile.read_options()
+        self.assertEqual(options['usecols'], ['Key', 'From', 'To'])
+        self.assertEqual(options['dtype'], {'Key': str, 'From': str})
+        with self.assertRaises(ValueError):
+            SchemaProfile('bad', {'Owner': 'Owner'})
+
+    def test_save_and_load(self):
+        """配置可保存为JSON并重新登记"""
+        profile = SchemaProfile('jira', {'ArtifactID': 'Key', 'StartDate': 'Created', 'EndDate': 'Due'},
+                                date_formats={'StartDate': '%d/%m/%Y'}, dtypes={'ArtifactID': str})
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'profiles.json')
+            SchemaRegistry([profile]).save(path)
+            registry = SchemaRegistry()
+            registry.load(path)
+        loaded = registry.get('jira')
+        self.assertEqual(loaded.columns, profile.columns)
+        self.assertEqual(loaded.date_formats, profile.date_formats)
+        self.assertEqual(loaded.dtypes, {'ArtifactID': 'str'})
+
+
+class TestLoadWithProfiles(unittest.TestCase):
+    """按配置加载文件测试"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        default_registry.profiles.pop('jira', None)
+
+    def test_csv_with_named_profile(self):
+        """使用显式配置：日期格式、保留前导零的ID，未使用的列不影响加载"""
+        path = os.path.join(self.tmpdir.name, 'jira.csv')
+        pd.DataFrame({'Key': ['0012', '0013'], 'Summary': ['设计', '实现'], 'Assignee': ['张三', None],
+                      'Created': ['01/05/2025', '03/05/2025'], 'Due': ['05/05/2025', '20/05/2025'],
+                      'Notes': ['x', 'y']}).to_csv(path, index=False)
+        default_registry.register(SchemaProfile(
+            'jira', {'ArtifactID': 'Key', 'Description': 'Summary', 'AssignTo': 'Assignee',
+                     'StartDate': 'Created', 'EndDate': 'Due'},
+            date_formats={'StartDate': '%d/%m/%Y', 'EndDate': '%d/%m/%Y'}))
+        chart = GanttChart().load_from_csv(path, profile='jira')
+        self.assertEqual([task.artfId for task in chart.tasks], ['0012', '0013'])
+        self.assertEqual(chart.tasks[1].assignTo, '未分配')
+        self.assertEqual(chart.tasks[1].end_date, datetime(2025, 5, 20))
+
+    def test_csv_profile_mismatch(self):
+        """指定的配置与表头不符时报错"""
+        path = os.path.join(self.tmpdir.name, 'tasks.csv')
+        pd.DataFrame({'A': [1]}).to_csv(path, index=False)
+        with self.assertRaises(ValueError):
+            GanttChart().load_from_csv(path, profile=EXPORT_PROFILE)
+
+    @unittest.skipIf(openpyxl is None, "需要openpyxl")
+    def test_excel_inferred_columns(self):
+        """Excel列映射推断：Pending列不会被当作结束日期，审核状态的任务被跳过"""
+        path = os.path.join(self.tmpdir.name, 'tasks.xlsx')
+        pd.DataFrame({'Task ID': ['T-1', 'T-2', 'T-3'], 'Title': ['设计', '实现', '测试'],
+                      'Pending': ['yes', 'no', 'yes'], 'Start': ['2025-05-01', '2025-05-03', 'soon'],
+                      'Due': ['2025-05-05', '2025-05-20', '2025-05-30'],
+                      'Status': ['Open', 'Reviewed', 'Open']}).to_excel(path, index=False)
+        chart = GanttChart().load_from_excel(path)
+        # 第二行已审核，第三行开始日期无法解析
+        self.assertEqual([task.artfId for task in chart.tasks], ['T-1'])
+        self.assertEqual(chart.tasks[0].description, '设计')
+        self.assertEqual(chart.tasks[0].end_date, datetime(2025, 5, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP渲染服务单元测试
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from gantt_app import server
+from gantt_app.server import (SAMPLE_CSV, RenderError, RenderService, chart_from_request, make_server,
+                              parse_options, run_benchmark)
+
+
+CSV_BODY = SAMPLE_CSV.encode('utf-8')
+JSON_BODY = json.dumps({
+    'title': '示例项目',
+    'tasks': [
+        {'AssignTo': '张三', 'ArtifactID': 'T-1', 'Description': '设计', 'Start': '2025-05-01',
+         'End': '2025-05-05', 'Progress': 100},
+        {'AssignTo': '李四', 'ArtifactID': 'T-2', 'Description': '开发', 'Start': '2025-05-06',
+         'End': '2025-05-20', 'Progress': 30, 'Dependencies': ['T-1']},
+    ],
+}, ensure_ascii=False).encode('utf-8')
+
+
+class TestChartFromRequest(unittest.TestCase):
+    """请求数据解析测试"""
+
+    def test_csv(self):
+        """CSV字节直接在内存中解析"""
+        chart = chart_from_request('csv', CSV_BODY, '标题')
+        self.assertEqual([task.artfId for task in chart.tasks], ['T-1', 'T-2', 'T-3'])
+        self.assertEqual(chart.tasks[2].dependencies, ['T-2'])
+        self.assertIsNone(chart.tasks[0].source)
+        self.assertEqual(chart.title, '标题')
+
+    def test_json(self):
+        """JSON任务列表，依赖可以是列表"""
+        chart = chart_from_request('json', JSON_BODY)
+        self.assertEqual(chart.title, '示例项目')
+        self.assertEqual(chart.tasks[1].dependencies, ['T-1'])
+        self.assertEqual(chart.tasks[1].progress, 30)
+
+    def test_invalid(self):
+        """无效数据抛出 ValueError"""
+        with self.assertRaises(ValueError):
+            chart_from_request('json', b'{"tasks": 1}')
+        with self.assertRaises(ValueError):
+            chart_from_request('csv', b'Task,Start,End\nA,never,2025-05-01\n')
+
+    def test_options(self):
+        """查询参数转换为渲染选项"""
+        options = parse_options({'format': ['SVG'], 'dpi': ['72'], 'size': ['8,4']})
+        self.assertEqual(options, {'format': 'svg', 'dpi': 72.0, 'figsize': (8.0, 4.0)})
+        with self.assertRaises(RenderError):
+            parse_options({'format': ['gif']})
+        with self.assertRaises(RenderError):
+            parse_options({'dpi': ['abc']})
+        # 100×100英寸、600dpi 的缓冲约14GB
+        with self.assertRaises(RenderError):
+            parse_options({'dpi': ['600'], 'size': ['100,100']})
+        self.assertEqual(parse_options({'dpi': ['300'], 'size': ['12,8']})['dpi'], 300.0)
+
+
+class TestRenderService(unittest.TestCase):
+    """渲染服务测试"""
+
+    def test_cache(self):
+        """相同请求第二次命中缓存，选项不同时重新渲染"""
+        with RenderService(workers=1, use_processes=False) as service:
+            options = parse_options({'dpi': ['40']})
+            image, outcome = service.render('csv', CSV_BODY, options)
+            self.assertTrue(image.startswith(b'\x89PNG'))
+            self.assertEqual(outcome, 'rendered')
+            self.assertEqual(service.render('csv', CSV_BODY, options), (image, 'hit'))
+            self.assertEqual(service.render('csv', CSV_BODY, dict(options, title='另一个'))[1], 'rendered')
+
+    def test_coalesce(self):
+        """同时到达的相同请求只渲染一次"""
+        with RenderService(workers=1, cache_size=0, use_processes=False) as service:
+            release = threading.Event()
+            # 占住唯一的工作线程，使渲染任务排队
+            service._executor.submit(release.wait)
+            options = parse_options({'dpi': ['40']})
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(service.render('csv', CSV_BODY, options)))
+                       for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            while service.stats()['requests'] < 3:
+                release.wait(0.01)
+            release.set()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(sorted(outcome for _, outcome in results), ['coalesced', 'coalesced', 'rendered'])
+            self.assertEqual(len({image for image, _ in results}), 1)
+            self.assertEqual(service.stats()['rendered'], 1)
+
+    def test_concurrent_start(self):
+        """同时到达的首个请求只创建一个工作池"""
+        service = RenderService(workers=1, use_processes=False)
+        with mock.patch.object(server, 'ThreadPoolExecutor', wraps=server.ThreadPoolExecutor) as created:
+            threads = [threading.Thread(target=service.start) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        service.close()
+        self.assertEqual(created.call_count, 1)
+
+    def test_broken_pool_is_replaced(self):
+        """工作进程异常退出后重建工作池，之后的请求正常渲染"""
+        with RenderService(workers=1, use_processes=True) as service:
+            broken = service._executor
+            with self.assertRaises(BrokenProcessPool):
+                broken.submit(os._exit, 1).result()
+            options = parse_options({'format': ['svg'], 'dpi': ['40']})
+            image, outcome = service.render('csv', CSV_BODY, options)
+            self.assertIn(b'<svg', image)
+            self.assertIsNot(service._executor, broken)
+
+    def test_restart_outside_cache_lock(self):
+        """重建工作池时不持有缓存锁，缓存命中与状态查询不被阻塞"""
+        with RenderService(workers=1, use_processes=True) as service:
+            options = parse_options({'format': ['svg'], 'dpi': ['40']})
+            service.render('csv', CSV_BODY, options)
+            with self.assertRaises(BrokenProcessPool):
+                service._executor.submit(os._exit, 1).result()
+
+            rebuilding, release = threading.Event(), threading.Event()
+            create = service._create_executor
+
+            def slow_create():
+                rebuilding.set()
+                release.wait(10)
+                return create()
+
+            with mock.patch.object(service, '_create_executor', side_effect=slow_create):
+                results = []
+                thread = threading.Thread(target=lambda: results.append(
+                    service.render('csv', CSV_BODY, dict(options, title='重建'))))
+                thread.start()
+                self.assertTrue(rebuilding.wait(10))
+                self.assertTrue(service._lock.acquire(timeout=2))
+                service._lock.release()
+                self.assertEqual(service.render('csv', CSV_BODY, options)[1], 'hit')
+                self.assertEqual(service.stats()['inflight'], 1)
+                release.set()
+                thread.join()
+            self.assertEqual(results[0][1], 'rendered')
+
+    def test_process_workers(self):
+        """工作进程启动时完成预热，渲染结果与线程模式相同格式"""
+        with RenderService(workers=1, use_processes=True) as service:
+            image, outcome = service.render('csv', CSV_BODY, parse_options({'format': ['svg'], 'dpi': ['40']}))
+            self.assertIn(b'<svg', image)
+            self.assertEqual(outcome, 'rendered')
+
+
+class TestRenderServer(unittest.TestCase):
+    """HTTP接口测试"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        with open(os.path.join(cls.root, 'project.csv'), 'wb') as f:
+            f.write(CSV_BODY)
+        cls.service = RenderService(workers=1, root=cls.root, use_processes=False).start()
+        cls.server = make_server(cls.service, port=0, quiet=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+        shutil.rmtree(cls.root)
+
+    def request(self, path, body=None, content_type='text/csv'):
+        """发送请求，返回 (状态码, 响应头, 响应体)"""
+        headers = {'Content-Type': content_type} if body is not None else {}
+        request = urllib.request.Request(self.base + path, data=body, headers=headers)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    def test_post_csv(self):
+        """POST CSV 返回PNG"""
+        status, headers, body = self.request('/render?dpi=40', CSV_BODY)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Content-Type'], 'image/png')
+        self.assertTrue(body.startswith(b'\x89PNG'))
+
+    def test_post_json_svg(self):
+        """POST JSON 返回SVG"""
+        status, headers, body = self.request('/render?format=svg&dpi=40', JSON_BODY, 'application/json')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Content-Type'], 'image/svg+xml')
+        self.assertIn(b'<svg', body)
+
+    def test_path(self):
+        """按路径渲染只允许项目目录内的文件"""
+        status, headers, _ = self.request('/render?path=project.csv&dpi=40')
+        self.assertEqual(status, 200)
+        self.assertEqual(self.request('/render?path=../etc/passwd')[0], 403)
+        self.assertEqual(self.request('/render?path=missing.csv')[0], 404)
+
+    def test_errors(self):
+        """无效请求返回JSON错误"""
+        status, _, body = self.request('/render?format=gif', CSV_BODY)
+        self.assertEqual(status, 400)
+        self.assertIn('error', json.loads(body))
+        self.assertEqual(self.request('/render', b'not,a\ncsv,file\n')[0], 400)
+        self.assertEqual(self.request('/render')[0], 400)
+        self.assertEqual(self.request('/unknown')[0], 404)
+
+    def test_health_and_benchmark(self):
+        """基准测试请求全部成功，状态接口反映缓存命中"""
+        result = run_benchmark(f"{self.base}/render?dpi=40&size=6,4", CSV_BODY, requests=6, concurrency=2)
+        self.assertEqual(result['errors'], 0)
+        self.assertEqual(sum(result['outcomes'].values()), 6)
+        self.assertGreater(result['throughput'], 0)
+        status, _, body = self.request('/health')
+        self.assertEqual(status, 200)
+        self.assertGreaterEqual(json.loads(body)['hits'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
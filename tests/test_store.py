@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+SQLite项目存储单元测试
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.diff import diff_charts
+from gantt_app.core.store import SQLiteStore
+
+
+START = datetime(2025, 5, 1)
+
+
+def make_task(i, assignee="张三", dependencies=None):
+    """创建测试任务，第i个任务从第i*3天开始，持续2天"""
+    start = START + timedelta(days=i * 3, hours=i)
+    return Task(assignee, f"T-{i}", f"任务{i}", start, start + timedelta(days=2), i * 10,
+                dependencies=dependencies)
+
+
+class TestSQLiteStore(unittest.TestCase):
+    """SQLite存储测试"""
+
+    def setUp(self):
+        """写入六个任务到文件数据库"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = SQLiteStore(os.path.join(self.tmpdir.name, "project.db"))
+        self.chart = GanttChart()
+        for i in range(6):
+            assignee = "张三, 李四" if i == 4 else ("张三" if i % 2 else "王五")
+            self.chart.add_task(make_task(i, assignee, [f"T-{i - 1}", "T-0"] if i > 1 else None))
+        self.assertEqual(self.chart.save_to_store(self.store), 6)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_wal_mode(self):
+        """测试文件数据库使用WAL模式"""
+        mode = self.store.conn.execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode, 'wal')
+
+    def test_round_trip(self):
+        """测试完整加载与原图表一致"""
+        loaded = GanttChart().load_from_store(self.store)
+        self.assertEqual(diff_charts(self.chart, loaded).summary()['changed'], 0)
+        self.assertEqual([t.artfId for t in loaded.tasks], [t.artfId for t in self.chart.tasks])
+        self.assertEqual(loaded.get_task("T-3").dependencies, ["T-2", "T-0"])
+        self.assertEqual(loaded.get_task("T-3").start_date, START + timedelta(days=9, hours=3))
+
+    def test_lazy_loading(self):
+        """测试按日期窗口和负责人加载"""
+        window = GanttChart().load_from_store(self.store, start=START + timedelta(days=7),
+                                              end=START + timedelta(days=10))
+        self.assertEqual([t.artfId for t in window.tasks], ["T-2", "T-3"])
+        self.assertEqual(self.store.count(assignee="李四"), 1)
+        mine = GanttChart().load_from_store(self.store, assignee="张三")
+        self.assertEqual([t.artfId for t in mine.tasks], ["T-1", "T-3", "T-4", "T-5"])
+        self.assertEqual(self.store.assignees(), sorted(["张三", "李四", "王五"]))
+        self.assertEqual(self.store.dependents_of("T-0"), ["T-2", "T-3", "T-4", "T-5"])
+
+    def test_partial_write_back(self):
+        """测试部分加载的任务修改后写回，顺序与其他任务不变"""
+        mine = GanttChart().load_from_store(self.store, assignee="王五")
+        mine.tasks[0].progress = 100
+        mine.tasks[1].dependencies = []
+        mine.save_to_store(self.store)
+        mine.add_task(make_task(9))
+        mine.save_to_store(self.store)
+
+        loaded = GanttChart().load_from_store(self.store)
+        self.assertEqual([t.artfId for t in loaded.tasks], [f"T-{i}" for i in [0, 1, 2, 3, 4, 5, 9]])
+        self.assertEqual(loaded.get_task("T-0").progress, 100)
+        self.assertEqual(loaded.get_task("T-2").dependencies, [])
+        self.assertEqual(self.store.delete_tasks(["T-9", "T-8"]), 1)
+        self.assertEqual(self.store.count(), 6)
+
+    def test_snapshots(self):
+        """测试保存快照并作为基线加载"""
+        snapshot_id = self.store.save_snapshot(self.chart.tasks, "基线")
+        self.chart.tasks[1].end_date += timedelta(days=2)
+        self.chart.save_to_store(self.store)
+
+        baseline = GanttChart().load_from_store(self.store, snapshot=snapshot_id)
+        current = GanttChart().load_from_store(self.store)
+        self.assertEqual(diff_charts(baseline, current).changed['ArtifactID'].tolist(), ["T-1"])
+        self.assertEqual([s[1] for s in self.store.snapshots()], ["基线"])
+        self.store.delete_snapshot(snapshot_id)
+        self.assertEqual(list(self.store.iter_snapshot(snapshot_id)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+泳道分组单元测试
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.swimlanes import SwimlaneLayout, group_keys, pack_lanes
+
+
+def make_task(owner, artfid, offset, days, progress=0, dependencies=None):
+    """创建测试任务"""
+    start = datetime(2025, 5, 1) + timedelta(days=offset)
+    return Task(owner, artfid, f"任务{artfid}", start, start + timedelta(days=days), progress,
+                dependencies=dependencies)
+
+
+def make_tasks():
+    """张三的任务最多两两重叠，李四的任务互不重叠"""
+    return [make_task("张三", "A1", 0, 5, 100), make_task("李四", "B1", 0, 3),
+            make_task("张三", "A2", 2, 5, 50), make_task("张三", "A3", 5, 4),
+            make_task("李四", "B2", 3, 3, 20, ['B1']), make_task("张三", "A4", 7, 2)]
+
+
+class TestPackLanes(unittest.TestCase):
+    """贪心区间划分测试"""
+
+    def test_optimal(self):
+        """行数等于同时进行的任务的最大数量，同一行的任务互不重叠"""
+        rng = np.random.default_rng(3)
+        starts = rng.integers(0, 100, 200).astype(float)
+        ends = starts + rng.integers(1, 15, 200)
+        lanes = pack_lanes(starts, ends)
+        events = sorted([(s, 1) for s in starts] + [(e, -1) for e in ends], key=lambda item: (item[0], item[1]))
+        depth = max(np.cumsum([delta for _, delta in events]))
+        self.assertEqual(lanes.max() + 1, depth)
+        for lane in np.unique(lanes):
+            members = np.flatnonzero(lanes == lane)
+            order = members[np.argsort(starts[members])]
+            self.assertTrue(np.all(starts[order][1:] >= ends[order][:-1]))
+
+    def test_touching(self):
+        """前一个任务结束时开始的任务共用一行"""
+        lanes = pack_lanes(np.array([0.0, 5.0, 10.0]), np.array([5.0, 10.0, 12.0]))
+        self.assertEqual(lanes.tolist(), [0, 0, 0])
+
+
+class TestSwimlaneLayout(unittest.TestCase):
+    """泳道布局测试"""
+
+    def test_expanded(self):
+        """按首次出现的顺序分组，组内不重叠的任务共用一行"""
+        layout = SwimlaneLayout(make_tasks(), 'assignee')
+        self.assertEqual(layout.groups, ["张三", "李四"])
+        self.assertEqual(layout.lane_counts.tolist(), [2, 1])
+        self.assertEqual(layout.rows, 3)
+        self.assertEqual(layout.task_y.tolist(), [3, 1, 2, 3, 1, 2])
+        self.assertEqual(layout.tick_labels(), ["张三 (4)", "李四 (2)"])
+        self.assertEqual(len(layout.summary), 0)
+
+    def test_collapsed_summary(self):
+        """折叠的组只占一行，汇总条由 groupby 得到"""
+        layout = SwimlaneLayout(make_tasks(), 'AssignTo', collapsed=["张三"])
+        self.assertEqual(layout.rows, 2)
+        self.assertEqual(layout.visible.tolist(), [1, 4])
+        self.assertTrue(np.isnan(layout.task_y[0]))
+        row = layout.summary.loc["张三"]
+        self.assertEqual(row['count'], 4)
+        self.assertEqual(row['y'], 2)
+        self.assertEqual(row['end'] - row['start'], 9)
+        # 按工期加权：(5*100 + 5*50) / (5+5+4+2)
+        self.assertAlmostEqual(row['progress'], 750 / 16)
+        self.assertEqual(layout.tick_labels()[0], "▸ 张三 (4)")
+
+        everything = SwimlaneLayout(make_tasks(), 'assignee', collapsed=True)
+        self.assertEqual(everything.rows, 2)
+        self.assertEqual(len(everything.visible), 0)
+
+    def test_group_keys(self):
+        """按列名或函数分组，未知列抛出异常"""
+        tasks = make_tasks()
+        self.assertEqual(group_keys(tasks, 'Progress').tolist()[:2], ['100', '0'])
+        self.assertEqual(group_keys(tasks, lambda task: task.artfId[0]).tolist()[:2], ['A', 'B'])
+        with self.assertRaises(ValueError):
+            group_keys(tasks, 'Owner')
+
+
+class TestChartSwimlanes(unittest.TestCase):
+    """甘特图按泳道绘制测试"""
+
+    def setUp(self):
+        self.chart = GanttChart()
+        for task in make_tasks():
+            self.chart.add_task(task)
+
+    def draw(self, **options):
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = self.chart.draw(fig, **options)
+        fig.canvas.draw()
+        return ax
+
+    def test_grouped(self):
+        """纵轴每组一个标签，依赖连线使用泳道中的位置"""
+        ax = self.draw(group_by='assignee')
+        self.assertEqual([label.get_text() for label in ax.get_yticklabels()], ["张三 (4)", "李四 (2)"])
+        self.assertEqual(ax.get_ylim(), (0.5, 3.5))
+        lines = [c for c in ax.collections if isinstance(c, LineCollection)]
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(np.all(lines[0].get_segments()[0][:, 1] <= 1.5))
+
+    def test_collapsed(self):
+        """全部折叠时不绘制单个任务和连线"""
+        ax = self.draw(group_by='assignee', collapsed=True)
+        self.assertEqual(ax.get_ylim(), (0.5, 2.5))
+        self.assertFalse(any(isinstance(c, LineCollection) for c in ax.collections))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+自适应时间轴单元测试
+"""
+
+import unittest
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from gantt_app.core.time_axis import AdaptiveTimeAxis, choose_scale
+
+
+class TestChooseScale(unittest.TestCase):
+    """刻度尺度选择测试"""
+
+    def test_scale_grows_with_span(self):
+        """测试跨度越长尺度越粗"""
+        self.assertEqual(choose_scale(10, 1000)[0].name, 'day')
+        self.assertEqual(choose_scale(120, 1000)[0].name, 'week')
+        self.assertEqual(choose_scale(600, 1000)[0].name, 'month')
+        self.assertEqual(choose_scale(3650, 1000)[0].name, 'halfyear')
+
+    def test_narrow_axis_uses_coarser_scale(self):
+        """测试较窄的坐标轴选择更粗的尺度"""
+        self.assertEqual(choose_scale(120, 600)[0].name, '2week')
+
+    def test_extreme_span_is_bounded(self):
+        """测试超长跨度仍然限制刻度数"""
+        scale, max_ticks = choose_scale(365.25 * 500, 600)
+        self.assertLessEqual(365.25 * 500 / scale.spacing_days, max_ticks)
+
+
+class TestAdaptiveTimeAxis(unittest.TestCase):
+    """自适应时间轴测试"""
+
+    def tearDown(self):
+        plt.close('all')
+
+    def _tick_count(self, axis):
+        return len(axis.get_major_locator()())
+
+    def test_tick_count_bounded_on_multi_year_range(self):
+        """测试多年跨度下刻度数受限，并随缩放更新"""
+        fig, ax = plt.subplots(figsize=(12, 4))
+        ax.set_xlim(datetime(2015, 1, 1), datetime(2035, 1, 1))
+        time_axis = AdaptiveTimeAxis(ax)
+        max_ticks = ax.get_window_extent().width // 50
+        self.assertLessEqual(self._tick_count(ax.xaxis), max_ticks)
+        self.assertLessEqual(self._tick_count(time_axis.upper_axis.xaxis), max_ticks)
+
+        # 缩放到一个月时改为按天显示，上层显示月份
+        ax.set_xlim(datetime(2025, 5, 1), datetime(2025, 5, 15))
+        self.assertEqual(time_axis.scale.name, 'day')
+        self.assertLessEqual(self._tick_count(ax.xaxis), max_ticks)
+        fig.canvas.draw()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+目录监视与增量重载单元测试
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from gantt_app.core.chart_improved import GanttChart
+from gantt_app.utils import watcher
+from gantt_app.utils.watcher import FolderWatcher, LiveReloader
+
+
+def write_csv(path, rows):
+    """写出测试用的任务CSV"""
+    pd.DataFrame([{'AssignTo': assignee, 'ArtifactID': artfid, 'Description': artfid,
+                   'Start': '2025-05-01', 'End': end, 'Progress': 0}
+                  for assignee, artfid, end in rows]).to_csv(path, index=False)
+
+
+class TestLiveReloader(unittest.TestCase):
+    """实时重载测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.path_a = os.path.join(self.dir, "a.csv")
+        self.path_b = os.path.join(self.dir, "b.csv")
+        write_csv(self.path_a, [("甲", "A-1", "2025-05-03"), ("甲", "A-2", "2025-05-04")])
+        write_csv(self.path_b, [("乙", "B-1", "2025-05-05")])
+        with open(os.path.join(self.dir, "notes.txt"), 'w') as f:
+            f.write("ignored")
+
+    def tearDown(self):
+        """清理临时目录"""
+        self.tmpdir.cleanup()
+
+    def _check_reload(self, use_inotify):
+        chart = GanttChart()
+        reloader = LiveReloader(chart, self.dir, use_inotify=use_inotify, interval=0.01)
+        try:
+            reloader.load_all()
+            self.assertEqual([t.artfId for t in chart.tasks], ["A-1", "A-2", "B-1"])
+            untouched = chart.tasks[2]
+
+            # 修改a.csv：A-2更新，A-1删除，新增A-3
+            write_csv(self.path_a, [("甲", "A-2", "2025-05-09"), ("甲", "A-3", "2025-05-06")])
+            if not use_inotify:
+                os.utime(self.path_a, ns=(1, 1))
+            self.assertEqual(reloader.poll(timeout=2.0), [self.path_a])
+
+            ids = [t.artfId for t in chart.tasks]
+            self.assertEqual(sorted(ids), ["A-2", "A-3", "B-1"])
+            self.assertIs(chart.tasks[ids.index("B-1")], untouched)
+            self.assertEqual(chart.tasks[ids.index("A-2")].end_date.day, 9)
+
+            os.remove(self.path_b)
+            reloader.poll(timeout=2.0)
+            self.assertEqual(sorted(t.artfId for t in chart.tasks), ["A-2", "A-3"])
+        finally:
+            reloader.close()
+
+    def test_polling_reload(self):
+        """测试轮询后端的增量重载"""
+        self._check_reload(use_inotify=False)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "inotify仅在Linux可用")
+    def test_inotify_reload(self):
+        """测试inotify后端的增量重载"""
+        self._check_reload(use_inotify=True)
+
+    def test_reload_touches_only_its_source(self):
+        """重新加载只访问该文件的任务，其他文件的行号随删除平移"""
+        chart = GanttChart()
+        reloader = LiveReloader(chart, self.dir, use_inotify=False)
+        try:
+            reloader.load_all()
+            chart.remove_rows([0])
+            with mock.patch.object(reloader, '_rebuild_positions', side_effect=AssertionError("不应扫描全部任务")):
+                write_csv(self.path_b, [("乙", "B-1", "2025-05-08")])
+                reloader.ingest(self.path_b)
+                write_csv(self.path_a, [("甲", "A-2", "2025-05-07")])
+                reloader.ingest(self.path_a)
+            self.assertEqual([(t.artfId, t.end_date.day) for t in chart.tasks], [("A-2", 7), ("B-1", 8)])
+
+            # 图表被外部替换了任务时退回到重建
+            chart.replace_task(0, chart.tasks[1])
+            reloader.ingest(self.path_a)
+            self.assertEqual(sorted(t.artfId for t in chart.tasks), ["A-2", "B-1", "B-1"])
+        finally:
+            reloader.close()
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "inotify仅在Linux可用")
+    def test_inotify_overflow_rescans(self):
+        """事件队列溢出时重新扫描目录，报告期间的新增与删除"""
+        overflow = struct.pack('iIII', -1, watcher.IN_Q_OVERFLOW, 0, 0)
+        with FolderWatcher(self.dir, use_inotify=True) as folder:
+            os.remove(self.path_b)
+            path_c = os.path.join(self.dir, "c.csv")
+            write_csv(path_c, [("丙", "C-1", "2025-05-05")])
+            # 内核丢弃了上述事件，只留下溢出事件
+            with mock.patch.object(watcher.os, 'read', side_effect=[overflow, BlockingIOError()]):
+                changes = folder.changes(timeout=2.0)
+        self.assertEqual(changes, {self.path_a: 'modified', path_c: 'modified', self.path_b: 'deleted'})
+
+    def test_watcher_backend_and_missing_dir(self):
+        """测试后端选择与目录不存在"""
+        with FolderWatcher(self.dir, use_inotify=False) as watcher:
+            self.assertEqual(watcher.backend, 'polling')
+            self.assertEqual(watcher.changes(timeout=0), {})
+        with self.assertRaises(FileNotFoundError):
+            FolderWatcher(os.path.join(self.dir, "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
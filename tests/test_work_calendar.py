@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+工作日历单元测试
+"""
+
+import unittest
+from unittest import mock
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from gantt_app.core.chart_improved import Task, GanttChart
+from gantt_app.core.work_calendar import CalendarSet, WorkCalendar
+
+
+class TestWorkCalendar(unittest.TestCase):
+    """工作日历测试"""
+
+    def setUp(self):
+        """测试前准备，2025-05-05是周一"""
+        self.calendar = WorkCalendar(holidays=[datetime(2025, 5, 7)])
+
+    def test_working_days(self):
+        """测试工作日计数跳过周末与节假日"""
+        counts = self.calendar.working_days(
+            [datetime(2025, 5, 5), datetime(2025, 5, 9)],
+            [datetime(2025, 5, 12), datetime(2025, 5, 13)])
+        np.testing.assert_array_equal(counts, [4, 2])
+
+    def test_add_working_days(self):
+        """测试按工作日平移，周末先顺延"""
+        shifted = self.calendar.add_working_days(
+            np.array(['2025-05-05', '2025-05-10'], dtype='datetime64[D]'), [2, 1])
+        np.testing.assert_array_equal(shifted, np.array(['2025-05-08', '2025-05-13'], dtype='datetime64[D]'))
+
+    def test_non_working_spans(self):
+        """测试连续非工作时段"""
+        begins, ends = self.calendar.non_working_spans(datetime(2025, 5, 5), datetime(2025, 5, 19))
+        np.testing.assert_array_equal(begins, np.array(['2025-05-07', '2025-05-10', '2025-05-17'], dtype='datetime64[D]'))
+        np.testing.assert_array_equal(ends, np.array(['2025-05-08', '2025-05-12', '2025-05-19'], dtype='datetime64[D]'))
+
+    def test_per_assignee_calendars(self):
+        """测试按负责人使用不同日历"""
+        chart = GanttChart()
+        chart.add_task(Task("张三", "A", "任务A", datetime(2025, 5, 5), datetime(2025, 5, 12)))
+        chart.add_task(Task("李四", "B", "任务B", datetime(2025, 5, 5), datetime(2025, 5, 12)))
+
+        calendars = CalendarSet()
+        calendars.assign("李四", WorkCalendar(weekmask='1111110'))
+        np.testing.assert_array_equal(chart.working_durations(calendars), [5, 6])
+        np.testing.assert_array_equal(chart.working_durations(), [5, 5])
+
+        start, end = calendars.shift_tasks(chart.tasks, 1)
+        np.testing.assert_array_equal(start, np.array(['2025-05-06', '2025-05-06'], dtype='datetime64[D]'))
+        np.testing.assert_array_equal(end, np.array(['2025-05-13', '2025-05-13'], dtype='datetime64[D]'))
+
+    def test_render_shading(self):
+        """测试渲染时标出非工作时段"""
+        chart = GanttChart()
+        chart.add_task(Task("张三", "A", "任务A", datetime(2025, 5, 5), datetime(2025, 5, 20)))
+        with mock.patch.object(plt, 'show'):
+            fig = chart.render(calendar=self.calendar)
+        self.assertEqual(len(fig.axes[0].collections), 1)
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    unittest.main()